@@ -2,37 +2,100 @@
 Bias-Aware Recruitment System Backend
 """
 
+import os
+import json
 import logging
-import traceback
 from typing import Any, Dict
-from flask import Flask, request, jsonify, Blueprint
+from flask import Flask, Response, request, jsonify, Blueprint
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from utils.resume_parser import parse_resume
-from model.predict import predict_candidate
+from model.predict import get_analysis_profile, predict_candidate
 from model.fairness import evaluate_fairness
+from model.registry import get_predictor, reload_predictor
+from model.taxonomy import DEFAULT_ROLE
+from utils.nltk_resources import nltk_download_command
+from utils.batch import detach_uploads, iter_batch_inputs, run_batch
+from utils.jobs import get_job_runner, get_job_store, jobs_worker_command, start_job_workers
+from utils.audit_streams import STREAM_NAME_RE, get_audit_store
+from utils.columnar import load_dataset
+from utils.candidate_index import MAX_TOP_K, get_candidate_index, index_resume
+from utils.responses import FastJSONProvider, compress_response, dumps
+from utils.metrics import CONTENT_TYPE, add_server_timing, render_metrics, start_request_timing
+from utils.profiling import profiled
+from utils.log_config import configure_logging, exception_fields
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Largest request body accepted by /upload and /jobs
+MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024)))
+# Largest request body accepted by /upload/batch
+MAX_BATCH_CONTENT_LENGTH = int(os.getenv("MAX_BATCH_CONTENT_LENGTH", str(512 * 1024 * 1024)))
+# Largest request body accepted by /evaluate_bias (dataset files or JSON)
+MAX_DATASET_CONTENT_LENGTH = int(os.getenv("MAX_DATASET_CONTENT_LENGTH", str(1024 * 1024 * 1024)))
+ENDPOINT_CONTENT_LENGTH = {
+    'api.upload_batch': MAX_BATCH_CONTENT_LENGTH,
+    'api.evaluate_bias': MAX_DATASET_CONTENT_LENGTH
+}
+
 def create_app() -> Flask:
     """
     Application factory for creating Flask app instances.
     """
+    configure_logging()
     app = Flask(__name__)
+    # jsonify and request.json go through the NumPy-aware fast encoder
+    app.json = FastJSONProvider(app)
     CORS(app, resources={
         r"/*": {
             "origins": ["*"],
-            "methods": ["GET", "POST", "OPTIONS"],
-            "allow_headers": ["Content-Type"]
+            "methods": ["GET", "POST", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type"],
+            "expose_headers": ["Server-Timing"]
         }
     })
     
+    # The default limit; apply_upload_limit raises it for the endpoints that
+    # take larger bodies
+    app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    app.before_request(apply_upload_limit)
+    app.register_error_handler(413, request_too_large)
+
+    app.cli.add_command(nltk_download_command)
+    app.cli.add_command(jobs_worker_command)
+    # Job worker threads are started lazily so they begin in each forked
+    # worker rather than in a preloading gunicorn master
+    app.before_request(start_job_workers)
+
+    # Warm the shared predictor once per worker instead of once per request
+    get_predictor()
+    app.extensions['reload_predictor'] = reload_predictor
+
     # Register blueprints or routes
     app.register_blueprint(api_bp)
     return app
 
+def apply_upload_limit() -> Any:
+    """
+    Apply the endpoint's body size limit to this request. Werkzeug enforces it
+    on the stream, so chunked bodies without a Content-Length are cut off at
+    the limit too; a declared Content-Length over it is refused before any of
+    the body is read or spooled.
+    """
+    limit = ENDPOINT_CONTENT_LENGTH.get(request.endpoint, MAX_CONTENT_LENGTH)
+    request.max_content_length = limit
+    if request.content_length is not None and request.content_length > limit:
+        logger.error("Rejected oversized request", extra={'content_length': request.content_length, 'limit': limit})
+        return request_too_large(None)
+    return None
+
+def request_too_large(error: Any) -> Any:
+    return jsonify({"error": "File too large"}), 413
+
 api_bp = Blueprint('api', __name__)
+api_bp.before_request(start_request_timing)
+api_bp.after_request(compress_response)
+api_bp.after_request(add_server_timing)
 
 @api_bp.route('/', methods=['GET'])
 def index() -> str:
@@ -41,66 +104,287 @@ def index() -> str:
     """
     return "Bias-Aware Recruitment System Backend Running!"
 
+@api_bp.route('/metrics', methods=['GET'])
+def metrics() -> Any:
+    """
+    Prometheus scrape endpoint: per-stage latency histograms and pipeline
+    counters, summed over every worker when METRICS_DIR is set.
+    """
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
 @api_bp.route('/upload', methods=['POST'])
+@profiled
 def upload_resume() -> Any:
     """
     Endpoint to upload and process a resume PDF.
+    An optional 'target_role' form field picks the taxonomy role the skills
+    gap is measured against, and 'profile' (form field or query parameter)
+    the analysis profile: fast, standard or deep.
     """
     try:
-        logger.debug("Received upload request")
+        logger.debug("Received upload", extra={'content_length': request.content_length})
         if 'resume' not in request.files:
             logger.error("No file in request")
             return jsonify({"error": "No file provided"}), 400
         file = request.files['resume']
-        logger.debug(f"Received file: {file.filename}")
         if file.filename == '':
             logger.error("Empty filename")
             return jsonify({"error": "No file selected"}), 400
         if not file.filename.lower().endswith('.pdf'):
-            logger.error(f"Invalid file type: {file.filename}")
+            logger.error("Invalid file type", extra={'extension': os.path.splitext(file.filename)[1][:16]})
             return jsonify({"error": "Only PDF files are allowed"}), 400
+        target_role = request.form.get('target_role') or DEFAULT_ROLE
+        if target_role not in get_predictor().taxonomy.roles:
+            logger.error("Unknown target role %s", target_role[:64])
+            return jsonify({"error": f"Unknown target role '{target_role}'"}), 400
+        try:
+            profile = get_analysis_profile(request.values.get('profile')).name
+        except ValueError as e:
+            logger.error("Unknown analysis profile", extra=exception_fields(e))
+            return jsonify({"error": str(e)}), 400
         # Parse the resume
-        logger.debug("Attempting to parse resume")
         try:
             data = parse_resume(file)
-            logger.debug(f"Resume parsed successfully: {data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resume parsed", extra={
+                    'text_chars': len(data.get('text', '')), 'skills': len(data.get('skills', [])),
+                    'analysis_source': data.get('analysis_source')
+                })
+            index_resume(data, file.filename)
         except Exception as parse_error:
-            logger.error(f"Error parsing resume: {str(parse_error)}")
-            logger.error(traceback.format_exc())
+            logger.error("Error parsing resume", extra=exception_fields(parse_error))
             return jsonify({"error": f"Error parsing resume: {str(parse_error)}"}), 500
         # Make prediction
-        logger.debug("Attempting to make prediction")
         try:
-            prediction = predict_candidate(data)
-            logger.debug(f"Prediction made successfully: {prediction}")
+            prediction = predict_candidate(data, target_role=target_role, profile=profile)
+            logger.debug("Prediction made", extra={
+                'profile': profile, 'analysis_ms': prediction['analysis']['total_ms']
+            })
         except Exception as predict_error:
-            logger.error(f"Error making prediction: {str(predict_error)}")
-            logger.error(traceback.format_exc())
+            logger.error("Error making prediction", extra=exception_fields(predict_error))
             return jsonify({"error": f"Error making prediction: {str(predict_error)}"}), 500
         return jsonify(prediction)
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in upload_resume: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.error("Unexpected error in upload_resume", extra=exception_fields(e))
         return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
 
+@api_bp.route('/upload/batch', methods=['POST'])
+def upload_batch() -> Any:
+    """
+    Endpoint to process many resume PDFs (or zip archives of PDFs) at once.
+    Streams one NDJSON line per resume as soon as it has been scored; failures
+    are reported per file and do not abort the batch. An optional 'profile'
+    (form field or query parameter) picks the analysis profile, e.g. 'fast'
+    for bulk screening.
+    """
+    files = request.files.getlist('resumes') + request.files.getlist('resume')
+    files = [file for file in files if file.filename]
+    if not files:
+        logger.error("No files in batch request")
+        return jsonify({"error": "No files provided"}), 400
+    try:
+        profile = get_analysis_profile(request.values.get('profile')).name
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    logger.debug("Received batch upload", extra={'files': len(files), 'profile': profile})
+    uploads = detach_uploads(files)
+
+    def generate():
+        for result in run_batch(iter_batch_inputs(uploads), profile=profile):
+            yield dumps(result) + b'\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@api_bp.route('/jobs', methods=['POST'])
+def submit_job() -> Any:
+    """
+    Endpoint to queue a resume PDF for background processing.
+    Returns a job id immediately; poll GET /jobs/<job_id> for the result.
+    """
+    try:
+        if 'resume' not in request.files:
+            logger.error("No file in job request")
+            return jsonify({"error": "No file provided"}), 400
+        file = request.files['resume']
+        if file.filename == '':
+            logger.error("Empty filename")
+            return jsonify({"error": "No file selected"}), 400
+        if not file.filename.lower().endswith('.pdf'):
+            logger.error("Invalid file type", extra={'extension': os.path.splitext(file.filename)[1][:16]})
+            return jsonify({"error": "Only PDF files are allowed"}), 400
+        job_id = get_job_store().create(file.filename, file.stream)
+        get_job_runner().notify()
+        logger.debug("Queued job", extra={'job_id': job_id})
+        response = jsonify({"job_id": job_id, "status": "queued"})
+        response.headers['Location'] = f"/jobs/{job_id}"
+        return response, 202
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        logger.error("Error queueing job", extra=exception_fields(e))
+        return jsonify({"error": f"Error queueing job: {str(e)}"}), 500
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str) -> Any:
+    """
+    Endpoint to poll the status, timings and result of a queued job.
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+@api_bp.route('/candidates/search', methods=['POST'])
+def search_candidates() -> Any:
+    """
+    Endpoint to rank indexed candidates against a job description.
+    Expects {"job_description": "...", "k": 10}; returns the top-k resumes
+    by TF-IDF cosine similarity.
+    """
+    payload = request.get_json(silent=True) or {}
+    text = payload.get('job_description')
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({"error": "No job description provided"}), 400
+    try:
+        k = int(payload.get('k', 10))
+    except (TypeError, ValueError):
+        k = 0
+    if not 1 <= k <= MAX_TOP_K:
+        return jsonify({"error": f"k must be between 1 and {MAX_TOP_K}"}), 400
+    try:
+        return jsonify(get_candidate_index().search(text, k))
+    except Exception as e:
+        logger.error("Error searching candidates", extra=exception_fields(e))
+        return jsonify({"error": "Error searching candidates"}), 500
+
+def load_uploaded_dataset(file: Any, form: Any) -> Dict[str, Any]:
+    """
+    Read an uploaded dataset file column-wise (see utils.columnar).
+    Raises:
+        ValueError: If the file or the form options are invalid.
+    """
+    attributes = form.get('attributes')
+    dataset = load_dataset(
+        file.stream, file.filename,
+        prediction_column=form.get('prediction_column') or None,
+        label_column=form.get('label_column') or None,
+        attributes=[name.strip() for name in attributes.split(',') if name.strip()] if attributes else None
+    )
+    if form.get('bootstrap'):
+        dataset['bootstrap'] = json.loads(form['bootstrap'])
+    return dataset
+
 @api_bp.route('/evaluate_bias', methods=['POST'])
+@profiled
 def evaluate_bias() -> Any:
     """
     Endpoint to evaluate bias in a dataset.
+    Accepts either a JSON body {"data": {...}} or a multipart upload of a
+    CSV, Parquet, Arrow or .npy/.npz file in the 'dataset' field, with
+    optional form fields prediction_column, label_column, attributes
+    (comma-separated) and bootstrap (JSON).
     """
     try:
-        dataset = request.json.get('data')
+        if 'dataset' in request.files:
+            try:
+                dataset = load_uploaded_dataset(request.files['dataset'], request.form)
+            except ValueError as e:
+                # The message can quote dataset values; the client gets it, the log does not
+                logger.error("Invalid dataset upload", extra={'error_type': type(e).__name__})
+                return jsonify({"error": str(e)}), 400
+        else:
+            dataset = request.json.get('data')
         if not dataset:
             logger.error("No data provided for bias evaluation")
             return jsonify({"error": "No data provided"}), 400
         result = evaluate_fairness(dataset)
-        logger.debug(f"Bias evaluation result: {result}")
+        logger.debug("Evaluated bias", extra={'rows': len(dataset.get('predictions', []))})
         return jsonify(result)
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
-        logger.error(f"Error evaluating bias: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.error("Error evaluating bias", extra=exception_fields(e))
         return jsonify({"error": "Error evaluating bias"}), 500
 
+@api_bp.route('/evaluate_bias/streams/<name>', methods=['POST'])
+def append_audit_stream(name: str) -> Any:
+    """
+    Endpoint to append new predictions to a named audit stream.
+    Accepts the /evaluate_bias payload (optionally with 'labels') for the new
+    rows only; the stream keeps running per-group totals server-side.
+    """
+    if not STREAM_NAME_RE.match(name):
+        return jsonify({"error": "Invalid stream name"}), 400
+    try:
+        payload = request.get_json(silent=True)
+        dataset = payload.get('data') if isinstance(payload, dict) else None
+        if not isinstance(dataset, dict):
+            logger.error("No data provided for audit stream")
+            return jsonify({"error": "No data provided"}), 400
+        predictions, attributes = dataset.get('predictions'), dataset.get('protected_attributes')
+        if not isinstance(predictions, list) or not predictions or not isinstance(attributes, dict) or not attributes:
+            logger.error("No data provided for audit stream")
+            return jsonify({"error": "Missing predictions or protected attributes"}), 400
+        accumulator = get_audit_store().append(name, predictions, attributes, dataset.get('labels'))
+        return jsonify({"stream": name, "appended": len(predictions), "rows": accumulator.rows})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except TypeError as e:
+        logger.error("Malformed data for audit stream %s", name, extra=exception_fields(e))
+        return jsonify({"error": "Malformed predictions, attributes or labels"}), 400
+    except Exception as e:
+        logger.error("Error appending to audit stream %s", name, extra=exception_fields(e))
+        return jsonify({"error": "Error updating audit stream"}), 500
+
+@api_bp.route('/evaluate_bias/streams/<name>', methods=['GET'])
+def get_audit_stream(name: str) -> Any:
+    """
+    Endpoint to read the fairness metrics of an audit stream, in the same
+    shape as /evaluate_bias, computed from the stream's running totals.
+    """
+    accumulator = get_audit_store().get(name) if STREAM_NAME_RE.match(name) else None
+    if accumulator is None:
+        return jsonify({"error": "Stream not found"}), 404
+    return jsonify(accumulator.report())
+
+@api_bp.route('/evaluate_bias/streams/<name>', methods=['DELETE'])
+def delete_audit_stream(name: str) -> Any:
+    """
+    Endpoint to drop an audit stream and its totals.
+    """
+    if not STREAM_NAME_RE.match(name) or not get_audit_store().delete(name):
+        return jsonify({"error": "Stream not found"}), 404
+    return jsonify({"stream": name, "deleted": True})
+
+@api_bp.route('/evaluate_bias/streams/<name>/state', methods=['GET'])
+def export_audit_stream(name: str) -> Any:
+    """
+    Endpoint to export an audit stream's accumulator state, for merging into
+    a stream on another node.
+    """
+    accumulator = get_audit_store().get(name) if STREAM_NAME_RE.match(name) else None
+    if accumulator is None:
+        return jsonify({"error": "Stream not found"}), 404
+    return jsonify(accumulator.to_dict())
+
+@api_bp.route('/evaluate_bias/streams/<name>/merge', methods=['POST'])
+def merge_audit_stream(name: str) -> Any:
+    """
+    Endpoint to merge exported accumulator state into an audit stream.
+    """
+    if not STREAM_NAME_RE.match(name):
+        return jsonify({"error": "Invalid stream name"}), 400
+    try:
+        accumulator = get_audit_store().merge(name, request.get_json(silent=True))
+        return jsonify({"stream": name, "rows": accumulator.rows})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error("Error merging into audit stream %s", name, extra=exception_fields(e))
+        return jsonify({"error": "Error updating audit stream"}), 500
+
 if __name__ == '__main__':
     app = create_app()
     app.run(debug=True)
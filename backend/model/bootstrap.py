@@ -0,0 +1,205 @@
+"""
+Fairness Bootstrap Module
+
+Bootstrap confidence intervals and p-values for the disparities reported by
+evaluate_fairness. Resampling is stratified by group and done in bulk on the
+aggregated group statistics rather than on rows: a group's resampled
+confusion table is a multinomial draw over its four cells, and its resampled
+mean prediction a multinomial draw over its prediction histogram (exact when
+the predictions have at most BOOTSTRAP_BINS distinct values, quantile-binned
+otherwise). p-values come from resampling every group from the pooled
+distribution (no disparity). Resamples are split into chunks that bound
+memory, each with its own seed derived from one SeedSequence, and large runs
+are spread over a process pool; results do not depend on the worker count.
+"""
+import os
+import secrets
+import warnings
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Prediction histogram bins per group (see fairness.bin_values)
+BOOTSTRAP_BINS = int(os.getenv("BOOTSTRAP_BINS", "256"))
+# Web worker processes per host (gunicorn reads the same variable); each starts its own pools
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+# Worker processes for large bootstrap runs, per web worker (defaults to half
+# of this web worker's share of the cores; 1 disables the pool)
+BOOTSTRAP_WORKERS = int(os.getenv("BOOTSTRAP_WORKERS", "0")) or max(1, (os.cpu_count() or 1) // (2 * WEB_CONCURRENCY))
+# Memory budget for the draws of one chunk
+BOOTSTRAP_CHUNK_BYTES = int(os.getenv("BOOTSTRAP_CHUNK_BYTES", str(64 * 1024 * 1024)))
+MAX_BOOTSTRAP_RESAMPLES = int(os.getenv("MAX_BOOTSTRAP_RESAMPLES", "100000"))
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+
+# Reported disparity -> statistic it is the max-min gap of
+DISPARITIES = {
+    'demographic_parity': 'mean',
+    'equal_opportunity': 'tpr',
+    'equal_opportunity_fpr': 'fpr',
+    'predictive_parity': 'ppv'
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _gap(rates: np.ndarray) -> np.ndarray:
+    """Max-min over groups (last axis), ignoring undefined (NaN) rates."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmax(rates, axis=-1) - np.nanmin(rates, axis=-1)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return numerator / denominator
+
+
+def _confusion_rates(confusion: np.ndarray) -> Dict[str, np.ndarray]:
+    tn, fp, fn, tp = np.moveaxis(confusion.astype(float), -1, 0)
+    return {'tpr': _ratio(tp, tp + fn), 'fpr': _ratio(fp, fp + tn), 'ppv': _ratio(tp, tp + fp)}
+
+
+def _tables(group_stats: Dict[str, Any]) -> Dict[str, Dict[str, np.ndarray]]:
+    """Plain arrays needed for resampling, per attribute (cheap to send to workers)."""
+    tables = {}
+    for attr, stats in group_stats.items():
+        table = {'counts': stats.counts}
+        if stats.bin_counts is not None:
+            table['bin_counts'] = stats.bin_counts
+            table['bin_sums'] = stats.bin_sums
+        if stats.confusion is not None:
+            table['confusion'] = stats.confusion
+        tables[attr] = table
+    return tables
+
+
+def observed_disparities(tables: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, Dict[str, float]]:
+    """Disparities of the original data, on the same definitions as the resamples."""
+    observed: Dict[str, Dict[str, float]] = {}
+    for attr, table in tables.items():
+        if 'bin_counts' in table:
+            means = table['bin_sums'].sum(axis=1) / table['counts']
+            observed.setdefault('demographic_parity', {})[attr] = float(_gap(means))
+        if 'confusion' in table:
+            rates = _confusion_rates(table['confusion'])
+            for name, statistic in DISPARITIES.items():
+                if statistic != 'mean':
+                    observed.setdefault(name, {})[attr] = float(_gap(rates[statistic]))
+    return observed
+
+
+def resample_chunk(tables: Dict[str, Dict[str, np.ndarray]], resamples: int,
+                   seed: np.random.SeedSequence) -> Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Draw one chunk of resamples. Runs in-process or inside a pool worker.
+    Returns:
+        disparity name -> attribute -> (bootstrap disparities, null disparities).
+    """
+    rng = np.random.default_rng(seed)
+    results: Dict[str, Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
+    for attr, table in tables.items():
+        counts = table['counts']
+        groups = len(counts)
+        if 'bin_counts' in table:
+            bin_counts, bin_sums = table['bin_counts'], table['bin_sums']
+            bin_means = np.divide(bin_sums, bin_counts, out=np.zeros_like(bin_sums), where=bin_counts > 0)
+            draws = rng.multinomial(counts, bin_counts / counts[:, None], size=(resamples, groups))
+            means = np.einsum('rgk,gk->rg', draws, bin_means) / counts
+            pooled = bin_counts.sum(axis=0)
+            pooled_means = np.divide(bin_sums.sum(axis=0), pooled, out=np.zeros(pooled.shape), where=pooled > 0)
+            null_draws = rng.multinomial(counts, np.broadcast_to(pooled / pooled.sum(), bin_counts.shape),
+                                         size=(resamples, groups))
+            null_means = null_draws @ pooled_means / counts
+            results.setdefault('demographic_parity', {})[attr] = (_gap(means), _gap(null_means))
+        if 'confusion' in table:
+            confusion = table['confusion']
+            labeled = confusion.sum(axis=1)
+            # Groups without labeled rows get a dummy distribution; their draws are all zero
+            pvals = np.where(labeled[:, None] > 0, confusion / np.maximum(labeled, 1)[:, None], 0.25)
+            rates = _confusion_rates(rng.multinomial(labeled, pvals, size=(resamples, groups)))
+            tn, fp, fn, tp = confusion.T
+            null_rates = {}
+            for statistic, hits, trials in (('tpr', tp, tp + fn), ('fpr', fp, fp + tn), ('ppv', tp, tp + fp)):
+                pooled_rate = hits.sum() / trials.sum() if trials.sum() else 0.0
+                null_rates[statistic] = _ratio(rng.binomial(trials, pooled_rate, size=(resamples, groups)), trials)
+            for name, statistic in DISPARITIES.items():
+                if statistic != 'mean':
+                    results.setdefault(name, {})[attr] = (_gap(rates[statistic]), _gap(null_rates[statistic]))
+    return results
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the bootstrap process pool of this process (spawned, like the batch pool)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info("Starting bootstrap process pool with %d workers", BOOTSTRAP_WORKERS)
+            _executor = ProcessPoolExecutor(
+                max_workers=BOOTSTRAP_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def bootstrap_disparities(group_stats: Dict[str, Any], resamples: int = DEFAULT_RESAMPLES,
+                          confidence: float = DEFAULT_CONFIDENCE, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bootstrap every disparity that can be computed from the group statistics.
+    Args:
+        group_stats: Output of aggregate_groups() with bins (and labels for
+            the label-aware disparities).
+        resamples: Number of bootstrap resamples.
+        confidence: Confidence level of the percentile intervals.
+        seed: Seed for reproducible results; a random one is chosen (and
+            reported) when omitted.
+    Returns:
+        {'resamples', 'confidence', 'seed', 'disparities': {name: {attr:
+        {'confidence_interval': [low, high], 'p_value': p}}}}.
+    Raises:
+        ValueError: If resamples or confidence are out of range.
+    """
+    if not 1 <= resamples <= MAX_BOOTSTRAP_RESAMPLES:
+        raise ValueError(f"resamples must be between 1 and {MAX_BOOTSTRAP_RESAMPLES}")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    if seed is None:
+        seed = secrets.randbits(32)
+    tables = _tables(group_stats)
+    # Draws held per resample: groups x bins twice (bootstrap and null) for the
+    # means, groups x 4 plus three groups-sized null draws for the rates
+    per_resample = sum(t['bin_counts'].size * 2 if 'bin_counts' in t else 0 for t in tables.values())
+    per_resample += sum(t['counts'].size * 7 for t in tables.values())
+    chunk = max(1, min(resamples, BOOTSTRAP_CHUNK_BYTES // (max(per_resample, 1) * 8)))
+    sizes = [min(chunk, resamples - start) for start in range(0, resamples, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if len(sizes) > 1 and BOOTSTRAP_WORKERS > 1:
+        executor = get_executor()
+        parts: List[Any] = list(executor.map(resample_chunk, [tables] * len(sizes), sizes, seeds))
+    else:
+        parts = [resample_chunk(tables, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    observed = observed_disparities(tables)
+    alpha = 1 - confidence
+    disparities: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for name, by_attr in observed.items():
+        for attr, value in by_attr.items():
+            boot = np.concatenate([part[name][attr][0] for part in parts])
+            null = np.concatenate([part[name][attr][1] for part in parts])
+            boot, null = boot[~np.isnan(boot)], null[~np.isnan(null)]
+            interval = None
+            if boot.size:
+                interval = np.quantile(boot, [alpha / 2, 1 - alpha / 2]).tolist()
+            p_value = None
+            if null.size and not np.isnan(value):
+                # Share of no-disparity resamples at least as extreme as observed
+                p_value = float((1 + np.count_nonzero(null >= value - 1e-12)) / (1 + null.size))
+            disparities.setdefault(name, {})[attr] = {'confidence_interval': interval, 'p_value': p_value}
+    return {'resamples': resamples, 'confidence': confidence, 'seed': seed, 'disparities': disparities}
@@ -3,59 +3,430 @@ Fairness Evaluation Module
 
 Provides functions to evaluate fairness and detect bias in candidate predictions.
 """
-import pandas as pd
 import numpy as np
-from fairlearn.metrics import (
-    demographic_parity_difference,
-    equal_opportunity_difference,
-    false_positive_rate_difference
-)
-from sklearn.metrics import confusion_matrix
-from typing import Any, Dict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 import logging
+from utils.log_config import exception_fields
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def evaluate_fairness(dataset: Dict[str, Any]) -> Dict[str, Any]:
+# Scores at or above this count as a positive decision in confusion counts
+DECISION_THRESHOLD = 0.5
+# Column order of GroupStats.confusion (label * 2 + decision)
+CONFUSION_FIELDS = ('tn', 'fp', 'fn', 'tp')
+
+class GroupStats(NamedTuple):
+    """
+    Per-group prediction counts and sums for one protected attribute, plus a
+    (groups x 4) confusion count table when true labels were provided, and
+    (groups x bins) prediction histograms (counts and sums per value bin)
+    when aggregated with bins, which is what the bootstrap resamples.
+    """
+    groups: List[Any]
+    counts: np.ndarray
+    sums: np.ndarray
+    confusion: Optional[np.ndarray] = None
+    bin_counts: Optional[np.ndarray] = None
+    bin_sums: Optional[np.ndarray] = None
+
+    @property
+    def means(self) -> np.ndarray:
+        return self.sums / self.counts
+
+    def mean_by_group(self) -> Dict[Any, float]:
+        return dict(zip(self.groups, self.means.tolist()))
+
+    def confusion_rates(self) -> Dict[str, np.ndarray]:
+        """
+        Per-group TPR, FPR and PPV computed column-wise from the confusion
+        table; NaN where a rate is undefined (e.g. a group with no positives).
+        """
+        tn, fp, fn, tp = self.confusion.T.astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'tpr': tp / (tp + fn),
+                'fpr': fp / (fp + tn),
+                'ppv': tp / (tp + fp)
+            }
+
+
+class Categorical:
+    """
+    Dictionary-encoded attribute column, as produced by columnar loaders:
+    categories[codes[i]] is the value of row i. Code -1 marks a missing value.
+    """
+    def __init__(self, categories: Sequence[Any], codes: np.ndarray) -> None:
+        self.categories = list(categories)
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def encode_groups(values: Any) -> Tuple[List[Any], np.ndarray]:
+    """
+    Encode attribute values as integer group codes.
+    Args:
+        values: One attribute value per prediction, or a Categorical.
+    Returns:
+        (groups, codes) where groups[codes[i]] == values[i].
+    """
+    if isinstance(values, Categorical):
+        return _compact_categorical(values)
+    array = np.asarray(values)
+    if array.dtype.kind in 'iu' and array.ndim == 1 and array.size:
+        low, high = int(array.min()), int(array.max())
+        if high - low <= 4 * array.size:
+            # Small integer range: dense lookup table instead of a sort
+            offsets = array - low
+            present = np.flatnonzero(np.bincount(offsets))
+            lookup = np.zeros(high - low + 1, dtype=np.intp)
+            lookup[present] = np.arange(len(present))
+            return (present + low).tolist(), lookup[offsets]
+    if array.dtype != object and array.ndim == 1:
+        groups, codes = np.unique(array, return_inverse=True)
+        return groups.tolist(), codes
+    # Mixed or unorderable values (e.g. None next to strings): factorize by hashing
+    index: Dict[Any, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                        dtype=np.intp, count=len(values))
+    return list(index), codes
+
+
+def _compact_categorical(values: Categorical) -> Tuple[List[Any], np.ndarray]:
+    """Reuse a column's dictionary encoding, dropping categories with no rows."""
+    categories = values.categories
+    # Loaders may hand over narrow (e.g. int8) codes; widen before any arithmetic
+    codes = np.asarray(values.codes).astype(np.intp, copy=False)
+    if codes.size and codes.min() < 0:
+        # Missing values become their own None group
+        categories = categories + [None]
+        codes = np.where(codes < 0, len(categories) - 1, codes)
+    used = np.bincount(codes, minlength=len(categories))
+    present = np.flatnonzero(used)
+    if len(present) == len(categories):
+        return categories, codes
+    lookup = np.zeros(len(categories), dtype=np.intp)
+    lookup[present] = np.arange(len(present))
+    return [categories[i] for i in present], lookup[codes]
+
+
+def bin_values(values: np.ndarray, bins: int) -> Tuple[np.ndarray, int]:
+    """
+    Assign each value to a bin: one bin per distinct value when there are at
+    most `bins` of them (exact), otherwise equal-count quantile bins.
+    Returns:
+        (bin index per value, number of bins).
+    """
+    distinct, index = np.unique(values, return_inverse=True)
+    if len(distinct) <= bins:
+        return index, len(distinct)
+    edges = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])
+    return np.searchsorted(edges, values, side='right'), bins
+
+
+def aggregate_groups(predictions: Sequence[float], protected_attributes: Dict[str, Sequence[Any]],
+                     labels: Optional[Sequence[Any]] = None, bins: int = 0) -> Dict[str, GroupStats]:
+    """
+    Aggregate predictions per group of every protected attribute in one pass
+    per attribute (np.unique + bincount) instead of one mask per group.
+    Args:
+        predictions: Prediction scores or 0/1 decisions.
+        protected_attributes: Attribute name -> one value per prediction.
+        labels: Optional true outcomes (truthy = positive); adds confusion counts.
+        bins: If set, also build per-group prediction histograms with up to
+            this many value bins (see bin_values).
+    Returns:
+        Attribute name -> GroupStats.
+    Raises:
+        ValueError: If an attribute or the labels do not have one value per
+            prediction, or a label is missing.
+    """
+    predictions = np.asarray(predictions, dtype=float)
+    outcome = None
+    if labels is not None:
+        if len(labels) != len(predictions):
+            raise ValueError(f"Got {len(labels)} labels for {len(predictions)} predictions")
+        labels = np.asarray(labels, dtype=float)
+        if np.isnan(labels).any():
+            raise ValueError("Labels have missing values")
+        # Confusion cell of each row: label * 2 + decision, see CONFUSION_FIELDS
+        outcome = (labels != 0) * 2 + (predictions >= DECISION_THRESHOLD)
+    if bins:
+        value_bin, bins = bin_values(predictions, bins)
+    stats = {}
+    for attr, values in protected_attributes.items():
+        if len(values) != len(predictions):
+            raise ValueError(f"Attribute '{attr}' has {len(values)} values for {len(predictions)} predictions")
+        groups, codes = encode_groups(values)
+        confusion = None
+        if outcome is not None:
+            confusion = np.bincount(codes * 4 + outcome, minlength=len(groups) * 4).reshape(len(groups), 4)
+        bin_counts = bin_sums = None
+        if bins:
+            cells = codes * bins + value_bin
+            bin_counts = np.bincount(cells, minlength=len(groups) * bins).reshape(len(groups), bins)
+            bin_sums = np.bincount(cells, weights=predictions, minlength=len(groups) * bins).reshape(len(groups), bins)
+        stats[attr] = GroupStats(
+            groups,
+            np.bincount(codes, minlength=len(groups)),
+            np.bincount(codes, weights=predictions, minlength=len(groups)),
+            confusion,
+            bin_counts,
+            bin_sums
+        )
+    return stats
+
+
+class FairnessAccumulator:
+    """
+    Running per-group totals for an audit stream. Batches of predictions are
+    folded in with update(), accumulators built elsewhere (other workers or
+    nodes) are folded in with merge(), and report() produces the
+    evaluate_fairness response from the totals alone, so refreshing the
+    metrics costs O(groups) rather than O(history). Either every row of a
+    stream has a label or none does, so the label-aware metrics always
+    describe the whole stream.
+    """
+    STATE_VERSION = 1
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self._index: Dict[str, Dict[Any, int]] = {}
+        self._groups: Dict[str, List[Any]] = {}
+        self._counts: Dict[str, np.ndarray] = {}
+        self._sums: Dict[str, np.ndarray] = {}
+        self._confusion: Dict[str, np.ndarray] = {}
+
+    def _add(self, attr: str, stats: GroupStats) -> None:
+        index = self._index.setdefault(attr, {})
+        groups = self._groups.setdefault(attr, [])
+        positions = []
+        for group in stats.groups:
+            if group not in index:
+                index[group] = len(groups)
+                groups.append(group)
+            positions.append(index[group])
+        size = len(groups)
+        counts = _grow(self._counts.get(attr), size, np.int64)
+        sums = _grow(self._sums.get(attr), size, float)
+        confusion = _grow(self._confusion.get(attr), size, np.int64, width=len(CONFUSION_FIELDS))
+        counts[positions] += stats.counts
+        sums[positions] += stats.sums
+        if stats.confusion is not None:
+            confusion[positions] += stats.confusion
+        self._counts[attr], self._sums[attr], self._confusion[attr] = counts, sums, confusion
+
+    def update(self, predictions: Sequence[float], protected_attributes: Dict[str, Sequence[Any]],
+               labels: Optional[Sequence[Any]] = None) -> "FairnessAccumulator":
+        """
+        Fold a batch of predictions (and optional labels) into the totals.
+        Raises:
+            ValueError: If the batch is labelled and the totals are not, or
+                the other way round (see check_labels).
+        """
+        self.check_labels(len(predictions), len(predictions) if labels is not None else 0)
+        for attr, stats in aggregate_groups(predictions, protected_attributes, labels).items():
+            self._add(attr, stats)
+        self.rows += len(predictions)
+        return self
+
+    def merge(self, other: "FairnessAccumulator") -> "FairnessAccumulator":
+        """Fold another accumulator into this one (see check_labels)."""
+        self.check_labels(other.rows, other.labelled_rows)
+        for attr, stats in other.group_stats().items():
+            self._add(attr, stats)
+        self.rows += other.rows
+        return self
+
+    @property
+    def labelled_rows(self) -> int:
+        """Rows that came with labels; every attribute's confusion counts cover each of them once."""
+        for confusion in self._confusion.values():
+            return int(confusion.sum())
+        return 0
+
+    def check_labels(self, rows: int, labelled_rows: int) -> None:
+        """
+        Refuse to fold rows into totals that differ in whether they are
+        labelled. The confusion counts would then cover only part of the
+        stream while the label-aware rates are reported for all of it.
+        Raises:
+            ValueError: If both sides have rows and only one has labels.
+        """
+        if self.rows and rows and bool(self.labelled_rows) != bool(labelled_rows):
+            if labelled_rows:
+                raise ValueError("Labels were given, but earlier predictions had none")
+            raise ValueError("Labels are required, earlier predictions had them")
+
+    def group_stats(self) -> Dict[str, GroupStats]:
+        """Current totals as GroupStats; confusion is None when no labels were seen."""
+        stats = {}
+        for attr, groups in self._groups.items():
+            confusion = self._confusion[attr]
+            stats[attr] = GroupStats(list(groups), self._counts[attr].copy(), self._sums[attr].copy(),
+                                     confusion.copy() if confusion.any() else None)
+        return stats
+
+    def report(self) -> Dict[str, Any]:
+        """Fairness metrics in the evaluate_fairness response shape."""
+        return fairness_report(self.group_stats())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state, accepted by from_dict() on any worker or node."""
+        return {
+            'version': self.STATE_VERSION,
+            'rows': self.rows,
+            'attributes': {
+                attr: {
+                    'groups': groups,
+                    'counts': self._counts[attr].tolist(),
+                    'sums': self._sums[attr].tolist(),
+                    'confusion': self._confusion[attr].tolist()
+                }
+                for attr, groups in self._groups.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "FairnessAccumulator":
+        """
+        Rebuild an accumulator from to_dict() output.
+        Raises:
+            ValueError: If the state is malformed or from another version.
+        """
+        if not isinstance(state, dict) or state.get('version') != cls.STATE_VERSION:
+            raise ValueError("Unsupported accumulator state")
+        accumulator = cls()
+        try:
+            for attr, table in state['attributes'].items():
+                groups = table['groups']
+                confusion = np.asarray(table['confusion'], dtype=np.int64).reshape(len(groups), len(CONFUSION_FIELDS))
+                accumulator._add(attr, GroupStats(
+                    groups,
+                    np.asarray(table['counts'], dtype=np.int64),
+                    np.asarray(table['sums'], dtype=float),
+                    confusion
+                ))
+            accumulator.rows = int(state['rows'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed accumulator state: {str(e)}") from e
+        return accumulator
+
+
+def _grow(array: Optional[np.ndarray], size: int, dtype: Any, width: int = 0) -> np.ndarray:
+    """Return array padded with zero rows up to size rows."""
+    shape = (size, width) if width else (size,)
+    if array is None:
+        return np.zeros(shape, dtype=dtype)
+    if len(array) < size:
+        padding = np.zeros((size - len(array),) + shape[1:], dtype=dtype)
+        array = np.concatenate([array, padding])
+    return array
+
+
+def fairness_report(group_stats: Dict[str, GroupStats]) -> Dict[str, Any]:
+    """
+    Build the evaluate_fairness response from aggregated group statistics.
+    Args:
+        group_stats: Output of aggregate_groups() or FairnessAccumulator.group_stats().
+    Returns:
+        Dictionary with fairness metrics and bias analysis.
+    """
+    metrics = {
+        'demographic_parity': calculate_demographic_parity(None, None, group_stats),
+        'equal_opportunity': calculate_equal_opportunity(None, None, group_stats=group_stats),
+        'predictive_parity': calculate_predictive_parity(None, None, group_stats=group_stats)
+    }
+    metrics['bias_analysis'] = detect_bias(None, None, group_stats)
+    return metrics
+
+
+def attach_uncertainty(metrics: Dict[str, Any], uncertainty: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add bootstrap intervals and p-values from model.bootstrap to a fairness
+    report. With them, potential_bias also requires the demographic
+    disparity to be significant, so small groups stop raising false alarms.
+    """
+    alpha = 1 - uncertainty['confidence']
+    placements = {
+        'demographic_parity': ('demographic_parity', 'disparity'),
+        'equal_opportunity': ('equal_opportunity', 'disparity'),
+        'equal_opportunity_fpr': ('equal_opportunity', 'false_positive_rate_disparity'),
+        'predictive_parity': ('predictive_parity', 'disparity')
+    }
+    for name, by_attr in uncertainty['disparities'].items():
+        metric, key = placements[name]
+        for attr, result in by_attr.items():
+            entry = metrics[metric].get(attr)
+            if isinstance(entry, dict):
+                entry[f'{key}_confidence_interval'] = result['confidence_interval']
+                entry[f'{key}_p_value'] = result['p_value']
+    for attr, result in uncertainty['disparities'].get('demographic_parity', {}).items():
+        entry = metrics['bias_analysis'].get(attr)
+        if isinstance(entry, dict):
+            entry['confidence_interval'] = result['confidence_interval']
+            entry['p_value'] = result['p_value']
+            entry['potential_bias'] = bool(entry['potential_bias'] and result['p_value'] is not None
+                                           and result['p_value'] < alpha)
+    metrics['bootstrap'] = {key: uncertainty[key] for key in ('resamples', 'confidence', 'seed')}
+    return metrics
+
+
+def evaluate_fairness(dataset: Any) -> Dict[str, Any]:
     """
     Evaluate fairness metrics for a dataset of predictions.
     Args:
-        dataset: Dictionary with 'predictions' and 'protected_attributes'.
+        dataset: Dictionary with 'predictions' and 'protected_attributes', and
+            optionally 'labels' (true outcomes) for the label-aware metrics and
+            'bootstrap' (true, or {'resamples', 'confidence', 'seed'}) for
+            confidence intervals and p-values on every disparity. Columns may
+            be lists or arrays (attributes also Categorical). A path or file
+            object of a CSV, Parquet, Arrow or .npy/.npz dataset is loaded
+            with utils.columnar.load_dataset.
     Returns:
         Dictionary with fairness metrics and bias analysis.
     """
     try:
+        if not isinstance(dataset, dict):
+            from utils.columnar import load_dataset
+            dataset = load_dataset(dataset)
         predictions = dataset.get('predictions', [])
         protected_attributes = dataset.get('protected_attributes', {})
-        if not predictions or not protected_attributes:
+        if len(predictions) == 0 or not protected_attributes:
             logger.error('Missing predictions or protected attributes')
             return {'error': 'Missing predictions or protected attributes'}
-        metrics = {
-            'demographic_parity': calculate_demographic_parity(predictions, protected_attributes),
-            'equal_opportunity': calculate_equal_opportunity(predictions, protected_attributes),
-            'predictive_parity': calculate_predictive_parity(predictions, protected_attributes)
-        }
-        bias_analysis = detect_bias(predictions, protected_attributes)
-        metrics['bias_analysis'] = bias_analysis
-        return metrics
+        labels = dataset.get('labels')
+        bootstrap = dataset.get('bootstrap')
+        if not bootstrap:
+            return fairness_report(aggregate_groups(predictions, protected_attributes, labels))
+        from model.bootstrap import BOOTSTRAP_BINS, DEFAULT_CONFIDENCE, DEFAULT_RESAMPLES, bootstrap_disparities
+        options = bootstrap if isinstance(bootstrap, dict) else {}
+        group_stats = aggregate_groups(predictions, protected_attributes, labels, bins=BOOTSTRAP_BINS)
+        metrics = fairness_report(group_stats)
+        uncertainty = bootstrap_disparities(
+            group_stats,
+            resamples=int(options.get('resamples', DEFAULT_RESAMPLES)),
+            confidence=float(options.get('confidence', DEFAULT_CONFIDENCE)),
+            seed=options.get('seed')
+        )
+        return attach_uncertainty(metrics, uncertainty)
     except Exception as e:
-        logger.error(f"Error in fairness evaluation: {str(e)}")
+        logger.error("Error in fairness evaluation", extra=exception_fields(e))
         return {'error': f"Error in fairness evaluation: {str(e)}"}
 
-def calculate_demographic_parity(predictions: list, protected_attributes: dict) -> Dict[str, Any]:
+def calculate_demographic_parity(predictions: list, protected_attributes: dict,
+                                 group_stats: Optional[Dict[str, GroupStats]] = None) -> Dict[str, Any]:
     """
     Calculate demographic parity for each protected attribute.
+    Pass group_stats from aggregate_groups() to reuse an existing aggregation.
     """
     try:
+        if group_stats is None:
+            group_stats = aggregate_groups(predictions, protected_attributes)
         parity_metrics = {}
-        for attr, values in protected_attributes.items():
-            selection_rates = {}
-            for value in set(values):
-                mask = np.array(values) == value
-                rate = np.mean(np.array(predictions)[mask])
-                selection_rates[value] = rate
+        for attr, stats in group_stats.items():
+            selection_rates = stats.mean_by_group()
             rates = list(selection_rates.values())
             disparity = max(rates) - min(rates)
             parity_metrics[attr] = {
@@ -64,45 +435,82 @@ def calculate_demographic_parity(predictions: list, protected_attributes: dict)
             }
         return parity_metrics
     except Exception as e:
-        logger.error(f"Error calculating demographic parity: {str(e)}")
+        logger.error("Error calculating demographic parity", extra=exception_fields(e))
         return {'error': str(e)}
 
-def calculate_equal_opportunity(predictions: list, protected_attributes: dict) -> Dict[str, Any]:
+def _rates_by_group(groups: List[Any], rates: np.ndarray) -> Dict[Any, Optional[float]]:
+    return {group: (None if np.isnan(rate) else rate) for group, rate in zip(groups, rates.tolist())}
+
+def _rate_gap(rates: np.ndarray) -> Optional[float]:
+    """Largest difference between defined group rates (None if no group has one)."""
+    defined = rates[~np.isnan(rates)]
+    return float(defined.max() - defined.min()) if defined.size else None
+
+def calculate_equal_opportunity(predictions: list, protected_attributes: dict, labels: Optional[list] = None,
+                                group_stats: Optional[Dict[str, GroupStats]] = None) -> Dict[str, Any]:
     """
-    Calculate equal opportunity (requires true labels, not available here).
+    Calculate equal opportunity: per-group true and false positive rates and
+    their gaps (the FPR gap together with the TPR gap gives equalized odds).
+    Requires true labels, via labels or group_stats built with labels.
     """
     try:
-        return {
-            'note': 'Equal opportunity requires true labels, which are not available in this example'
-        }
+        if group_stats is None and labels is not None:
+            group_stats = aggregate_groups(predictions, protected_attributes, labels)
+        if not group_stats or any(stats.confusion is None for stats in group_stats.values()):
+            return {
+                'note': 'Equal opportunity requires true labels, which are not available in this example'
+            }
+        opportunity_metrics = {}
+        for attr, stats in group_stats.items():
+            rates = stats.confusion_rates()
+            opportunity_metrics[attr] = {
+                'true_positive_rates': _rates_by_group(stats.groups, rates['tpr']),
+                'false_positive_rates': _rates_by_group(stats.groups, rates['fpr']),
+                'disparity': _rate_gap(rates['tpr']),
+                'false_positive_rate_disparity': _rate_gap(rates['fpr'])
+            }
+        return opportunity_metrics
     except Exception as e:
-        logger.error(f"Error calculating equal opportunity: {str(e)}")
+        logger.error("Error calculating equal opportunity", extra=exception_fields(e))
         return {'error': str(e)}
 
-def calculate_predictive_parity(predictions: list, protected_attributes: dict) -> Dict[str, Any]:
+def calculate_predictive_parity(predictions: list, protected_attributes: dict, labels: Optional[list] = None,
+                                group_stats: Optional[Dict[str, GroupStats]] = None) -> Dict[str, Any]:
     """
-    Calculate predictive parity (requires true labels, not available here).
+    Calculate predictive parity: per-group positive predictive value (precision)
+    and its gap. Requires true labels, via labels or group_stats built with labels.
     """
     try:
-        return {
-            'note': 'Predictive parity requires true labels, which are not available in this example'
-        }
+        if group_stats is None and labels is not None:
+            group_stats = aggregate_groups(predictions, protected_attributes, labels)
+        if not group_stats or any(stats.confusion is None for stats in group_stats.values()):
+            return {
+                'note': 'Predictive parity requires true labels, which are not available in this example'
+            }
+        parity_metrics = {}
+        for attr, stats in group_stats.items():
+            ppv = stats.confusion_rates()['ppv']
+            parity_metrics[attr] = {
+                'positive_predictive_values': _rates_by_group(stats.groups, ppv),
+                'disparity': _rate_gap(ppv)
+            }
+        return parity_metrics
     except Exception as e:
-        logger.error(f"Error calculating predictive parity: {str(e)}")
+        logger.error("Error calculating predictive parity", extra=exception_fields(e))
         return {'error': str(e)}
 
-def detect_bias(predictions: list, protected_attributes: dict) -> Dict[str, Any]:
+def detect_bias(predictions: list, protected_attributes: dict,
+                group_stats: Optional[Dict[str, GroupStats]] = None) -> Dict[str, Any]:
     """
     Detect potential bias in predictions for each protected attribute.
+    Pass group_stats from aggregate_groups() to reuse an existing aggregation.
     """
     try:
+        if group_stats is None:
+            group_stats = aggregate_groups(predictions, protected_attributes)
         bias_indicators = {}
-        for attr, values in protected_attributes.items():
-            avg_predictions = {}
-            for value in set(values):
-                mask = np.array(values) == value
-                avg_pred = np.mean(np.array(predictions)[mask])
-                avg_predictions[value] = avg_pred
+        for attr, stats in group_stats.items():
+            avg_predictions = stats.mean_by_group()
             values_list = list(avg_predictions.values())
             max_diff = max(values_list) - min(values_list)
             bias_indicators[attr] = {
@@ -112,5 +520,5 @@ def detect_bias(predictions: list, protected_attributes: dict) -> Dict[str, Any]
             }
         return bias_indicators
     except Exception as e:
-        logger.error(f"Error detecting bias: {str(e)}")
+        logger.error("Error detecting bias", extra=exception_fields(e))
         return {'error': str(e)}
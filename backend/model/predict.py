@@ -2,69 +2,219 @@
 Candidate Prediction Module
 
 Provides advanced bias-aware candidate prediction and analysis utilities.
+Analysis runs under a profile (ANALYSIS_PROFILE, or chosen per request):
+'deep' runs every analyzer, 'standard' drops TextBlob and takes polarity
+from VADER, and 'fast' runs VADER on a sample of sentences for bulk
+screening. Each prediction reports which analyzers ran and their timings.
 """
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from fairlearn.metrics import demographic_parity_difference
-from fairlearn.postprocessing import ThresholdOptimizer
-from sklearn.preprocessing import StandardScaler
+import os
 import re
-from textblob import TextBlob
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
 import logging
+import numpy as np
+from utils.nltk_resources import get_sentiment_analyzer
+from utils.keyword_matcher import PREFIX, KeywordHit, KeywordMatcher, group_by_span, keywords_found
+from utils.metrics import ERRORS, record_stage
+from model.taxonomy import DEFAULT_ROLE, get_taxonomy
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.download('vader_lexicon', quiet=True)
-    nltk.download('punkt', quiet=True)
-except Exception as e:
-    logger.error(f"Error downloading NLTK data: {str(e)}")
+BIAS_PATTERNS = {
+    'gender_bias': ['he', 'she', 'his', 'her', 'man', 'woman', 'male', 'female'],
+    'age_bias': ['young', 'old', 'senior', 'junior', 'experienced', 'fresh'],
+    'cultural_bias': ['native', 'foreign', 'international', 'local'],
+    'language_bias': ['fluent', 'native speaker', 'accent', 'bilingual']
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+
+class AnalysisProfile(NamedTuple):
+    name: str
+    # TextBlob polarity; without it polarity is VADER's pos - neg
+    textblob: bool
+    # Sentences VADER reads, evenly spaced over the text (0 = the whole text)
+    sentence_sample: int
+
+
+ANALYSIS_PROFILES = {
+    'fast': AnalysisProfile('fast', textblob=False, sentence_sample=20),
+    'standard': AnalysisProfile('standard', textblob=False, sentence_sample=0),
+    'deep': AnalysisProfile('deep', textblob=True, sentence_sample=0)
+}
+# Profile used when a request does not choose one
+ANALYSIS_PROFILE = os.getenv("ANALYSIS_PROFILE", "deep")
+
+
+def get_analysis_profile(name: Optional[str] = None) -> AnalysisProfile:
+    """
+    Return a profile by name (default: ANALYSIS_PROFILE).
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    name = name or ANALYSIS_PROFILE
+    if name not in ANALYSIS_PROFILES:
+        raise ValueError(f"Unknown analysis profile '{name}'; expected one of {', '.join(ANALYSIS_PROFILES)}")
+    return ANALYSIS_PROFILES[name]
+
+
+class AnalysisTrace:
+    """Which analyzers ran for one prediction, and their wall time in ms."""
+    def __init__(self, profile: AnalysisProfile) -> None:
+        self.profile = profile
+        self.timings: Dict[str, float] = {}
+        self.skipped: List[str] = []
+
+    @contextmanager
+    def measure(self, analyzer: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            ERRORS.inc('predict')
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[analyzer] = self.timings.get(analyzer, 0.0) + elapsed * 1000
+            record_stage(analyzer, elapsed)
+
+    def skip(self, analyzer: str) -> None:
+        self.skipped.append(analyzer)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'profile': self.profile.name,
+            'analyzers': {name: round(ms, 3) for name, ms in self.timings.items()},
+            'skipped': self.skipped,
+            'total_ms': round(sum(self.timings.values()), 3)
+        }
+
+
+def split_sentences(text: str, sample: int = 0) -> List[str]:
+    """The non-empty sentences of text, or at most sample of them, evenly spaced."""
+    sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text) if sentence.strip()]
+    if not sample or len(sentences) <= sample:
+        return sentences
+    step = len(sentences) / sample
+    return [sentences[int(i * step)] for i in range(sample)]
+
+# Inputs of the success model, in the column order of the enhanced features:
+# (input feature, enhanced feature, default when missing)
+SUCCESS_FEATURES = (
+    ('education_level', 'education_score', 0),
+    ('years_experience', 'experience_score', 0),
+    ('skills_match', 'skills_score', 0),
+    ('project_complexity', 'project_score', 0),
+    ('sentiment_score', 'sentiment_score', 0.5),
+    ('experience_relevance', 'relevance_score', 0),
+    ('skills_gap', 'gap_score', 1),
+    ('culture_fit', 'culture_score', 0)
+)
+FEATURE_COLUMNS = [feature for feature, _, _ in SUCCESS_FEATURES]
+ENHANCED_FEATURES = [enhanced for _, enhanced, _ in SUCCESS_FEATURES]
+DEFAULT_SUCCESS_WEIGHTS = {
+    'education_score': 0.15,
+    'experience_score': 0.20,
+    'skills_score': 0.25,
+    'project_score': 0.15,
+    'sentiment_score': 0.10,
+    'relevance_score': 0.10,
+    'gap_score': 0.05,
+    'culture_score': 0.0
+}
+# enhanced = offset + scale * input, per column; experience is also capped at 1
+_FEATURE_SCALE = np.array([1 / 3, 1 / 10, 1, 1 / 3, 1, 1, -1, 1])
+_FEATURE_OFFSET = np.array([0, 0, 0, 0, 0, 0, 1, 0])
 
 class AdvancedBiasAwarePredictor:
     """
     Advanced predictor for bias-aware candidate evaluation.
     Includes sentiment, skills gap, experience relevance, and cultural fit analysis.
     """
-    def __init__(self) -> None:
-        self.model = RandomForestClassifier(random_state=42)
-        self.success_predictor = GradientBoostingRegressor(random_state=42)
-        self.scaler = StandardScaler()
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
-        self.skills_vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-        # Industry-standard skills mapping
-        self.industry_skills = {
-            'software_engineering': ['python', 'java', 'javascript', 'react', 'node.js', 'sql', 'git', 'docker'],
-            'data_science': ['python', 'r', 'sql', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'tableau'],
-            'product_management': ['agile', 'scrum', 'jira', 'product strategy', 'user research', 'analytics'],
-            'marketing': ['digital marketing', 'seo', 'social media', 'google analytics', 'content creation'],
-            'finance': ['excel', 'financial modeling', 'risk analysis', 'accounting', 'bloomberg']
+    def __init__(self, industry_skills: Optional[Dict[str, List[str]]] = None,
+                 culture_keywords: Optional[Dict[str, List[str]]] = None,
+                 success_weights: Optional[Dict[str, float]] = None) -> None:
+        self.sentiment_analyzer = get_sentiment_analyzer()
+        # Role -> skills from the skills taxonomy; an explicit mapping replaces
+        # the taxonomy's roles but keeps its synonyms
+        self.taxonomy = get_taxonomy() if industry_skills is None else get_taxonomy().with_roles(industry_skills)
+        self.industry_skills = self.taxonomy.role_skills
+        # Company culture keyword mapping
+        self.culture_keywords = culture_keywords if culture_keywords is not None else {
+            'tech_startup': ['innovative', 'fast-paced', 'collaborative', 'agile', 'creative'],
+            'corporate': ['professional', 'structured', 'team-oriented', 'detail-oriented'],
+            'consulting': ['analytical', 'client-focused', 'strategic', 'communication']
         }
+        # One compiled matcher over every vocabulary above; bias terms and
+        # skills match whole words, culture keywords also match inflections
+        self.keywords = KeywordMatcher(
+            {
+                'bias_patterns': BIAS_PATTERNS,
+                'industry_skills': {
+                    role: [name for skill in skills for name in self.taxonomy.surface_forms[skill]]
+                    for role, skills in self.industry_skills.items()
+                },
+                'culture_keywords': self.culture_keywords
+            },
+            modes={'culture_keywords': PREFIX}
+        )
+        self.success_weights = dict(DEFAULT_SUCCESS_WEIGHTS)
+        if success_weights:
+            self.success_weights.update(success_weights)
+
+    # sklearn is only imported when one of these estimators is first used,
+    # keeping it off the import path of app.py.
+    @cached_property
+    def model(self) -> Any:
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42)
+
+    @cached_property
+    def success_predictor(self) -> Any:
+        from sklearn.ensemble import GradientBoostingRegressor
+        return GradientBoostingRegressor(random_state=42)
+
+    @cached_property
+    def scaler(self) -> Any:
+        from sklearn.preprocessing import StandardScaler
+        return StandardScaler()
 
-    def analyze_sentiment_and_tone(self, text: str) -> Dict[str, Any]:
+    @cached_property
+    def skills_vectorizer(self) -> Any:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(max_features=100, stop_words='english')
+
+    def analyze_sentiment_and_tone(self, text: str, hits: Optional[List[KeywordHit]] = None,
+                                   profile: Optional[AnalysisProfile] = None,
+                                   trace: Optional[AnalysisTrace] = None) -> Dict[str, Any]:
         """
         Analyze resume text for sentiment and potential bias indicators.
+        Args:
+            text: Resume text.
+            hits: Keyword hits for text from self.keywords.scan, if already computed.
+            profile: Analysis profile (default: ANALYSIS_PROFILE).
+            trace: Records the analyzers run, if given.
         """
         if not text:
             return {'sentiment': 'neutral', 'confidence': 0, 'bias_indicators': []}
-        blob = TextBlob(text.lower())
-        sentiment_score = blob.sentiment.polarity
-        vader_scores = self.sentiment_analyzer.polarity_scores(text)
+        profile = profile or get_analysis_profile()
+        trace = trace or AnalysisTrace(profile)
+        vader_text = '. '.join(split_sentences(text, profile.sentence_sample)) if profile.sentence_sample else text
+        with trace.measure('vader'):
+            vader_scores = self.sentiment_analyzer.polarity_scores(vader_text)
+        if profile.textblob:
+            from textblob import TextBlob
+            with trace.measure('textblob'):
+                sentiment_score = TextBlob(text.lower()).sentiment.polarity
+        else:
+            trace.skip('textblob')
+            # VADER's compound score saturates on long texts; the share of
+            # positive minus negative text stays on TextBlob's averaged scale
+            sentiment_score = vader_scores['pos'] - vader_scores['neg']
         bias_indicators = []
-        bias_patterns = {
-            'gender_bias': ['he', 'she', 'his', 'her', 'man', 'woman', 'male', 'female'],
-            'age_bias': ['young', 'old', 'senior', 'junior', 'experienced', 'fresh'],
-            'cultural_bias': ['native', 'foreign', 'international', 'local'],
-            'language_bias': ['fluent', 'native speaker', 'accent', 'bilingual']
-        }
         bias_explanations = {
             'gender_bias': {
                 'explanation': 'Gendered language detected, which may introduce gender bias.',
@@ -83,9 +233,12 @@ class AdvancedBiasAwarePredictor:
                 'suggestion': 'Only mention language skills if directly relevant to the job.'
             }
         }
-        text_lower = text.lower()
-        for bias_type, patterns in bias_patterns.items():
-            if any(pattern in text_lower for pattern in patterns):
+        if hits is None:
+            with trace.measure('keyword_scan'):
+                hits = self.keywords.scan(text, ('bias_patterns',))
+        found_types = {hit.category for hit in hits if hit.vocabulary == 'bias_patterns'}
+        for bias_type in BIAS_PATTERNS:
+            if bias_type in found_types:
                 bias_indicators.append({
                     'type': bias_type,
                     'explanation': bias_explanations[bias_type]['explanation'],
@@ -98,40 +251,57 @@ class AdvancedBiasAwarePredictor:
             'bias_indicators': bias_indicators
         }
 
-    def analyze_skills_gap(self, candidate_skills: List[str], target_role: str = 'software_engineering') -> Dict[str, Any]:
+    def analyze_skills_gap(self, candidate_skills: List[str], target_role: str = DEFAULT_ROLE) -> Dict[str, Any]:
         """
         Analyze skills gap between candidate and industry standards.
+        The candidate's skills become one bitset over the taxonomy, which is
+        matched against every role at once ('role_fit', best first).
         """
         if not candidate_skills:
-            return {'gap_score': 1.0, 'missing_skills': [], 'strength_areas': []}
-        target_skills = self.industry_skills.get(target_role, [])
-        candidate_skills_lower = [skill.lower() for skill in candidate_skills]
-        missing_skills = [skill for skill in target_skills if skill not in candidate_skills_lower]
-        strength_areas = [skill for skill in candidate_skills_lower if skill not in target_skills]
+            return {'gap_score': 1.0, 'missing_skills': [], 'strength_areas': [], 'role_fit': {}}
+        taxonomy = self.taxonomy
+        bits = taxonomy.bits(candidate_skills)
+        matches = taxonomy.role_matches(bits)
+        sizes = taxonomy.role_sizes()
+        role_fit = {
+            taxonomy.roles[i]: round(float(matches[i]) / float(sizes[i]) * 100, 1)
+            for i in np.argsort(-(matches / np.maximum(sizes, 1)), kind='stable') if sizes[i]
+        }
+        target_skills = set(self.industry_skills.get(target_role, []))
+        missing_skills = taxonomy.missing(bits, target_role)
+        recognized = taxonomy.skill_names(bits)
+        unrecognized = [skill.lower() for skill in candidate_skills if not taxonomy.skill_ids([skill])]
+        strength_areas = [skill for skill in recognized if skill not in target_skills] + unrecognized
         gap_score = len(missing_skills) / len(target_skills) if target_skills else 1.0
         return {
             'gap_score': round(gap_score, 3),
             'missing_skills': missing_skills,
             'strength_areas': strength_areas,
-            'match_percentage': round((1 - gap_score) * 100, 1)
+            'match_percentage': round((1 - gap_score) * 100, 1),
+            'role_fit': role_fit
         }
 
-    def calculate_experience_relevance(self, experience_text: str, target_role: str = 'software_engineering') -> Dict[str, Any]:
+    def calculate_experience_relevance(self, experience_text: str, target_role: str = DEFAULT_ROLE) -> Dict[str, Any]:
         """
         Calculate relevance of experience to target role.
         """
         if not experience_text:
             return {'relevance_score': 0, 'key_achievements': []}
-        sentences = re.split(r'[.!?]+', experience_text)
+        sentences = _SENTENCE_SPLIT_RE.split(experience_text)
+        # Hits are offsets into the lowered text, which lower() can make longer
+        lowered = experience_text.lower()
+        sentence_starts = [0] + [m.end() for m in _SENTENCE_SPLIT_RE.finditer(lowered)]
         relevant_keywords = self.industry_skills.get(target_role, [])
+        hits = [
+            hit for hit in self.keywords.scan(lowered, ('industry_skills',), lowered=True)
+            if hit.category == target_role
+        ]
         relevant_sentences = []
         relevance_score = 0
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            keyword_matches = sum(1 for keyword in relevant_keywords if keyword in sentence_lower)
-            if keyword_matches > 0:
-                relevant_sentences.append(sentence.strip())
-                relevance_score += keyword_matches
+        for i, sentence_hits in sorted(group_by_span(hits, sentence_starts).items()):
+            keyword_matches = len({self.taxonomy.canonical[hit.keyword] for hit in sentence_hits})
+            relevant_sentences.append(sentences[i].strip())
+            relevance_score += keyword_matches
         max_possible = len(relevant_keywords) * len(sentences)
         relevance_score = relevance_score / max_possible if max_possible > 0 else 0
         return {
@@ -143,45 +313,130 @@ class AdvancedBiasAwarePredictor:
     def predict_success_probability(self, features: Dict[str, Any]) -> float:
         """
         Predict candidate success probability using advanced features.
+        Scores the single row through predict_batch, so one candidate and a
+        batch are always scored identically.
         """
-        enhanced_features = {
-            'education_score': features.get('education_level', 0) / 3,
-            'experience_score': min(features.get('years_experience', 0) / 10, 1),
-            'skills_score': features.get('skills_match', 0),
-            'project_score': features.get('project_complexity', 0) / 3,
-            'sentiment_score': features.get('sentiment_score', 0.5),
-            'relevance_score': features.get('experience_relevance', 0),
-            'gap_score': 1 - features.get('skills_gap', 1)
-        }
-        weights = {
-            'education_score': 0.15,
-            'experience_score': 0.20,
-            'skills_score': 0.25,
-            'project_score': 0.15,
-            'sentiment_score': 0.10,
-            'relevance_score': 0.10,
-            'gap_score': 0.05
-        }
-        success_probability = sum(
-            enhanced_features[feature] * weight 
-            for feature, weight in weights.items()
-        )
-        return round(success_probability, 3)
+        row = [features.get(feature, default) for feature, _, default in SUCCESS_FEATURES]
+        return float(self.predict_batch(np.array([row], dtype=float))[0])
+
+    def _weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        weights = {**self.success_weights, **(weights or {})}
+        unknown = set(weights) - set(ENHANCED_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown success weights: {', '.join(sorted(unknown))}")
+        return np.array([weights[name] for name in ENHANCED_FEATURES], dtype=float)
+
+    def predict_batch(self, features: Any, weights: Optional[Dict[str, float]] = None,
+                      decimals: Optional[int] = 3) -> np.ndarray:
+        """
+        Score many candidates in one vectorized pass.
+        Args:
+            features: 2-D array with one row per candidate and the columns of
+                FEATURE_COLUMNS (the order of the enhanced features), or a
+                DataFrame with those column names; missing DataFrame columns
+                take the same defaults as predict_success_probability.
+            weights: Overrides of self.success_weights, keyed by enhanced
+                feature name (e.g. for re-ranking with new weights).
+            decimals: Rounding of the scores (None keeps full precision).
+        Returns:
+            Array of success probabilities, one per row.
+        Raises:
+            ValueError: If the matrix has the wrong shape or a weight is unknown.
+        """
+        if hasattr(features, 'columns'):
+            matrix = np.column_stack([
+                features[feature].to_numpy(dtype=float) if feature in features.columns
+                else np.full(len(features), default, dtype=float)
+                for feature, _, default in SUCCESS_FEATURES
+            ])
+        else:
+            matrix = np.asarray(features, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[1] != len(SUCCESS_FEATURES):
+            raise ValueError(f"Expected a (candidates, {len(SUCCESS_FEATURES)}) feature matrix, got shape {matrix.shape}")
+        enhanced = _FEATURE_OFFSET + _FEATURE_SCALE * matrix
+        np.minimum(enhanced[:, 1], 1, out=enhanced[:, 1])
+        scores = enhanced @ self._weight_vector(weights)
+        return scores if decimals is None else np.round(scores, decimals)
+
+    def feature_matrix(self, candidates: Sequence[Dict[str, Any]], target_role: str = DEFAULT_ROLE,
+                       company_culture: str = 'tech_startup') -> np.ndarray:
+        """
+        Build the predict_batch input for parsed candidates.
+        Skills gap and culture fit are computed in bulk from 'skills' and
+        'text' unless a candidate already carries 'skills_gap'/'culture_fit';
+        the other columns are read from the candidate dictionaries.
+        Returns:
+            Array of shape (candidates, len(FEATURE_COLUMNS)).
+        """
+        matrix = np.array([[candidate.get(feature, default) for feature, _, default in SUCCESS_FEATURES]
+                           for candidate in candidates], dtype=float).reshape(len(candidates), len(SUCCESS_FEATURES))
+        for column, key, compute, arg in (
+            ('skills_gap', 'skills', self.skills_gap_batch, target_role),
+            ('culture_fit', 'text', self.cultural_fit_batch, company_culture)
+        ):
+            missing = [i for i, candidate in enumerate(candidates) if column not in candidate]
+            if missing:
+                values = compute([candidates[i].get(key) or ([] if key == 'skills' else '') for i in missing], arg)
+                matrix[missing, FEATURE_COLUMNS.index(column)] = values
+        return matrix
+
+    def skills_gap_batch(self, skill_lists: Sequence[List[str]], target_role: str = DEFAULT_ROLE) -> np.ndarray:
+        """
+        gap_score of analyze_skills_gap for many candidates: the share of the
+        role's skills each candidate is missing (see role_match_batch).
+        """
+        if target_role not in self.taxonomy.roles:
+            return np.ones(len(skill_lists))
+        fractions = self.role_match_batch(skill_lists)[:, self.taxonomy.roles.index(target_role)]
+        gaps = np.where([bool(skills) for skills in skill_lists], 1 - fractions, 1.0)
+        return np.round(gaps, 3)
+
+    def role_match_batch(self, skill_lists: Sequence[List[str]]) -> np.ndarray:
+        """
+        Share of every role's skills each candidate has, as one sparse
+        candidates x skills by skills x roles matrix product.
+        Returns:
+            (candidates, roles) array, columns in self.taxonomy.roles order.
+        """
+        taxonomy = self.taxonomy
+        counts = taxonomy.match_lists(skill_lists)
+        sizes = taxonomy.role_sizes()
+        return np.divide(counts, sizes, out=np.zeros(counts.shape), where=sizes > 0)
+
+    def cultural_fit_batch(self, texts: Sequence[str], company_culture: str = 'tech_startup') -> np.ndarray:
+        """
+        fit_score of analyze_cultural_fit for many resume texts, from a
+        texts x culture keywords indicator matrix.
+        """
+        target_keywords = self.culture_keywords.get(company_culture, [])
+        if not target_keywords:
+            return np.zeros(len(texts))
+        index = {keyword: i for i, keyword in enumerate(target_keywords)}
+        present = np.zeros((len(texts), len(target_keywords)), dtype=bool)
+        for row, text in enumerate(texts):
+            if text:
+                hits = self.keywords.scan(text, ('culture_keywords',))
+                for keyword in keywords_found(hits, 'culture_keywords', company_culture):
+                    if keyword in index:
+                        present[row, index[keyword]] = True
+        return np.round(present.sum(axis=1) / len(target_keywords), 3)
 
-    def analyze_cultural_fit(self, text: str, company_culture: str = 'tech_startup') -> Dict[str, Any]:
+    def analyze_cultural_fit(self, text: str, company_culture: str = 'tech_startup',
+                             hits: Optional[List[KeywordHit]] = None) -> Dict[str, Any]:
         """
         Analyze cultural fit indicators.
+        Args:
+            text: Resume text.
+            company_culture: Key of self.culture_keywords.
+            hits: Keyword hits for text from self.keywords.scan, if already computed.
         """
-        culture_keywords = {
-            'tech_startup': ['innovative', 'fast-paced', 'collaborative', 'agile', 'creative'],
-            'corporate': ['professional', 'structured', 'team-oriented', 'detail-oriented'],
-            'consulting': ['analytical', 'client-focused', 'strategic', 'communication']
-        }
         if not text:
             return {'fit_score': 0, 'culture_alignment': []}
-        target_keywords = culture_keywords.get(company_culture, [])
-        text_lower = text.lower()
-        matched_keywords = [keyword for keyword in target_keywords if keyword in text_lower]
+        target_keywords = self.culture_keywords.get(company_culture, [])
+        if hits is None:
+            hits = self.keywords.scan(text, ('culture_keywords',))
+        found = set(keywords_found(hits, 'culture_keywords', company_culture))
+        matched_keywords = [keyword for keyword in target_keywords if keyword in found]
         fit_score = len(matched_keywords) / len(target_keywords) if target_keywords else 0
         return {
             'fit_score': round(fit_score, 3),
@@ -189,27 +444,44 @@ class AdvancedBiasAwarePredictor:
             'fit_percentage': round(fit_score * 100, 1)
         }
 
-# Initialize the enhanced predictor
-
-
-def predict_candidate(data: Dict[str, Any]) -> Dict[str, Any]:
+def predict_candidate(data: Dict[str, Any], predictor: Optional[AdvancedBiasAwarePredictor] = None,
+                      target_role: str = DEFAULT_ROLE, profile: Optional[str] = None) -> Dict[str, Any]:
     """
     Main function to predict candidate suitability and provide bias-aware analysis.
     Args:
         data: Dictionary with parsed resume and features.
+        predictor: Predictor to use; defaults to the process-wide warm instance.
+        target_role: Role of the skills taxonomy to measure the gap against.
+        profile: Analysis profile name (default: ANALYSIS_PROFILE).
     Returns:
-        Dictionary with prediction, analysis, and explanations.
+        Dictionary with prediction, analysis, and explanations; 'analysis'
+        lists the analyzers that ran with their timings.
+    Raises:
+        ValueError: If the profile is unknown.
     """
-    predictor = AdvancedBiasAwarePredictor()
+    start = time.perf_counter()
+    analysis_profile = get_analysis_profile(profile)
+    trace = AnalysisTrace(analysis_profile)
+    if predictor is None:
+        from model.registry import get_predictor
+        predictor = get_predictor()
+    # Scan the resume text once for every vocabulary
+    text = data.get('text', '')
+    with trace.measure('keyword_scan'):
+        text_hits = predictor.keywords.scan(text, ('bias_patterns', 'culture_keywords'))
     # Sentiment and bias analysis
-    sentiment_result = predictor.analyze_sentiment_and_tone(data.get('text', ''))
+    sentiment_result = predictor.analyze_sentiment_and_tone(text, hits=text_hits, profile=analysis_profile,
+                                                            trace=trace)
     # Skills gap analysis
-    skills_gap_result = predictor.analyze_skills_gap(data.get('skills', []))
+    with trace.measure('skills_gap'):
+        skills_gap_result = predictor.analyze_skills_gap(data.get('skills', []), target_role)
     # Experience relevance
     experience_text = '\n'.join(data.get('experience', [])) if isinstance(data.get('experience', []), list) else data.get('experience', '')
-    experience_relevance_result = predictor.calculate_experience_relevance(experience_text)
+    with trace.measure('experience_relevance'):
+        experience_relevance_result = predictor.calculate_experience_relevance(experience_text, target_role)
     # Cultural fit
-    culture_fit_result = predictor.analyze_cultural_fit(data.get('text', ''))
+    with trace.measure('cultural_fit'):
+        culture_fit_result = predictor.analyze_cultural_fit(text, hits=text_hits)
     # Prepare features for success probability
     features = {
         'education_level': data.get('education_level', 0),
@@ -218,14 +490,18 @@ def predict_candidate(data: Dict[str, Any]) -> Dict[str, Any]:
         'project_complexity': data.get('project_complexity', 0),
         'sentiment_score': sentiment_result.get('confidence', 0.5),
         'experience_relevance': experience_relevance_result.get('relevance_score', 0),
-        'skills_gap': skills_gap_result.get('gap_score', 1)
+        'skills_gap': skills_gap_result.get('gap_score', 1),
+        'culture_fit': culture_fit_result.get('fit_score', 0)
     }
-    success_probability = predictor.predict_success_probability(features)
+    with trace.measure('success_model'):
+        success_probability = predictor.predict_success_probability(features)
+    record_stage('predict', time.perf_counter() - start)
     return {
         'success_probability': success_probability,
         'sentiment_analysis': sentiment_result,
         'skills_gap_analysis': skills_gap_result,
         'experience_relevance': experience_relevance_result,
         'cultural_fit': culture_fit_result,
-        'explanation': 'Prediction is based on education, experience, skills, project complexity, sentiment, and bias-aware analysis.'
+        'explanation': 'Prediction is based on education, experience, skills, project complexity, sentiment, and bias-aware analysis.',
+        'analysis': trace.to_dict()
     }
@@ -0,0 +1,93 @@
+"""
+Predictor Registry
+
+Keeps one warm AdvancedBiasAwarePredictor per worker process so that the VADER
+lexicon, the sklearn estimators and the vectorizer are built once instead of on
+every request.
+"""
+import os
+import threading
+import logging
+from typing import Dict, List, Optional
+
+from model.predict import AdvancedBiasAwarePredictor
+
+logger = logging.getLogger(__name__)
+
+
+class PredictorRegistry:
+    """
+    Process-wide holder for the shared predictor.
+
+    The predictor is read-only once built, so request threads share it without
+    locking; the lock only guards construction and reloads. A predictor built
+    in the gunicorn master with --preload is plain Python/NumPy state and is
+    inherited copy-on-write by every forked worker.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._predictor: Optional[AdvancedBiasAwarePredictor] = None
+        self._industry_skills: Optional[Dict[str, List[str]]] = None
+        self._culture_keywords: Optional[Dict[str, List[str]]] = None
+
+    def _build(self) -> AdvancedBiasAwarePredictor:
+        logger.info("Building predictor for worker pid %d", os.getpid())
+        return AdvancedBiasAwarePredictor(
+            industry_skills=self._industry_skills,
+            culture_keywords=self._culture_keywords
+        )
+
+    def get(self) -> AdvancedBiasAwarePredictor:
+        """
+        Return the warm predictor, building it on first use in this process.
+        """
+        predictor = self._predictor
+        if predictor is not None:
+            return predictor
+        with self._lock:
+            if self._predictor is None:
+                self._predictor = self._build()
+            return self._predictor
+
+    def reload(self, industry_skills: Optional[Dict[str, List[str]]] = None,
+               culture_keywords: Optional[Dict[str, List[str]]] = None) -> AdvancedBiasAwarePredictor:
+        """
+        Rebuild the predictor, optionally with new skills or culture tables.
+        In-flight requests keep the instance they already hold; new requests
+        pick up the replacement once it is fully built.
+        Args:
+            industry_skills: Replacement role to skills mapping.
+            culture_keywords: Replacement company culture to keywords mapping.
+        Returns:
+            The newly built predictor.
+        """
+        with self._lock:
+            if industry_skills is not None:
+                self._industry_skills = industry_skills
+            if culture_keywords is not None:
+                self._culture_keywords = culture_keywords
+            predictor = self._build()
+            self._predictor = predictor
+            return predictor
+
+    def _after_fork(self) -> None:
+        # A lock held by another thread at fork time would stay locked forever
+        # in the child; the built predictor itself is safe to keep.
+        self._lock = threading.Lock()
+
+
+registry = PredictorRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry._after_fork)
+
+
+def get_predictor() -> AdvancedBiasAwarePredictor:
+    """Return the process-wide warm predictor."""
+    return registry.get()
+
+
+def reload_predictor(industry_skills: Optional[Dict[str, List[str]]] = None,
+                     culture_keywords: Optional[Dict[str, List[str]]] = None) -> AdvancedBiasAwarePredictor:
+    """Rebuild the process-wide predictor, e.g. after the skills or culture tables change."""
+    return registry.reload(industry_skills=industry_skills, culture_keywords=culture_keywords)
@@ -0,0 +1,248 @@
+"""
+Skills Taxonomy
+
+Role and skill vocabulary loaded from a JSON file (SKILLS_TAXONOMY_PATH,
+model/skills_taxonomy.json by default) of the form
+
+    {"skills": {canonical skill: [synonyms]},
+     "roles": {role: [skills]},
+     "skill_sets": {name: [skills]}}
+
+Skills are numbered, and every role, skill set and candidate becomes a bitset
+over that vocabulary (packed into uint64 words). Scoring a candidate against
+every role is then an AND plus popcount per role, and a batch of candidates
+against all roles is a single matrix product of the unpacked bitsets.
+Free-form skill entries ('Python (Django)', 'ReactJS') are mapped to canonical
+skills with one keyword scan over every skill name and synonym.
+"""
+import os
+import json
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+from utils.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# JSON file with the skills, synonyms and roles
+SKILLS_TAXONOMY_PATH = os.getenv("SKILLS_TAXONOMY_PATH", os.path.join(MODEL_DIR, "skills_taxonomy.json"))
+DEFAULT_ROLE = 'software_engineering'
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per row of a uint64 bitset array."""
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per row of a uint64 bitset array."""
+        return _POPCOUNT8[np.ascontiguousarray(words).view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+class SkillTaxonomy:
+    """
+    Skill vocabulary with role and skill-set bitsets.
+    Args:
+        skills: canonical skill -> synonyms.
+        roles: role -> skills (skills missing from `skills` are added).
+        skill_sets: other named skill lists scored the same way (e.g. the
+            parse-time skills_match set); not reported as roles.
+    """
+    def __init__(self, skills: Dict[str, Sequence[str]], roles: Dict[str, Sequence[str]],
+                 skill_sets: Optional[Dict[str, Sequence[str]]] = None) -> None:
+        synonyms = {skill.lower(): [s.lower() for s in names] for skill, names in skills.items()}
+        for members in list(roles.values()) + list((skill_sets or {}).values()):
+            for skill in members:
+                synonyms.setdefault(skill.lower(), [])
+        self.skills: List[str] = list(synonyms)
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+        # Surface form (name or synonym) -> canonical skill
+        self.canonical = {}
+        for skill, names in synonyms.items():
+            for name in names:
+                self.canonical.setdefault(name, skill)
+        for skill in self.skills:
+            self.canonical[skill] = skill
+        # Canonical skill -> every name it is matched by (itself first)
+        self.surface_forms: Dict[str, List[str]] = {skill: [skill] for skill in self.skills}
+        for name, skill in self.canonical.items():
+            if name != skill:
+                self.surface_forms[skill].append(name)
+        self.words = max(1, -(-len(self.skills) // 64))
+
+        self.roles: List[str] = list(roles)
+        self.role_skills: Dict[str, List[str]] = {}
+        sets = {**roles, **(skill_sets or {})}
+        self._set_index = {name: i for i, name in enumerate(sets)}
+        self._set_bits = np.zeros((len(sets), self.words), dtype=np.uint64)
+        for name, members in sets.items():
+            canonical = list(dict.fromkeys(skill.lower() for skill in members))
+            if name in roles:
+                self.role_skills[name] = canonical
+            self._set_bits[self._set_index[name]] = self._pack([self.index[skill] for skill in canonical])
+        self._set_sizes = _popcount(self._set_bits)
+        # Role membership as skill ids per role, for the skills x roles matrix
+        self._role_members = [[self.index[skill] for skill in self.role_skills[role]] for role in self.roles]
+        self._role_matrix = None
+        self.matcher = KeywordMatcher({'skills': self.surface_forms})
+
+    @classmethod
+    def load(cls, path: str = SKILLS_TAXONOMY_PATH) -> "SkillTaxonomy":
+        """Build a taxonomy from a JSON file."""
+        with open(path) as f:
+            data = json.load(f)
+        taxonomy = cls(data.get('skills', {}), data.get('roles', {}), data.get('skill_sets', {}))
+        logger.info("Loaded skills taxonomy with %d skills and %d roles", len(taxonomy.skills), len(taxonomy.roles))
+        return taxonomy
+
+    def with_roles(self, roles: Dict[str, Sequence[str]]) -> "SkillTaxonomy":
+        """A copy of this taxonomy (same synonyms and skill sets) with other roles."""
+        skills = {skill: names[1:] for skill, names in self.surface_forms.items()}
+        skill_sets = {name: [self.skills[i] for i in self._members(name)]
+                      for name in self._set_index if name not in self.role_skills}
+        return SkillTaxonomy(skills, roles, skill_sets)
+
+    def _pack(self, ids: Iterable[int]) -> np.ndarray:
+        bits = np.zeros(self.words * 64, dtype=np.uint8)
+        bits[list(ids)] = 1
+        return np.packbits(bits, bitorder='little').view(np.uint64)
+
+    def _unpack(self, words: np.ndarray) -> np.ndarray:
+        bits = np.unpackbits(np.ascontiguousarray(words).view(np.uint8), axis=-1, bitorder='little')
+        return bits[..., :len(self.skills)]
+
+    def _members(self, name: str) -> List[int]:
+        return np.flatnonzero(self._unpack(self._set_bits[self._set_index[name]])).tolist()
+
+    def skill_ids(self, entries: Sequence[str]) -> List[int]:
+        """
+        Canonical skill ids found in free-form skill entries, in first-seen order.
+        An entry that is exactly a skill name or synonym maps directly; others
+        are scanned for every skill they mention.
+        """
+        ids: Dict[int, None] = {}
+        unmatched = []
+        for entry in entries:
+            skill = self.canonical.get(str(entry).strip().lower())
+            if skill is not None:
+                ids.setdefault(self.index[skill], None)
+            else:
+                unmatched.append(str(entry))
+        if unmatched:
+            for hit in self.matcher.scan('\n'.join(unmatched), ('skills',)):
+                ids.setdefault(self.index[hit.category], None)
+        return list(ids)
+
+    def bits(self, entries: Sequence[str]) -> np.ndarray:
+        """Bitset (uint64 words) of the skills in a candidate's skill entries."""
+        return self._pack(self.skill_ids(entries or []))
+
+    def _coordinates(self, skill_lists: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(candidate row, skill id) pairs of every skill found in the lists."""
+        rows: List[int] = []
+        ids: List[int] = []
+        for row, entries in enumerate(skill_lists):
+            found = self.skill_ids(entries or [])
+            rows.extend([row] * len(found))
+            ids.extend(found)
+        return np.array(rows, dtype=np.intp), np.array(ids, dtype=np.intp)
+
+    def bits_matrix(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """Bitsets of many candidates, one row each."""
+        rows, ids = self._coordinates(skill_lists)
+        matrix = np.zeros((len(skill_lists), self.words), dtype=np.uint64)
+        np.bitwise_or.at(matrix, (rows, ids >> 6), np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64)))
+        return matrix
+
+    def role_matches(self, bits: np.ndarray) -> np.ndarray:
+        """Skills of each role (in self.roles order) present in a candidate bitset."""
+        return _popcount(self._set_bits[:len(self.roles)] & bits)
+
+    def _match_counts(self, rows: np.ndarray, ids: np.ndarray, candidates: int) -> np.ndarray:
+        from scipy.sparse import csr_matrix
+        if self._role_matrix is None:
+            role_ids = [skill for members in self._role_members for skill in members]
+            role_cols = [col for col, members in enumerate(self._role_members) for _ in members]
+            self._role_matrix = csr_matrix((np.ones(len(role_ids), dtype=np.int32), (role_ids, role_cols)),
+                                           shape=(len(self.skills), len(self.roles)))
+        present = csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, ids)),
+                             shape=(candidates, len(self.skills)))
+        # Both sides are sparse, so the work is proportional to the memberships hit
+        return (present @ self._role_matrix).toarray().astype(np.int64)
+
+    def match_matrix(self, bits_matrix: np.ndarray) -> np.ndarray:
+        """
+        Role skills present for many candidates at once: the candidate x skill
+        matrix (sparse, from the set bits) times the skill x role membership
+        matrix.
+        Returns:
+            (candidates, roles) matrix of match counts.
+        """
+        rows, cols = np.nonzero(bits_matrix)
+        words = bits_matrix[rows, cols]
+        row_parts, id_parts = [], []
+        # Peel off the lowest set bit of every non-zero word per round; rounds
+        # = the most skills sharing one word, not the vocabulary size
+        while words.size:
+            lowest = words & (~words + np.uint64(1))
+            row_parts.append(rows)
+            id_parts.append(cols * 64 + np.log2(lowest.astype(np.float64)).astype(np.intp))
+            words = words ^ lowest
+            keep = words != 0
+            words, rows, cols = words[keep], rows[keep], cols[keep]
+        rows = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=np.intp)
+        ids = np.concatenate(id_parts) if id_parts else np.empty(0, dtype=np.intp)
+        return self._match_counts(rows, ids, len(bits_matrix))
+
+    def match_lists(self, skill_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        """match_matrix for candidates given as skill entry lists."""
+        rows, ids = self._coordinates(skill_lists)
+        return self._match_counts(rows, ids, len(skill_lists))
+
+    def role_sizes(self) -> np.ndarray:
+        """Number of skills of each role, in self.roles order."""
+        return self._set_sizes[:len(self.roles)]
+
+    def set_fraction(self, entries: Sequence[str], name: str) -> float:
+        """Share of a role's or skill set's skills found in the entries (0 if it is empty)."""
+        position = self._set_index.get(name)
+        if position is None or not self._set_sizes[position]:
+            return 0
+        matched = _popcount(self._set_bits[position] & self.bits(entries))
+        return float(matched) / float(self._set_sizes[position])
+
+    def missing(self, bits: np.ndarray, role: str) -> List[str]:
+        """Skills of a role that are not in a candidate bitset, in role order."""
+        present = set(np.flatnonzero(self._unpack(bits)).tolist())
+        return [skill for skill in self.role_skills.get(role, []) if self.index[skill] not in present]
+
+    def skill_names(self, bits: np.ndarray) -> List[str]:
+        """Canonical names of the skills in a bitset."""
+        return [self.skills[i] for i in np.flatnonzero(self._unpack(bits))]
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide taxonomy, loading SKILLS_TAXONOMY_PATH on first use."""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = SkillTaxonomy.load()
+        return _taxonomy
+
+
+def reload_taxonomy(path: str = SKILLS_TAXONOMY_PATH) -> SkillTaxonomy:
+    """Load the taxonomy file again, e.g. after it has been edited."""
+    global _taxonomy
+    taxonomy = SkillTaxonomy.load(path)
+    with _taxonomy_lock:
+        _taxonomy = taxonomy
+    return taxonomy
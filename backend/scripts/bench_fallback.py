@@ -0,0 +1,112 @@
+"""
+Fallback Extraction Benchmark
+
+Times the regex fallback parser on a long synthetic resume: the per-section
+extractors (one line loop each, plus the calculate_* helpers) against the
+single-pass segment_resume(), and checks that both produce identical output.
+
+Usage (from backend/):
+    python scripts/bench_fallback.py --entries 400 --repeat 20
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Any, Callable, Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_parser import (  # noqa: E402
+    segment_resume, extract_education, extract_experience, extract_skills,
+    extract_certifications, extract_languages, calculate_education_level,
+    calculate_years_experience, calculate_skills_match, calculate_project_complexity
+)
+
+_LINES = [
+    "EDUCATION",
+    "Bachelor of Technology in Computer Science, State University, 2015 - 2019",
+    "Master of Science (M.S.) in Data Science, Institute of Technology",
+    "Higher secondary school (CBSE), 92%",
+    "EXPERIENCE",
+    "Senior Software Engineer, Example Corp (2019 - present)",
+    "• Developed a microservices platform in python and go on aws",
+    "• Led a team of 6 engineers; 5 years of experience with distributed systems",
+    "Data Analyst Intern at Analytics Co., summer 2018",
+    "- Built dashboards with sql, tableau and pandas",
+    "Responsibilities: machine learning pipelines using tensorflow and pytorch",
+    "PROJECTS",
+    "Designed and implemented a real-time chat application with react and node.js",
+    "SKILLS",
+    "• python, java, javascript, c++, docker, kubernetes, mongodb",
+    "CERTIFICATIONS",
+    "◦ AWS Certified Solutions Architect – Associate",
+    "Google Cloud certification: Professional Data Engineer",
+    "LANGUAGES",
+    "English (fluent), Hindi (native), German (proficient)",
+    "",
+    "References available on request",
+]
+
+
+def make_resume(entries: int, seed: int = 0) -> str:
+    """Build a resume of roughly entries lines by sampling realistic lines."""
+    rng = random.Random(seed)
+    return '\n'.join(rng.choice(_LINES) for _ in range(entries))
+
+
+def per_function(text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    education = extract_education(text)
+    experience = extract_experience(text)
+    skills = extract_skills(text)
+    sections = {
+        'education': education,
+        'experience': experience,
+        'skills': skills,
+        'certifications': extract_certifications(text),
+        'languages': extract_languages(text)
+    }
+    features = {
+        'education_level': calculate_education_level(education),
+        'years_experience': calculate_years_experience(experience),
+        'skills_match': calculate_skills_match(skills),
+        'project_complexity': calculate_project_complexity(experience)
+    }
+    return sections, features
+
+
+def best_of(fn: Callable[[str], Any], text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the regex fallback parser')
+    parser.add_argument('--entries', type=int, default=400, help='Lines in the synthetic resume.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    text = make_resume(args.entries, args.seed)
+    expected, fused = per_function(text), segment_resume(text)
+    # Skills come from a set, so compare them order-insensitively
+    for result in (expected, fused):
+        result[0]['skills'] = sorted(result[0]['skills'])
+    if expected != fused:
+        print("segment_resume() output differs from the per-section extractors")
+        return 1
+
+    baseline_ms = best_of(per_function, text, args.repeat)
+    fused_ms = best_of(segment_resume, text, args.repeat)
+    print(f"{len(text)} chars, {args.entries} lines, best of {args.repeat}")
+    print(f"  per-section extractors: {baseline_ms:8.2f} ms")
+    print(f"  segment_resume:         {fused_ms:8.2f} ms  ({baseline_ms / fused_ms:.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Benchmark Suite
+
+Times the public pipeline functions (parse_resume, predict_candidate,
+evaluate_fairness) and the Flask endpoints that wrap them (through the test
+client) at several input sizes, on synthetic inputs from synth_data.py. The
+results are written as JSON and compared with the checked-in baseline
+(scripts/benchmark_baseline.json); the run fails when a case is slower than
+its baseline by more than the tolerance.
+
+Usage (from backend/):
+    python scripts/benchmark.py                       # check against the baseline
+    python scripts/benchmark.py --output run.json     # also keep the results
+    python scripts/benchmark.py --only fairness --full
+    python scripts/benchmark.py --update              # re-record the baseline
+
+Timings are machine-specific: re-record the baseline on the machine (or CI
+runner) the check runs on, with requirements.txt installed, so the library
+versions match those recorded in the baseline's environment.
+"""
+import os
+import io
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Measure the pipeline itself: no cached parses, no index writes, one process
+os.environ.setdefault('RESUME_CACHE_ENABLED', '0')
+os.environ.setdefault('CANDIDATE_INDEX_ENABLED', '0')
+os.environ.setdefault('METRICS_DIR', '')
+os.environ.pop('GROQ_API_KEY', None)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+
+import numpy as np  # noqa: E402
+
+from synth_data import dataset_columns, make_fairness_dataset, make_resume_pdf  # noqa: E402
+
+BASELINE_PATH = os.path.join(BACKEND_DIR, 'scripts', 'benchmark_baseline.json')
+
+# Installed versions recorded with every run; the baseline is recorded with
+# these as pinned in requirements.txt
+BENCHMARKED_PACKAGES = ('numpy', 'pandas', 'scipy', 'scikit-learn', 'pyarrow', 'pdfminer.six', 'flask', 'orjson')
+
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_REPEAT = 5
+# Stop repeating a case once it has run for this long (after at least one run)
+CASE_TIME_BUDGET = 10.0
+
+RESUME_PAGES = (1, 5, 20)
+DATASET_ROWS = (1_000, 100_000, 1_000_000)
+FULL_DATASET_ROWS = DATASET_ROWS + (10_000_000,)
+
+# (name, setup): setup builds the inputs and returns the callable to time,
+# so filtered-out cases never generate their inputs
+Case = Tuple[str, Callable[[], Callable[[], Any]]]
+
+
+def function_cases(full: bool) -> Iterator[Case]:
+    """Cases for the pipeline functions."""
+    from utils.resume_parser import parse_resume
+    from model.predict import predict_candidate
+    from model.fairness import evaluate_fairness
+    for pages in RESUME_PAGES:
+        def parse_case(pages: int = pages) -> Callable[[], Any]:
+            pdf = make_resume_pdf(pages=pages, seed=pages)
+            return lambda: parse_resume(pdf, use_cache=False)
+        yield f"parse_resume[pages={pages}]", parse_case
+    for pages in RESUME_PAGES:
+        def predict_case(pages: int = pages) -> Callable[[], Any]:
+            data = parse_resume(make_resume_pdf(pages=pages, seed=pages), use_cache=False)
+            return lambda: predict_candidate(data)
+        yield f"predict_candidate[pages={pages}]", predict_case
+    for rows in (FULL_DATASET_ROWS if full else DATASET_ROWS):
+        def fairness_case(rows: int = rows) -> Callable[[], Any]:
+            dataset = make_fairness_dataset(rows)
+            return lambda: evaluate_fairness(dataset)
+        yield f"evaluate_fairness[rows={rows}]", fairness_case
+
+
+def endpoint_cases(full: bool) -> Iterator[Case]:
+    """Cases for the Flask endpoints, called through the test client."""
+    from app import create_app
+    clients: List[Any] = []
+
+    def client() -> Any:
+        if not clients:
+            clients.append(create_app().test_client())
+        return clients[0]
+
+    def post(path: str, **kwargs: Any) -> Any:
+        response = client().post(path, **kwargs)
+        if response.status_code != 200:
+            raise RuntimeError(f"POST {path} returned {response.status_code}: {response.get_data()[:200]!r}")
+        return response
+
+    for pages in RESUME_PAGES:
+        def upload_case(pages: int = pages) -> Callable[[], Any]:
+            pdf = make_resume_pdf(pages=pages, seed=pages)
+            return lambda: post('/upload', data={'resume': (io.BytesIO(pdf), 'resume.pdf')},
+                                content_type='multipart/form-data')
+        yield f"POST /upload[pages={pages}]", upload_case
+    for rows in (FULL_DATASET_ROWS if full else DATASET_ROWS):
+        def evaluate_case(rows: int = rows) -> Callable[[], Any]:
+            buffer = io.BytesIO()
+            np.savez(buffer, **dataset_columns(make_fairness_dataset(rows)))
+            body = buffer.getvalue()
+            return lambda: post('/evaluate_bias', data={'dataset': (io.BytesIO(body), 'dataset.npz')},
+                                content_type='multipart/form-data')
+        yield f"POST /evaluate_bias[rows={rows}]", evaluate_case
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time fn after one warm-up call (lazy imports, caches).
+    Returns:
+        Best and median wall time in ms, and the number of timed runs.
+    """
+    fn()
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < repeat and (not timings or time.perf_counter() - started < CASE_TIME_BUDGET):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'best_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'runs': len(timings)
+    }
+
+
+def run(only: Optional[str], full: bool, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Measure every case whose name contains only (all cases when None)."""
+    results = {}
+    for cases in (function_cases, endpoint_cases):
+        for name, setup in cases(full):
+            if only and only not in name:
+                continue
+            results[name] = measure(setup(), repeat)
+            print(f"  {name:<40} {results[name]['best_ms']:>10.2f} ms  (median {results[name]['median_ms']:.2f})")
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    from importlib.metadata import PackageNotFoundError, version
+    packages = {}
+    for name in BENCHMARKED_PACKAGES:
+        try:
+            packages[name] = version(name)
+        except PackageNotFoundError:
+            packages[name] = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'packages': packages
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """Cases whose best time exceeds the baseline's by more than the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"  {name}: no baseline")
+            continue
+        limit = reference['best_ms'] * (1 + tolerance)
+        if result['best_ms'] > limit:
+            regressions.append(f"{name}: {result['best_ms']:.2f} ms > {limit:.2f} ms "
+                               f"(baseline {reference['best_ms']:.2f} ms)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--update', action='store_true', help='Re-record the checked-in baseline.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative slowdown before failing (default: 0.5).')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per case.')
+    parser.add_argument('--only', help='Only run cases whose name contains this text.')
+    parser.add_argument('--full', action='store_true', help='Include the 10M-row fairness datasets.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON file.')
+    args = parser.parse_args()
+
+    results = run(args.only, args.full, args.repeat)
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    if args.update:
+        # Keep baseline entries of cases that were not run this time
+        previous = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                previous = json.load(f).get('results', {})
+        report['results'] = {**previous, **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Wrote {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update first")
+        return 1
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f).get('results', {}), args.tolerance)
+    if regressions:
+        print("FAIL: slower than the baseline beyond the tolerance:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"OK: {len(results)} cases within {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Groq Stub Server
+
+Local stand-in for the Groq chat completions API, for exercising the LLM
+client (timeouts, retries, circuit breaker) and for load tests without network
+access. Point the backend at it with
+``GROQ_API_URL=http://127.0.0.1:8089/openai/v1/chat/completions`` and any
+non-empty GROQ_API_KEY.
+
+Usage (from backend/):
+    python scripts/groq_stub.py --port 8089 --latency-ms 300 --error-rate 0.1
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+CANNED_RESUME = {
+    "education": ["B.Tech in Computer Science, Example University"],
+    "experience": ["Software Engineer at Example Corp, 3 years of experience building python services"],
+    "skills": ["python", "sql", "docker", "react"],
+    "certifications": ["AWS Certified Developer"],
+    "languages": ["English (fluent)"]
+}
+
+
+class StubConfig:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, hang_rate: float = 0.0, body: Optional[Dict[str, Any]] = None) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        # Replaces the canned completion, e.g. to send a malformed one
+        self.body = body
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(config: StubConfig) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+            with config.lock:
+                config.requests += 1
+            if random.random() < config.hang_rate:
+                # Simulate a stalled upstream; the client's read timeout should fire
+                time.sleep(3600)
+            delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+            if delay:
+                time.sleep(delay / 1000)
+            if random.random() < config.error_rate:
+                self._send(config.error_status, {"error": {"message": "stub failure"}})
+                return
+            if config.body is not None:
+                self._send(200, config.body)
+                return
+            self._send(200, {
+                "id": "stub",
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(CANNED_RESUME)}}]
+            })
+
+    return Handler
+
+
+def serve(host: str = '127.0.0.1', port: int = 8089, config: StubConfig = None) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread.
+    Returns:
+        The running server; call shutdown() to stop it. Use port 0 for an ephemeral port.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(config or StubConfig()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Local Groq chat completions stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--hang-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, args.hang_rate)
+    server = serve(args.host, args.port, config)
+    print(f"Groq stub listening on http://{args.host}:{server.server_address[1]}/openai/v1/chat/completions")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
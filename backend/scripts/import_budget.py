@@ -0,0 +1,123 @@
+"""
+Import-Time Budget
+
+Measures how long ``import app`` takes using ``python -X importtime`` and
+compares it with the checked-in report (scripts/importtime_report.txt).
+
+Usage (from backend/):
+    python scripts/import_budget.py            # check against the report
+    python scripts/import_budget.py --update   # re-record the report
+
+The check fails when the import time regresses by more than the tolerance, or
+when a dependency that must stay lazy (pandas, sklearn, nltk, ...) is imported
+at boot.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_PATH = os.path.join(BACKEND_DIR, 'scripts', 'importtime_report.txt')
+
+# Heavy packages that must only be imported by the code paths that need them
+LAZY_MODULES = ['pandas', 'sklearn', 'scipy', 'fairlearn', 'textblob', 'nltk', 'pdfminer', 'requests']
+
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_REPEAT = 5
+TOP_N = 30
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def measure(target: str = 'app') -> Tuple[int, List[Tuple[int, int, int, str]]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+    Args:
+        target: Module to import.
+    Returns:
+        Total cumulative microseconds and (self_us, cumulative_us, depth, module) rows.
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{proc.stderr}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, module))
+    total = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0)
+    return total, rows
+
+
+def best_of(repeat: int) -> Tuple[int, List[Tuple[int, int, int, str]]]:
+    """Return the fastest of several measurements to reduce noise."""
+    return min((measure() for _ in range(repeat)), key=lambda result: result[0])
+
+
+def lazy_violations(rows: List[Tuple[int, int, int, str]]) -> List[str]:
+    """Return the lazy-only packages that were imported at boot."""
+    imported = {module.split('.')[0] for _, _, _, module in rows}
+    return [name for name in LAZY_MODULES if name in imported]
+
+
+def write_report(total: int, rows: List[Tuple[int, int, int, str]]) -> None:
+    top = sorted(rows, key=lambda row: row[1], reverse=True)[:TOP_N]
+    with open(REPORT_PATH, 'w') as f:
+        f.write('# Import-time report for `import app` (python -X importtime)\n')
+        f.write('# Regenerate with: python scripts/import_budget.py --update\n')
+        f.write(f'# python: {sys.version.split()[0]}\n')
+        f.write(f'# total_us: {total}\n')
+        f.write('import time: self [us] | cumulative | imported package\n')
+        for self_us, cumulative_us, depth, module in top:
+            f.write(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth}{module}\n")
+
+
+def read_report() -> Dict[str, str]:
+    header = {}
+    with open(REPORT_PATH) as f:
+        for line in f:
+            if line.startswith('# ') and ': ' in line:
+                key, value = line[2:].strip().split(': ', 1)
+                header[key] = value
+    return header
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--update', action='store_true', help='Re-record the checked-in report.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative slowdown before failing (default: 0.5).')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Measurements to take the best of.')
+    args = parser.parse_args()
+
+    total, rows = best_of(args.repeat)
+    violations = lazy_violations(rows)
+    print(f"import app: {total / 1000:.1f} ms")
+    if violations:
+        print(f"FAIL: imported at boot but must stay lazy: {', '.join(violations)}")
+        return 1
+    if args.update:
+        write_report(total, rows)
+        print(f"Wrote {REPORT_PATH}")
+        return 0
+    if not os.path.exists(REPORT_PATH):
+        print(f"No report at {REPORT_PATH}; run with --update first")
+        return 1
+    baseline = int(read_report()['total_us'])
+    limit = baseline * (1 + args.tolerance)
+    print(f"baseline: {baseline / 1000:.1f} ms, limit: {limit / 1000:.1f} ms")
+    if total > limit:
+        print("FAIL: import time regressed beyond the tolerance")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
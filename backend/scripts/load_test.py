@@ -0,0 +1,335 @@
+"""
+Load Test
+
+Closed-loop load generator for the API. Starts the Groq stub and a local
+gunicorn serving create_app() (or targets a running server with --url),
+then, for each concurrency level, keeps that many clients busy sending a
+weighted mix of /upload, /evaluate_bias and /upload/batch requests built
+from synth_data.py fixtures. Each client sends its next request as soon as
+the previous one completes, so offered load follows the server's speed.
+
+For every level the report gives throughput, error rate and p50/p95/p99
+latency (overall and per endpoint), and marks the level where the server
+saturated: where more concurrency stopped buying throughput and only
+added queueing delay.
+
+Usage (from backend/):
+    python scripts/load_test.py --workers 2 --concurrency 1,5,10,25,50 --duration 20
+    python scripts/load_test.py --mix upload=8,evaluate_bias=2 --groq-latency-ms 400
+    python scripts/load_test.py --url http://127.0.0.1:5000 --output load.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import tempfile
+import argparse
+import threading
+import subprocess
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+
+from groq_stub import StubConfig, serve  # noqa: E402
+from synth_data import dataset_columns, make_fairness_dataset, make_resume_pdf  # noqa: E402
+
+DEFAULT_MIX = 'upload=7,evaluate_bias=2,batch=1'
+# A level is saturated when it adds less than this share of throughput over the previous level
+SATURATION_GAIN = 0.1
+# Error rate above which a level is flagged regardless of throughput
+ERROR_RATE_LIMIT = 0.01
+STARTUP_TIMEOUT = 60.0
+# Seconds a request may wait for the connection and between response bytes
+# (the read timeout matches gunicorn's worker timeout)
+REQUEST_TIMEOUT = (5.0, 120.0)
+PERCENTILES = (50, 95, 99)
+
+# (endpoint, latency in seconds, succeeded)
+Sample = Tuple[str, float, bool]
+
+
+class Fixtures:
+    """Request bodies, generated once and reused by every client."""
+    def __init__(self, resumes: int, pages: int, dataset_rows: int, batch_size: int) -> None:
+        self.pdfs = [make_resume_pdf(pages=pages, seed=seed) for seed in range(resumes)]
+        buffer = io.BytesIO()
+        np.savez(buffer, **dataset_columns(make_fairness_dataset(dataset_rows)))
+        self.dataset = buffer.getvalue()
+        self.batch_size = batch_size
+
+
+def make_requests(base_url: str, fixtures: Fixtures,
+                  timeout: Tuple[float, float] = REQUEST_TIMEOUT) -> Dict[str, Callable[[Any, random.Random], bool]]:
+    """Endpoint name -> function sending one request with a session; True on success."""
+    def upload(session: Any, rng: random.Random) -> bool:
+        files = {'resume': ('resume.pdf', rng.choice(fixtures.pdfs), 'application/pdf')}
+        return session.post(f"{base_url}/upload", files=files, timeout=timeout).status_code == 200
+
+    def evaluate_bias(session: Any, rng: random.Random) -> bool:
+        files = {'dataset': ('dataset.npz', fixtures.dataset, 'application/octet-stream')}
+        return session.post(f"{base_url}/evaluate_bias", files=files, timeout=timeout).status_code == 200
+
+    def batch(session: Any, rng: random.Random) -> bool:
+        files = [('resumes', (f"resume_{i}.pdf", rng.choice(fixtures.pdfs), 'application/pdf'))
+                 for i in range(fixtures.batch_size)]
+        response = session.post(f"{base_url}/upload/batch", files=files, stream=True, timeout=timeout)
+        # The batch streams one NDJSON line per resume; time the whole stream
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        return response.status_code == 200 and len(lines) == fixtures.batch_size and \
+            all('error' not in line for line in lines)
+
+    return {'upload': upload, 'evaluate_bias': evaluate_bias, 'batch': batch}
+
+
+def parse_mix(text: str, endpoints: List[str]) -> Dict[str, float]:
+    """Parse 'upload=7,evaluate_bias=2' into normalized weights."""
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in endpoints:
+            raise ValueError(f"Unknown endpoint '{name}' in mix; expected one of {', '.join(endpoints)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Request mix weights must add up to more than 0")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+def run_level(requests_by_name: Dict[str, Callable[[Any, random.Random], bool]], mix: Dict[str, float],
+              concurrency: int, duration: float, warmup: float, seed: int) -> Tuple[List[Sample], float]:
+    """
+    Keep concurrency clients busy for warmup + duration seconds.
+    Returns:
+        Samples of requests that started after the warm-up, and the measured
+        window in seconds.
+    """
+    import requests
+    names, weights = list(mix), list(mix.values())
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    measure_from, stop_at = start + warmup, start + warmup + duration
+
+    def client(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        with requests.Session() as session:
+            while time.perf_counter() < stop_at:
+                name = rng.choices(names, weights)[0]
+                sent = time.perf_counter()
+                try:
+                    ok = requests_by_name[name](session, rng)
+                except Exception:
+                    # Connection errors, timeouts, a truncated batch stream:
+                    # a failed request, never a lost client
+                    ok = False
+                latency = time.perf_counter() - sent
+                if sent >= measure_from:
+                    with lock:
+                        samples.append((name, latency, ok))
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Requests in flight at stop_at finish late; count the window they completed in
+    window = max(duration, time.perf_counter() - measure_from)
+    return samples, window
+
+
+def summarize(samples: List[Sample], window: float) -> Dict[str, Any]:
+    """Throughput, error rate and latency percentiles (ms) of a set of samples."""
+    if not samples:
+        return {'requests': 0, 'throughput_rps': 0.0, 'error_rate': 0.0}
+    latencies = np.array([latency for _, latency, _ in samples]) * 1000
+    errors = sum(1 for _, _, ok in samples if not ok)
+    summary = {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / window, 2),
+        'error_rate': round(errors / len(samples), 4)
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        summary[f"p{percentile}_ms"] = round(float(value), 1)
+    return summary
+
+
+def find_saturation(levels: List[Dict[str, Any]]) -> Optional[int]:
+    """
+    First concurrency level at which throughput grew by less than
+    SATURATION_GAIN over the previous level, or errors exceeded
+    ERROR_RATE_LIMIT; None when every level still scaled.
+    """
+    for previous, level in zip([None] + levels, levels):
+        overall = level['overall']
+        if overall.get('error_rate', 0) > ERROR_RATE_LIMIT:
+            return level['concurrency']
+        if previous is not None and \
+                overall['throughput_rps'] < previous['overall']['throughput_rps'] * (1 + SATURATION_GAIN):
+            return level['concurrency']
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, threads: int, groq_url: str, state_dir: str) -> Tuple[subprocess.Popen, str]:
+    """
+    Start gunicorn serving create_app() with the Groq stub and throwaway
+    state directories (no resume cache, so every upload does the full work).
+    """
+    port = free_port()
+    env = dict(
+        os.environ,
+        GROQ_API_URL=groq_url,
+        GROQ_API_KEY='load-test',
+        RESUME_CACHE_ENABLED='0',
+        CANDIDATE_INDEX_DIR=os.path.join(state_dir, 'candidate_index'),
+        JOBS_DB_PATH=os.path.join(state_dir, 'jobs.db'),
+        JOBS_SPOOL_DIR=os.path.join(state_dir, 'job_spool'),
+        AUDIT_DB_PATH=os.path.join(state_dir, 'audit_streams.db'),
+        WEB_CONCURRENCY=str(workers),
+        METRICS_DIR=os.path.join(state_dir, 'metrics')
+    )
+    command = [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', str(threads),
+               '--bind', f"127.0.0.1:{port}", '--timeout', '120', '--log-level', 'warning', 'app:create_app()']
+    log = open(os.path.join(state_dir, 'gunicorn.log'), 'wb')
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return process, f"http://127.0.0.1:{port}"
+
+
+def wait_until_ready(base_url: str, process: Optional[subprocess.Popen]) -> None:
+    import requests
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {STARTUP_TIMEOUT:.0f}s")
+
+
+def print_level(level: Dict[str, Any]) -> None:
+    overall = level['overall']
+    print(f"  c={level['concurrency']:<4} {overall['requests']:>6} req  {overall['throughput_rps']:>8.2f} req/s  "
+          f"p50 {overall.get('p50_ms', 0):>8.1f}  p95 {overall.get('p95_ms', 0):>8.1f}  "
+          f"p99 {overall.get('p99_ms', 0):>8.1f} ms  errors {overall['error_rate']:.1%}")
+    for name, summary in level['endpoints'].items():
+        if not summary['requests']:
+            print(f"      {name:<14}      0 req")
+            continue
+        print(f"      {name:<14} {summary['requests']:>6} req  p50 {summary.get('p50_ms', 0):>8.1f}  "
+              f"p95 {summary.get('p95_ms', 0):>8.1f}  p99 {summary.get('p99_ms', 0):>8.1f} ms  "
+              f"errors {summary['error_rate']:.1%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', help='Target a running server instead of starting gunicorn.')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes.')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker.')
+    parser.add_argument('--concurrency', default='1,5,10,25,50', help='Comma-separated client counts.')
+    parser.add_argument('--duration', type=float, default=20.0, help='Measured seconds per level.')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Unmeasured seconds before each level.')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Request mix weights (default: {DEFAULT_MIX}).")
+    parser.add_argument('--pages', type=int, default=2, help='Pages per synthetic resume.')
+    parser.add_argument('--resumes', type=int, default=20, help='Distinct resume PDFs to cycle through.')
+    parser.add_argument('--dataset-rows', type=int, default=100_000, help='Rows per /evaluate_bias dataset.')
+    parser.add_argument('--batch-size', type=int, default=5, help='Resumes per /upload/batch request.')
+    parser.add_argument('--groq-latency-ms', type=float, default=300.0, help='Groq stub response latency.')
+    parser.add_argument('--groq-jitter-ms', type=float, default=100.0)
+    parser.add_argument('--groq-error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the report to this JSON file.')
+    args = parser.parse_args()
+
+    fixtures = Fixtures(args.resumes, args.pages, args.dataset_rows, args.batch_size)
+    try:
+        levels_to_run = [int(value) for value in args.concurrency.split(',') if value.strip()]
+        mix = parse_mix(args.mix, ['upload', 'evaluate_bias', 'batch'])
+    except ValueError as e:
+        parser.error(str(e))
+
+    stub = process = None
+    state_dir = tempfile.mkdtemp(prefix='load_test_')
+    try:
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            stub = serve(port=0, config=StubConfig(args.groq_latency_ms, args.groq_jitter_ms, args.groq_error_rate))
+            groq_url = f"http://127.0.0.1:{stub.server_address[1]}/openai/v1/chat/completions"
+            process, base_url = start_server(args.workers, args.threads, groq_url, state_dir)
+        try:
+            wait_until_ready(base_url, process)
+        except RuntimeError as e:
+            print(f"FAIL: {str(e)}")
+            log_path = os.path.join(state_dir, 'gunicorn.log')
+            if os.path.exists(log_path):
+                with open(log_path, errors='replace') as f:
+                    print(''.join(f.readlines()[-20:]))
+            return 1
+        print(f"Target {base_url}; mix {', '.join(f'{name}={share:.0%}' for name, share in mix.items())}")
+
+        requests_by_name = make_requests(base_url, fixtures)
+        levels = []
+        for concurrency in levels_to_run:
+            samples, window = run_level(requests_by_name, mix, concurrency, args.duration, args.warmup, args.seed)
+            level = {
+                'concurrency': concurrency,
+                'overall': summarize(samples, window),
+                'endpoints': {name: summarize([s for s in samples if s[0] == name], window) for name in mix}
+            }
+            levels.append(level)
+            print_level(level)
+
+        saturation = find_saturation(levels)
+        if saturation is None and len(levels) < 2:
+            print("Run more than one concurrency level to locate the saturation point")
+        elif saturation is None:
+            print("No saturation: throughput still grew at the highest concurrency")
+        else:
+            print(f"Saturated at concurrency {saturation}: throughput stopped growing "
+                  f"(or errors exceeded {ERROR_RATE_LIMIT:.0%}); latency beyond this is queueing")
+        if args.output:
+            report = {
+                'target': base_url,
+                'server': None if args.url else {'workers': args.workers, 'threads': args.threads},
+                'mix': mix,
+                'settings': {key: getattr(args, key) for key in (
+                    'duration', 'warmup', 'pages', 'dataset_rows', 'batch_size', 'groq_latency_ms')},
+                'levels': levels,
+                'saturation_concurrency': saturation
+            }
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Wrote {args.output}")
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if stub is not None:
+            stub.shutdown()
+        shutil.rmtree(state_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Synthetic Benchmark Data
+
+Generates deterministic fixtures for the benchmarks: resume PDFs with a
+given number of pages, set of sections and skill density, and fairness
+datasets of any size (predictions, labels and protected attributes with a
+configurable bias). PDFs are written directly (text-only, Helvetica), so no
+PDF library is needed, and the same seed always gives the same bytes.
+
+Usage (from backend/):
+    python scripts/synth_data.py resumes --count 10 --pages 3 --out /tmp/resumes
+    python scripts/synth_data.py dataset --rows 1000000 --out /tmp/audit.npz
+"""
+import os
+import sys
+import random
+import argparse
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.fairness import Categorical  # noqa: E402
+from model.taxonomy import get_taxonomy  # noqa: E402
+
+SECTIONS = ('education', 'experience', 'projects', 'skills', 'certifications', 'languages')
+
+# Text lines per PDF page at 10pt with 12pt leading on US Letter
+LINES_PER_PAGE = 58
+
+_TEMPLATES = {
+    'education': [
+        "Bachelor of Technology in Computer Science, {school}, {start} - {end}",
+        "Master of Science (M.S.) in Data Science, {school}",
+        "Higher secondary school (CBSE), {score}%",
+        "Diploma in Information Technology, {school}, {end}",
+    ],
+    'experience': [
+        "{title}, {company} ({start} - {end})",
+        "• Developed a {thing} in {skill} and {skill2} serving {count}k users",
+        "• Led a team of {small} engineers; {small} years of experience with {skill}",
+        "- Built dashboards with {skill}, {skill2} and {skill3}",
+        "Responsibilities: maintained the {thing} and reviewed {skill} code",
+        "• Worked with product managers to deliver the {thing} on time",
+    ],
+    'projects': [
+        "Designed and implemented a {thing} with {skill} and {skill2}",
+        "Created an open source {thing} in {skill} ({count} stars)",
+        "Integrated {skill} into the {thing}, cutting latency by {small}0%",
+    ],
+    'skills': [
+        "• {skill_list}",
+    ],
+    'certifications': [
+        "AWS Certified Solutions Architect – Associate, {end}",
+        "Google Cloud certification: Professional Data Engineer",
+        "Certified Scrum Master (CSM), {end}",
+    ],
+    'languages': [
+        "English (fluent), Hindi (native), German (proficient)",
+        "Spanish (professional working proficiency)",
+    ],
+}
+_FILLERS = {
+    'school': ['State University', 'Institute of Technology', 'City College', 'National University'],
+    'company': ['Example Corp', 'Analytics Co.', 'Initech', 'Globex', 'Umbrella Labs'],
+    'title': ['Senior Software Engineer', 'Data Analyst Intern', 'Backend Developer', 'ML Engineer',
+              'Product Manager', 'Marketing Analyst', 'Financial Analyst'],
+    'thing': ['microservices platform', 'real-time chat application', 'recommendation engine',
+              'billing system', 'data pipeline', 'mobile app', 'reporting dashboard'],
+}
+_PLAIN_WORDS = ['tools', 'systems', 'software', 'teams', 'reports', 'processes']
+
+
+def resume_lines(pages: int = 1, sections: Sequence[str] = SECTIONS, skill_density: float = 0.5,
+                 seed: int = 0) -> List[str]:
+    """
+    Lines of a synthetic resume.
+    Args:
+        pages: Pages the text should fill.
+        sections: Sections to include, in order; each gets an equal share of lines.
+        skill_density: Probability (0-1) that a skill slot names a taxonomy
+            skill rather than a generic word; also scales skills-list length.
+        seed: Random seed.
+    Returns:
+        The lines, section headers included.
+    """
+    rng = random.Random(seed)
+    skills = sorted(get_taxonomy().skills)
+    total = max(1, pages * LINES_PER_PAGE - 2)
+    per_section = max(2, total // max(1, len(sections)))
+
+    def skill() -> str:
+        return rng.choice(skills) if rng.random() < skill_density else rng.choice(_PLAIN_WORDS)
+
+    lines = ["Jordan Example", "jordan@example.com | +1 555 0100"]
+    for section in sections:
+        lines.append(section.upper())
+        for _ in range(per_section - 1):
+            template = rng.choice(_TEMPLATES[section])
+            values: Dict[str, Any] = {key: rng.choice(options) for key, options in _FILLERS.items()}
+            values.update(
+                skill=skill(), skill2=skill(), skill3=skill(),
+                skill_list=', '.join(rng.sample(skills, max(1, int(12 * skill_density)))),
+                start=rng.randint(2005, 2018), end=rng.randint(2019, 2024),
+                score=rng.randint(60, 99), count=rng.randint(1, 900), small=rng.randint(2, 9)
+            )
+            lines.append(template.format(**values))
+    return lines[:max(total + 2, len(sections) * 2)]
+
+
+def _pdf_string(line: str) -> bytes:
+    # Helvetica with WinAnsiEncoding; characters outside it become '?'
+    raw = line.encode('cp1252', errors='replace')
+    out = bytearray(b'(')
+    for byte in raw:
+        if byte in b'()\\':
+            out += b'\\' + bytes([byte])
+        elif byte < 32 or byte > 126:
+            out += b'\\%03o' % byte
+        else:
+            out.append(byte)
+    return bytes(out + b')')
+
+
+def make_pdf(lines: Sequence[str]) -> bytes:
+    """A text-only PDF with LINES_PER_PAGE lines per page."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects: List[bytes] = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'',  # page tree, filled in below
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    kids = []
+    for page in pages:
+        stream = b'BT /F1 10 Tf 12 TL 50 750 Td\n' + b''.join(_pdf_string(line) + b" '\n" for line in page) + b'ET'
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_resume_pdf(pages: int = 1, sections: Sequence[str] = SECTIONS, skill_density: float = 0.5,
+                    seed: int = 0) -> bytes:
+    """PDF bytes of a synthetic resume (see resume_lines for the arguments)."""
+    return make_pdf(resume_lines(pages, sections, skill_density, seed))
+
+
+def make_fairness_dataset(rows: int, attributes: Optional[Dict[str, Sequence[str]]] = None,
+                          bias: float = 0.1, seed: int = 0) -> Dict[str, Any]:
+    """
+    A synthetic fairness audit dataset with array columns.
+    Args:
+        rows: Number of candidates.
+        attributes: Protected attribute -> group names (default: gender and age_group).
+        bias: Selection rate gap between the first group of each attribute and the others.
+        seed: Random seed.
+    Returns:
+        Dataset dictionary accepted by evaluate_fairness (predictions 0/1,
+        labels 0/1, protected attributes as Categorical columns, so 10M rows
+        stay at a few bytes per row).
+    """
+    rng = np.random.default_rng(seed)
+    attributes = attributes or {'gender': ['female', 'male', 'nonbinary'],
+                                'age_group': ['under_30', '30_to_50', 'over_50']}
+    protected = {}
+    rate = np.full(rows, 0.5)
+    for name, groups in attributes.items():
+        codes = rng.integers(0, len(groups), size=rows, dtype=np.int8)
+        protected[name] = Categorical(groups, codes)
+        rate -= np.where(codes == 0, bias / 2, 0.0)
+    labels = (rng.random(rows) < 0.5).astype(np.int8)
+    predictions = (rng.random(rows) < np.clip(rate + 0.2 * (labels - 0.5), 0, 1)).astype(np.int8)
+    return {'predictions': predictions, 'labels': labels, 'protected_attributes': protected}
+
+
+def dataset_columns(dataset: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """A dataset as named file columns: prediction, label, then each attribute's values."""
+    columns = {'prediction': dataset['predictions'], 'label': dataset['labels']}
+    for name, column in dataset['protected_attributes'].items():
+        columns[name] = np.asarray(column.categories)[column.codes] if isinstance(column, Categorical) else column
+    return columns
+
+
+def save_dataset(dataset: Dict[str, Any], path: str) -> None:
+    """Write a dataset as an .npz or .csv file (see dataset_columns)."""
+    columns = dataset_columns(dataset)
+    if path.endswith('.npz'):
+        np.savez(path, **columns)
+        return
+    with open(path, 'w') as f:
+        f.write(','.join(columns) + '\n')
+        for row in zip(*columns.values()):
+            f.write(','.join(str(value) for value in row) + '\n')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Generate synthetic resumes and fairness datasets')
+    commands = parser.add_subparsers(dest='command', required=True)
+    resumes = commands.add_parser('resumes', help='Write synthetic resume PDFs.')
+    resumes.add_argument('--count', type=int, default=10)
+    resumes.add_argument('--pages', type=int, default=1)
+    resumes.add_argument('--sections', default=','.join(SECTIONS), help='Comma-separated sections.')
+    resumes.add_argument('--skill-density', type=float, default=0.5)
+    resumes.add_argument('--seed', type=int, default=0)
+    resumes.add_argument('--out', required=True, help='Output directory.')
+    dataset = commands.add_parser('dataset', help='Write a synthetic fairness dataset.')
+    dataset.add_argument('--rows', type=int, default=1000)
+    dataset.add_argument('--bias', type=float, default=0.1)
+    dataset.add_argument('--seed', type=int, default=0)
+    dataset.add_argument('--out', required=True, help='Output .npz or .csv file.')
+    args = parser.parse_args()
+
+    if args.command == 'resumes':
+        sections = [name.strip() for name in args.sections.split(',') if name.strip()]
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+        os.makedirs(args.out, exist_ok=True)
+        for i in range(args.count):
+            path = os.path.join(args.out, f"resume_{i:05d}.pdf")
+            with open(path, 'wb') as f:
+                f.write(make_resume_pdf(args.pages, sections, args.skill_density, args.seed + i))
+        print(f"Wrote {args.count} resumes to {args.out}")
+    else:
+        save_dataset(make_fairness_dataset(args.rows, bias=args.bias, seed=args.seed), args.out)
+        print(f"Wrote {args.rows} rows to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""
+Test configuration: run against the backend package with no Groq key, no
+resume cache or candidate index writes, and process-local metrics.
+"""
+import os
+import sys
+
+os.environ.setdefault('RESUME_CACHE_ENABLED', '0')
+os.environ.setdefault('CANDIDATE_INDEX_ENABLED', '0')
+os.environ.setdefault('METRICS_DIR', '')
+os.environ.pop('GROQ_API_KEY', None)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
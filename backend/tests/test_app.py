@@ -0,0 +1,50 @@
+"""Request body limits of the API endpoints."""
+import io
+
+import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import app as backend
+
+
+def _multipart(field, filename, size):
+    boundary = 'testboundary'
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode() + b'x' * size + \
+        f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, 'MAX_CONTENT_LENGTH', 64 * 1024)
+    monkeypatch.setitem(backend.ENDPOINT_CONTENT_LENGTH, 'api.evaluate_bias', 1024 * 1024)
+    return backend.create_app().test_client()
+
+
+def _post(client, path, body, content_type, chunked):
+    if chunked:
+        # No Content-Length, as with a chunked upload: the server only learns
+        # the size by reading the stream
+        environ = EnvironBuilder(path=path, method='POST', input_stream=io.BytesIO(body),
+                                 content_type=content_type).get_environ()
+        del environ['CONTENT_LENGTH']
+        environ['wsgi.input_terminated'] = True
+        # Bypass the test client, which would add the Content-Length back
+        _, status, _ = run_wsgi_app(client.application, environ, buffered=True)
+        return int(status.split()[0])
+    return client.post(path, data=body, content_type=content_type).status_code
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_upload_limit_applies_without_content_length(client, chunked):
+    body, content_type = _multipart('resume', 'resume.pdf', 256 * 1024)
+    assert _post(client, '/upload', body, content_type, chunked) == 413
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_larger_endpoint_limit_still_applies(client, chunked):
+    body, content_type = _multipart('dataset', 'data.csv', 256 * 1024)
+    assert _post(client, '/evaluate_bias', body, content_type, chunked) == 400
+    body, content_type = _multipart('dataset', 'data.csv', 2 * 1024 * 1024)
+    assert _post(client, '/evaluate_bias', body, content_type, chunked) == 413
@@ -0,0 +1,54 @@
+"""Audit streams keep labelled and unlabelled batches apart."""
+import pytest
+
+import app as backend
+from model.fairness import FairnessAccumulator
+from utils.audit_streams import AuditStreamStore
+
+PREDICTIONS = [0.9, 0.2, 0.8, 0.1]
+ATTRIBUTES = {'group': ['a', 'a', 'b', 'b']}
+LABELS = [1, 0, 1, 0]
+
+
+@pytest.mark.parametrize('first, second', [(LABELS, None), (None, LABELS)])
+def test_accumulator_rejects_mixed_batches(first, second):
+    accumulator = FairnessAccumulator().update(PREDICTIONS, ATTRIBUTES, first)
+    with pytest.raises(ValueError):
+        accumulator.update(PREDICTIONS, ATTRIBUTES, second)
+    with pytest.raises(ValueError):
+        accumulator.merge(FairnessAccumulator().update(PREDICTIONS, ATTRIBUTES, second))
+    assert accumulator.rows == len(PREDICTIONS)
+
+
+def test_labelled_rows_survive_a_round_trip():
+    accumulator = FairnessAccumulator().update(PREDICTIONS, ATTRIBUTES, LABELS).update(PREDICTIONS, ATTRIBUTES, LABELS)
+    restored = FairnessAccumulator.from_dict(accumulator.to_dict())
+    assert restored.labelled_rows == restored.rows == 2 * len(PREDICTIONS)
+    assert FairnessAccumulator().labelled_rows == 0
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = AuditStreamStore(str(tmp_path / 'audit.db'))
+    monkeypatch.setattr(backend, 'get_audit_store', lambda: store)
+    return backend.create_app().test_client()
+
+
+def test_stream_rejects_a_batch_without_labels(client):
+    path = '/evaluate_bias/streams/s1'
+    data = {'predictions': PREDICTIONS, 'protected_attributes': ATTRIBUTES}
+    assert client.post(path, json={'data': {**data, 'labels': LABELS}}).status_code == 200
+    response = client.post(path, json={'data': data})
+    assert response.status_code == 400
+    assert client.get(path).get_json()['equal_opportunity']['group']['true_positive_rates']['a'] == 1.0
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {'data': [1, 2]},
+    {'data': {'predictions': 0.5, 'protected_attributes': ATTRIBUTES}},
+    {'data': {'predictions': PREDICTIONS, 'protected_attributes': ['a']}},
+    {'data': {'predictions': PREDICTIONS, 'protected_attributes': {'group': 3}}},
+])
+def test_malformed_data_is_a_client_error(client, body):
+    assert client.post('/evaluate_bias/streams/s1', json=body).status_code == 400
@@ -0,0 +1,59 @@
+"""Batch processing: a worker crash must not break the batches sharing the pool."""
+import os
+import signal
+import threading
+
+import pytest
+
+from synth_data import make_resume_pdf
+from utils import batch
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    monkeypatch.setattr(batch, 'BATCH_WORKERS', 2)
+    monkeypatch.setattr(batch, '_executor', None)
+    yield
+    if batch._executor is not None:
+        batch._executor.shutdown(wait=True, cancel_futures=True)
+        batch._executor = None
+
+
+def _inputs(count, kill_at=None):
+    pdf = make_resume_pdf(pages=1)
+    for i in range(count):
+        if i == kill_at:
+            # Kill a worker while earlier files of this and the other batch are in flight
+            for process in list(batch.get_executor()._processes.values()):
+                os.kill(process.pid, signal.SIGKILL)
+                break
+        yield f"resume_{i}.pdf", pdf, None
+
+
+def test_worker_crash_fails_only_its_files(small_pool):
+    batch.get_executor().submit(int).result()  # start the pool before killing its workers
+    results = {}
+    errors = []
+
+    def consume(name, inputs):
+        try:
+            results[name] = list(batch.run_batch(inputs))
+        except Exception as e:  # the stream must end normally
+            errors.append(e)
+
+    threads = [threading.Thread(target=consume, args=('a', _inputs(8, kill_at=3))),
+               threading.Thread(target=consume, args=('b', _inputs(8)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=300)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert not errors
+    for name in ('a', 'b'):
+        assert sorted(result['index'] for result in results[name]) == list(range(8))
+        assert all(result['status'] in ('ok', 'error') for result in results[name])
+    statuses = [result['status'] for name in results for result in results[name]]
+    assert 'error' in statuses
+    # The replacement pool keeps serving
+    assert next(batch.run_batch(_inputs(1)))['status'] == 'ok'
@@ -0,0 +1,60 @@
+"""Candidate index appends from several writers and recovery from interrupted writes."""
+import json
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.metrics.pairwise import linear_kernel
+
+from utils.candidate_index import CandidateIndex, document_id
+
+FEATURES = 2 ** 12
+RESUMES = [
+    'python developer building django and flask services with postgresql',
+    'data scientist using python pandas scikit-learn and statistics',
+    'sales manager leading a regional team and negotiating contracts',
+    'frontend engineer writing react typescript and css',
+    'machine learning engineer training pytorch models in python',
+    'accountant preparing financial statements and audits',
+]
+QUERY = 'python machine learning engineer with pandas and scikit-learn'
+
+
+def _expected_ranking(texts, query):
+    vectorizer = HashingVectorizer(n_features=FEATURES, stop_words='english', alternate_sign=False, norm=None)
+    tfidf = TfidfTransformer(sublinear_tf=True).fit(vectorizer.transform(texts))
+    scores = linear_kernel(tfidf.transform(vectorizer.transform([query])), tfidf.transform(vectorizer.transform(texts)))[0]
+    return [document_id(texts[i]) for i in np.argsort(-scores, kind='stable') if scores[i] > 0]
+
+
+def _interrupt_write(index_dir):
+    """Leave the bytes of a writer that died before committing meta.json."""
+    for name in ('data.bin', 'indices.bin', 'indptr.bin'):
+        with open(os.path.join(index_dir, name), 'ab') as f:
+            f.write(b'\xff' * 64)
+    with open(os.path.join(index_dir, 'docs.jsonl'), 'a') as f:
+        f.write(json.dumps({'id': 'lost', 'filename': 'lost.pdf'}) + '\n{"id": "partial')
+
+
+def test_appends_from_two_writers_survive_an_interrupted_write(tmp_path):
+    index_dir = str(tmp_path / 'index')
+    first = CandidateIndex(index_dir, n_features=FEATURES)
+    assert first.add((text, {'filename': f'{i}.pdf'}) for i, text in enumerate(RESUMES[:3])) == 3
+    _interrupt_write(index_dir)
+
+    second = CandidateIndex(index_dir, n_features=FEATURES)
+    # A resume the first writer indexed is skipped, as is a repeat within the batch
+    added = second.add([(RESUMES[0], {}), (RESUMES[3], {'filename': '3.pdf'}), (RESUMES[3], {})])
+    assert added == 1
+    _interrupt_write(index_dir)
+    assert first.add((text, {'filename': f'{i}.pdf'}) for i, text in enumerate(RESUMES) if i >= 2) == 2
+
+    expected = _expected_ranking(RESUMES, QUERY)
+    for index in (first, second, CandidateIndex(index_dir)):
+        result = index.search(QUERY, k=len(RESUMES))
+        assert result['candidates'] == len(RESUMES)
+        assert [doc['id'] for doc in result['results']] == expected
+        assert {doc['filename'] for doc in result['results']} <= {f'{i}.pdf' for i in range(len(RESUMES))}
+    assert CandidateIndex(index_dir).stats()['candidates'] == len(RESUMES)
+    with open(os.path.join(index_dir, 'docs.jsonl')) as f:
+        assert [json.loads(line)['id'] for line in f] == [document_id(text) for text in RESUMES]
@@ -0,0 +1,40 @@
+"""Columnar dataset loading."""
+import io
+
+import numpy as np
+
+from model.fairness import Categorical, evaluate_fairness
+from utils.columnar import load_dataset
+
+PREDICTIONS = [1, 0, 1, 1, 0, 0]
+LABELS = [1, 0, 0, 1, 1, 0]
+GENDER = ['female', 'male', 'female', 'male', 'nonbinary', 'male']
+
+
+def _npz():
+    buffer = io.BytesIO()
+    np.savez(buffer, prediction=np.array(PREDICTIONS), label=np.array(LABELS), gender=np.array(GENDER))
+    buffer.seek(0)
+    return buffer
+
+
+def _npy(path):
+    data = np.zeros(len(PREDICTIONS), dtype=[('prediction', 'i1'), ('label', 'i1'), ('gender', 'U16')])
+    data['prediction'], data['label'], data['gender'] = PREDICTIONS, LABELS, GENDER
+    np.save(path, data)
+    return path
+
+
+def test_numpy_attributes_are_dictionary_encoded(tmp_path):
+    for source, filename in ((_npz(), 'data.npz'), (_npy(str(tmp_path / 'data.npy')), None)):
+        dataset = load_dataset(source, filename)
+        gender = dataset['protected_attributes']['gender']
+        assert isinstance(gender, Categorical)
+        assert [gender.categories[code] for code in gender.codes] == GENDER
+        assert dataset['predictions'].tolist() == PREDICTIONS
+
+
+def test_numpy_dataset_matches_json_evaluation():
+    expected = evaluate_fairness({'predictions': PREDICTIONS, 'labels': LABELS,
+                                  'protected_attributes': {'gender': GENDER}})
+    assert evaluate_fairness(load_dataset(_npz(), 'data.npz')) == expected
@@ -0,0 +1,18 @@
+"""Label handling in the fairness aggregation."""
+import pytest
+
+from model.fairness import aggregate_groups, evaluate_fairness
+
+
+def test_missing_labels_are_rejected():
+    with pytest.raises(ValueError, match='missing'):
+        aggregate_groups([0.9, 0.8, 0.2, 0.1], {'group': ['a', 'a', 'b', 'b']}, [None, None, 0, 0])
+
+
+def test_missing_labels_do_not_count_as_positives():
+    result = evaluate_fairness({
+        'predictions': [0.9, 0.8, 0.2, 0.1],
+        'protected_attributes': {'group': ['a', 'a', 'b', 'b']},
+        'labels': [None, None, 0, 0]
+    })
+    assert 'missing values' in result['error']
@@ -0,0 +1,72 @@
+"""Job store maintenance: stale jobs, attempt limit, retention, worker resilience."""
+import sqlite3
+import time
+
+import pytest
+
+from utils import jobs
+from utils.jobs import JobRunner, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs.db'), str(tmp_path / 'spool'))
+
+
+def _age(store, job_id, **columns):
+    with store._connect() as conn:
+        for column, value in columns.items():
+            conn.execute(f"UPDATE jobs SET {column} = ? WHERE id = ?", (value, job_id))
+
+
+def test_stale_job_is_requeued_then_failed(store):
+    job_id = store.create('a.pdf', b'%PDF')
+    for attempt in range(1, 4):
+        assert store.claim()['attempts'] == attempt
+        _age(store, job_id, started_at=time.time() - 3600)
+        requeued, failed = store.requeue_stale(lease_seconds=60, max_attempts=3)
+        if attempt < 3:
+            assert (requeued, failed) == (1, 0)
+            assert store.get(job_id)['status'] == 'queued'
+    assert (requeued, failed) == (0, 1)
+    job = store.get(job_id)
+    assert job['status'] == 'failed' and 'attempts' in job['error']
+    assert store.claim() is None
+
+
+def test_purge_finished_keeps_recent_and_pending_jobs(store):
+    old, recent, queued = (store.create(f"{name}.pdf", b'%PDF') for name in ('old', 'recent', 'queued'))
+    for job_id in (old, recent):
+        _age(store, job_id, status='queued', created_at=0)
+    for job_id in (store.claim()['id'], store.claim()['id']):
+        store.finish(job_id, {}, result={'ok': True})
+    _age(store, old, finished_at=time.time() - 3600)
+    assert store.purge_finished(retention_seconds=60) == 1
+    assert store.get(old) is None
+    assert store.get(recent)['status'] == 'succeeded'
+    assert store.get(queued)['status'] == 'queued'
+
+
+def test_worker_survives_store_errors(store, monkeypatch):
+    store.create('a.pdf', b'%PDF')
+    store.create('b.pdf', b'%PDF')
+    ran = []
+
+    def flaky_run_job(store, job):
+        ran.append(job['id'])
+        if len(ran) == 1:
+            raise sqlite3.OperationalError('database is locked')
+        store.finish(job['id'], {}, result={})
+
+    monkeypatch.setattr(jobs, 'run_job', flaky_run_job)
+    monkeypatch.setattr(jobs, 'JOB_POLL_SECONDS', 0.01)
+    runner = JobRunner(store, workers=1)
+    runner.start()
+    try:
+        deadline = time.monotonic() + 10
+        while len(ran) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        runner.stop(timeout=5)
+    assert len(ran) == 2
+    assert store.get(ran[1])['status'] == 'succeeded'
@@ -0,0 +1,88 @@
+"""LLM client against the Groq stub: retries, deadline and circuit breaker."""
+import time
+
+import pytest
+
+from groq_stub import StubConfig, serve
+from utils.llm_client import CircuitBreaker, LLMClient, LLMRequestError, LLMUnavailableError, RetryBudget
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def stub():
+    config = StubConfig()
+    server = serve(port=0, config=config)
+    config.url = f"http://127.0.0.1:{server.server_address[1]}/openai/v1/chat/completions"
+    yield config
+    server.shutdown()
+
+
+def make_client(stub, **kwargs):
+    options = dict(api_url=stub.url, api_key='test', connect_timeout=1, read_timeout=2, deadline=5,
+                   breaker=CircuitBreaker(threshold=2, cooldown=0.2),
+                   retry_budget=RetryBudget(min_tokens=10), backoff_base=0.01, backoff_cap=0.02)
+    options.update(kwargs)
+    return LLMClient(**options)
+
+
+def test_success(stub):
+    assert '"skills"' in make_client(stub).chat(MESSAGES)
+    assert stub.requests == 1
+
+
+def test_retries_transient_errors(stub):
+    stub.error_rate = 1.0
+    client = make_client(stub, max_retries=2, breaker=CircuitBreaker(threshold=10))
+    with pytest.raises(LLMRequestError):
+        client.chat(MESSAGES)
+    assert stub.requests == 3
+
+
+def test_does_not_retry_client_errors(stub):
+    stub.error_rate, stub.error_status = 1.0, 400
+    with pytest.raises(LLMRequestError):
+        make_client(stub, max_retries=2).chat(MESSAGES)
+    assert stub.requests == 1
+
+
+def test_deadline_bounds_retries(stub):
+    stub.latency_ms = 400
+    stub.error_rate = 1.0
+    client = make_client(stub, max_retries=10, deadline=1, breaker=CircuitBreaker(threshold=100))
+    started = time.monotonic()
+    with pytest.raises(LLMRequestError):
+        client.chat(MESSAGES)
+    assert time.monotonic() - started < 1.5
+    assert stub.requests <= 3
+
+
+def test_breaker_opens_and_recovers(stub):
+    client = make_client(stub, max_retries=0)
+    stub.error_rate = 1.0
+    for _ in range(2):
+        with pytest.raises(LLMRequestError):
+            client.chat(MESSAGES)
+    with pytest.raises(LLMUnavailableError):
+        client.chat(MESSAGES)
+    assert stub.requests == 2
+    stub.error_rate = 0.0
+    time.sleep(0.25)
+    client.chat(MESSAGES)
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_malformed_probe_reopens_breaker(stub):
+    client = make_client(stub, max_retries=0)
+    client.breaker.record_failure()
+    client.breaker.record_failure()
+    time.sleep(0.25)
+    stub.body = {"choices": None}
+    with pytest.raises(LLMRequestError):
+        client.chat(MESSAGES)
+    assert client.breaker.state == CircuitBreaker.OPEN
+    # The failed probe must not wedge the breaker: the next cooldown allows another one
+    stub.body = None
+    time.sleep(0.25)
+    client.chat(MESSAGES)
+    assert client.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,24 @@
+"""Structured logging: failures are logged without their messages."""
+import json
+import logging
+
+from utils.log_config import JSONFormatter, exception_fields
+
+
+def test_exception_fields_leave_out_the_message():
+    value = 'Jane Doe'
+    try:
+        int(value)
+    except ValueError as e:
+        fields = exception_fields(e)
+    assert fields['error_type'] == 'ValueError'
+    assert 'int(' in fields['stack']
+    assert 'Jane Doe' not in json.dumps(fields)
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord('app', logging.ERROR, __file__, 1, "Error parsing resume %s", ('x',), None)
+    record.error_type = 'ValueError'
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry['msg'] == 'Error parsing resume x'
+    assert entry['error_type'] == 'ValueError'
@@ -0,0 +1,59 @@
+"""Multi-process metrics aggregation through METRICS_DIR."""
+import json
+import os
+import subprocess
+
+import pytest
+
+from utils import metrics
+from utils.metrics import CUMULATIVE_FILE, REGISTRY, REQUESTS
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(REGISTRY, 'directory', str(tmp_path))
+    monkeypatch.setattr(REGISTRY, '_path', None)
+    monkeypatch.setattr(REQUESTS, '_values', {})
+    return tmp_path
+
+
+def _exited_pid():
+    process = subprocess.Popen(['true'])
+    process.wait()
+    return process.pid
+
+
+def _write_process_file(directory, pid, count):
+    path = directory / f"metrics_{pid}_0123abcd.json"
+    path.write_text(json.dumps({REQUESTS.name: [[['/upload', 'POST', '200'], count]]}))
+    return path
+
+
+def _total():
+    return sum(REGISTRY.collect()[REQUESTS.name].values())
+
+
+@pytest.mark.skipif(metrics.fcntl is None, reason='files are only folded where fcntl is available')
+def test_exited_process_files_are_folded(metrics_dir):
+    REQUESTS.inc('/upload', 'POST', '200')
+    first = _write_process_file(metrics_dir, _exited_pid(), 2)
+    assert _total() == 3
+    assert not first.exists()
+    assert (metrics_dir / CUMULATIVE_FILE).exists()
+
+    # Folded values stay counted, and later exits add to them
+    second = _write_process_file(metrics_dir, _exited_pid(), 5)
+    assert _total() == 8
+    assert not second.exists()
+    assert _total() == 8
+    own = [name for name in os.listdir(metrics_dir) if name.startswith(f"metrics_{os.getpid()}_")]
+    assert len(own) == 1
+
+
+@pytest.mark.skipif(metrics.fcntl is None, reason='files are only folded where fcntl is available')
+def test_file_left_behind_after_folding_is_not_counted_twice(metrics_dir, monkeypatch):
+    path = _write_process_file(metrics_dir, _exited_pid(), 2)
+    monkeypatch.setattr(os, 'remove', lambda path: None)
+    assert _total() == 2
+    assert path.exists()
+    assert _total() == 2
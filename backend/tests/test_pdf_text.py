@@ -0,0 +1,33 @@
+"""PDF sources read uploads in place, and extraction is uncapped by default."""
+import mmap
+import tempfile
+
+from synth_data import make_resume_pdf
+from utils import pdf_text
+from utils.pdf_text import extract_pdf_text, open_pdf_source
+
+
+def test_small_spooled_upload_stays_in_memory():
+    pdf = make_resume_pdf(pages=1)
+    stream = tempfile.SpooledTemporaryFile(max_size=len(pdf) * 2)
+    stream.write(pdf)
+    with open_pdf_source(stream) as source:
+        assert isinstance(source.buffer, memoryview)
+        assert bytes(source.buffer) == pdf
+    assert not stream._rolled
+
+
+def test_rolled_over_upload_is_mapped():
+    pdf = make_resume_pdf(pages=1)
+    stream = tempfile.SpooledTemporaryFile(max_size=1)
+    stream.write(pdf)
+    with open_pdf_source(stream) as source:
+        assert isinstance(source.buffer, mmap.mmap)
+        assert source.buffer[:] == pdf
+
+
+def test_long_documents_are_extracted_in_full(monkeypatch):
+    monkeypatch.setattr(pdf_text, '_parallel_enabled', False)
+    with open_pdf_source(make_resume_pdf(pages=25)) as source:
+        text = extract_pdf_text(source)
+    assert text.count('\x0c') == 25
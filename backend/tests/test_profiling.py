@@ -0,0 +1,49 @@
+"""Profiled views save a profile whether they return or raise."""
+import os
+import time
+
+import pytest
+from flask import Flask
+
+from utils import profiling
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, '_ENABLED', True)
+    monkeypatch.setattr(profiling, 'PROFILE_TOKEN', 'secret')
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+
+    def busy():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    @profiling.profiled
+    def succeed():
+        busy()
+        return {'ok': True}
+
+    @profiling.profiled
+    def fail():
+        busy()
+        raise RuntimeError('boom')
+
+    app = Flask(__name__)
+    app.add_url_rule('/ok', view_func=succeed)
+    app.add_url_rule('/fail', view_func=fail)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('path, status, view', [('/ok', 200, 'succeed'), ('/fail', 500, 'fail')])
+def test_profile_is_saved(client, tmp_path, path, status, view):
+    assert client.get(path, headers={profiling.PROFILE_HEADER: 'secret'}).status_code == status
+    profiles = os.listdir(tmp_path)
+    assert len(profiles) == 1 and f'_{view}_' in profiles[0]
+    with open(tmp_path / profiles[0]) as f:
+        assert 'busy' in f.read()
+
+
+def test_requests_without_the_token_are_not_profiled(client, tmp_path):
+    assert client.get('/fail').status_code == 500
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,91 @@
+"""Resume cache tiers, budgets, expiry and counters."""
+import os
+import time
+
+from utils.resume_cache import ResumeCache
+
+ENTRY = {'text': 'x' * 1000}
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault('cache_dir', str(tmp_path / 'cache'))
+    return ResumeCache(**kwargs)
+
+
+def _disk_size(cache):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(cache.cache_dir) for name in files)
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = _cache(tmp_path, cache_dir=None, memory_items=2)
+    cache.put('a', ENTRY)
+    cache.put('b', ENTRY)
+    assert cache.get('a') == ENTRY
+    cache.put('c', ENTRY)
+    assert cache.get('b') is None
+    assert cache.get('a') == ENTRY and cache.get('c') == ENTRY
+    assert cache.counters['memory_evictions'] == 1
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = _cache(tmp_path, memory_items=0, disk_bytes=2500)
+    cache.put('a1', ENTRY)
+    cache.put('b1', ENTRY)
+    os.utime(cache._path('a1'), (time.time() - 60, time.time()))
+    os.utime(cache._path('b1'), (time.time() - 120, time.time()))
+    assert cache.get('b1') == ENTRY
+    cache.put('c1', ENTRY)
+    assert cache.get('a1') is None
+    assert cache.get('b1') == ENTRY and cache.get('c1') == ENTRY
+    assert _disk_size(cache) <= 2500
+
+
+def test_disk_budget_covers_every_worker(tmp_path):
+    # Each worker's own writes stay under the budget, their sum does not
+    workers = [_cache(tmp_path, memory_items=0, disk_bytes=9000, scan_seconds=0) for _ in range(3)]
+    for i in range(15):
+        workers[i % 3].put(f'{i:02d}', ENTRY)
+    assert _disk_size(workers[0]) <= 9000
+
+
+def test_expired_entries_are_misses_and_purged(tmp_path):
+    cache = _cache(tmp_path, memory_items=0, ttl_seconds=3600)
+    cache.put('old', ENTRY)
+    cache.put('new', ENTRY)
+    os.utime(cache._path('old'), (time.time(), time.time() - 7200))
+    assert cache.get('old') is None
+    assert not os.path.exists(cache._path('old'))
+    os.utime(cache._path('new'), (time.time(), time.time() - 7200))
+    cache.scan_seconds = 0
+    cache.put('newer', ENTRY)
+    assert not os.path.exists(cache._path('new'))
+    assert cache.counters['expirations'] == 2
+    assert ResumeCache(cache_dir=None, ttl_seconds=1).get('old') is None
+
+
+def test_parser_version_is_part_of_the_key(tmp_path):
+    cache = _cache(tmp_path)
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return ENTRY
+
+    assert cache.make_key(b'%PDF', 'v1') != cache.make_key(b'%PDF', 'v2')
+    cache.get_or_compute(b'%PDF', 'v1', parse)
+    cache.get_or_compute(b'%PDF', 'v1', parse)
+    cache.get_or_compute(b'%PDF', 'v2', parse)
+    assert len(calls) == 2
+
+
+def test_counters(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get('k1') is None
+    cache.put('k1', ENTRY)
+    assert cache.get('k1') == ENTRY
+    assert _cache(tmp_path).get('k1') == ENTRY
+    stats = cache.stats()
+    assert (stats['misses'], stats['memory_hits'], stats['stores']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+    assert stats['memory_items'] == 1 and stats['disk_bytes'] == _disk_size(cache)
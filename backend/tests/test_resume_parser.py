@@ -0,0 +1,21 @@
+"""Resume text analysis with text that lower() makes longer."""
+from model.registry import get_predictor
+from utils.resume_parser import split_into_sections
+
+# 'İ'.lower() is two characters, shifting every later offset in the lowered text
+PREFIX = 'İ' * 20
+
+
+def test_sections_keep_their_headers():
+    text = '\nEducation\nBSc Physics\nSkills\nPython'
+    expected = split_into_sections('x' * 20 + text)
+    sections = split_into_sections(PREFIX + text)
+    assert sections == expected
+    assert sections['education'] == 'Education\nBSc Physics'
+    assert sections['skills'] == 'Skills\nPython'
+
+
+def test_experience_relevance_picks_the_matching_sentence():
+    text = '. Built python and sql pipelines. Led a sales team.'
+    result = get_predictor().calculate_experience_relevance(PREFIX + text, 'software_engineering')
+    assert result['key_achievements'] == ['Built python and sql pipelines']
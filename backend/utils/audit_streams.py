@@ -0,0 +1,118 @@
+"""
+Fairness Audit Streams
+
+Server-side fairness accumulators, one per named audit stream. Clients append
+new predictions instead of resending the whole history, and metrics are read
+from the running per-group totals. State lives in SQLite (the same pattern as
+the job store), so every web worker on a host sees the same totals; streams on
+other nodes are combined by exporting one stream's state and merging it into
+another.
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from model.fairness import FairnessAccumulator
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SQLite database holding audit stream state
+AUDIT_DB_PATH = os.getenv("AUDIT_DB_PATH", os.path.join(BACKEND_DIR, "data", "audit_streams.db"))
+
+STREAM_NAME_RE = re.compile(r'^[A-Za-z0-9_.-]{1,128}$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_streams (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class AuditStreamStore:
+    """
+    SQLite-backed table of accumulator states keyed by stream name. Updates
+    run in an IMMEDIATE transaction so concurrent appends from several
+    workers are serialized instead of overwriting each other.
+    """
+    def __init__(self, db_path: str = AUDIT_DB_PATH) -> None:
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _update(self, name: str, change: Callable[[FairnessAccumulator], None]) -> FairnessAccumulator:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT state FROM audit_streams WHERE name = ?", (name,)).fetchone()
+                accumulator = FairnessAccumulator.from_dict(json.loads(row[0])) if row else FairnessAccumulator()
+                change(accumulator)
+                conn.execute(
+                    "INSERT OR REPLACE INTO audit_streams (name, state, rows, updated_at) VALUES (?, ?, ?, ?)",
+                    (name, json.dumps(accumulator.to_dict()), accumulator.rows, time.time())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return accumulator
+
+    def append(self, name: str, predictions: Sequence[float], protected_attributes: Dict[str, Sequence[Any]],
+               labels: Optional[Sequence[Any]] = None) -> FairnessAccumulator:
+        """
+        Add a batch of predictions to a stream, creating it if needed.
+        The batch is aggregated before the write lock is taken.
+        Returns:
+            The stream's updated accumulator.
+        """
+        batch = FairnessAccumulator().update(predictions, protected_attributes, labels)
+        return self._update(name, lambda accumulator: accumulator.merge(batch))
+
+    def merge(self, name: str, state: Dict[str, Any]) -> FairnessAccumulator:
+        """Merge exported accumulator state (e.g. from another node) into a stream."""
+        other = FairnessAccumulator.from_dict(state)
+        return self._update(name, lambda accumulator: accumulator.merge(other))
+
+    def get(self, name: str) -> Optional[FairnessAccumulator]:
+        """Return a stream's accumulator, or None if the stream does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT state FROM audit_streams WHERE name = ?", (name,)).fetchone()
+        return FairnessAccumulator.from_dict(json.loads(row[0])) if row else None
+
+    def delete(self, name: str) -> bool:
+        """Drop a stream. Returns False if it did not exist."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM audit_streams WHERE name = ?", (name,)).rowcount > 0
+
+
+_store: Optional[AuditStreamStore] = None
+_store_lock = threading.Lock()
+
+
+def get_audit_store() -> AuditStreamStore:
+    """Return the process-wide audit stream store, creating the database on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AuditStreamStore()
+        return _store
@@ -0,0 +1,202 @@
+"""
+Batch Resume Processing
+
+Fans resume parsing and scoring out over a shared process pool and yields one
+result per file as soon as it finishes, so a batch of hundreds of PDFs uses
+every core and the client sees results while the rest are still running.
+"""
+import io
+import os
+import zipfile
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.pdf_text import disable_parallel_extraction
+from utils.log_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for batch jobs (defaults to one per core)
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0")) or os.cpu_count() or 1
+# Upper bound on the number of resumes accepted in one batch
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "2000"))
+# Largest PDF accepted from inside a zip archive
+MAX_ARCHIVE_MEMBER_BYTES = int(os.getenv("MAX_ARCHIVE_MEMBER_BYTES", str(20 * 1024 * 1024)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by all batch requests in this worker.
+    Children are spawned rather than forked so they never inherit locks held
+    by the web server's request threads, and extract PDFs in-process since
+    the batch already keeps every core busy.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info("Starting batch process pool with %d workers", BATCH_WORKERS)
+            _executor = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+def _init_worker() -> None:
+    configure_logging()
+    disable_parallel_extraction()
+
+
+def _reset_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def process_resume_bytes(filename: str, content: bytes, profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse and score a single resume. Runs inside a pool worker.
+    Args:
+        filename: Original file name, echoed back in the result.
+        content: Raw PDF bytes.
+        profile: Analysis profile name (default: ANALYSIS_PROFILE).
+    Returns:
+        Dictionary with either 'prediction' or 'error' for the file.
+    """
+    from utils.resume_parser import parse_resume
+    from model.predict import predict_candidate
+    from utils.candidate_index import index_resume
+    try:
+        data = parse_resume(content)
+        index_resume(data, filename)
+        return {'filename': filename, 'status': 'ok', 'prediction': predict_candidate(data, profile=profile)}
+    except Exception as e:
+        return {'filename': filename, 'status': 'error', 'error': f"Error processing resume: {str(e)}"}
+
+
+def detach_uploads(files: Iterable[Any]) -> List[Tuple[str, BinaryIO]]:
+    """
+    Take ownership of the spooled upload streams behind FileStorage objects.
+    The request closes its files when the view returns, which is before a
+    streamed response is consumed, so the streams are swapped out and closed
+    by iter_batch_inputs once each one has been read instead.
+    Args:
+        files: Uploaded FileStorage objects.
+    Returns:
+        (filename, stream) pairs.
+    """
+    uploads = []
+    for file in files:
+        uploads.append((file.filename or '', file.stream))
+        file.stream = io.BytesIO()
+    return uploads
+
+
+def iter_batch_inputs(uploads: Iterable[Tuple[str, BinaryIO]]) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Expand uploaded files into individual resumes.
+    Zip archives are opened and each PDF member is yielded on its own.
+    Args:
+        uploads: (filename, stream) pairs, e.g. from detach_uploads.
+    Yields:
+        (filename, content, error) tuples; content is None when error is set.
+    """
+    count = 0
+    for name, stream in uploads:
+        with stream:
+            for item in _expand_upload(name, stream):
+                if item[2] is None:
+                    count += 1
+                    if count > MAX_BATCH_FILES:
+                        yield item[0], None, f"Batch limit of {MAX_BATCH_FILES} files exceeded"
+                        return
+                yield item
+
+
+def _expand_upload(name: str, stream: BinaryIO) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    if name.lower().endswith('.zip'):
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            yield name, None, "Invalid zip archive"
+            return
+        with archive:
+            for member in archive.infolist():
+                if member.is_dir() or not member.filename.lower().endswith('.pdf'):
+                    continue
+                if member.file_size > MAX_ARCHIVE_MEMBER_BYTES:
+                    yield member.filename, None, "File too large"
+                    continue
+                yield member.filename, archive.read(member), None
+        return
+    if not name.lower().endswith('.pdf'):
+        yield name, None, "Only PDF files are allowed"
+        return
+    yield name, stream.read(), None
+
+
+def _submit(filename: str, content: bytes, profile: Optional[str]) -> Tuple[Future, ProcessPoolExecutor]:
+    """Submit one resume to the shared pool, replacing the pool once if it is broken or shut down."""
+    executor = get_executor()
+    try:
+        return executor.submit(process_resume_bytes, filename, content, profile), executor
+    except (BrokenProcessPool, RuntimeError):
+        _reset_executor(executor)
+        executor = get_executor()
+        return executor.submit(process_resume_bytes, filename, content, profile), executor
+
+
+def run_batch(inputs: Iterable[Tuple[str, Optional[bytes], Optional[str]]],
+              profile: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Process resumes on the pool and yield results in completion order.
+    At most two files per worker are in flight, so only a small window of
+    PDF bytes is held in memory regardless of the batch size. A worker crash
+    fails the files that were on its pool, which is then replaced; other
+    files, including those of concurrent batches, carry on.
+    Args:
+        inputs: (filename, content, error) tuples from iter_batch_inputs.
+        profile: Analysis profile name passed to every resume.
+    Yields:
+        One result dictionary per input, tagged with its position in the batch.
+    """
+    window = BATCH_WORKERS * 2
+    pending: Dict[Future, Tuple[int, str, ProcessPoolExecutor]] = {}
+    inputs = enumerate(inputs)
+    exhausted = False
+    while pending or not exhausted:
+        while not exhausted and len(pending) < window:
+            try:
+                index, (filename, content, error) = next(inputs)
+            except StopIteration:
+                exhausted = True
+                break
+            if error is not None:
+                yield {'index': index, 'filename': filename, 'status': 'error', 'error': error}
+                continue
+            future, executor = _submit(filename, content, profile)
+            pending[future] = (index, filename, executor)
+        if not pending:
+            continue
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, filename, executor = pending.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                logger.error("Batch worker died", extra={'batch_index': index})
+                # Only the pool this file ran on; a no-op past its first failed future
+                _reset_executor(executor)
+                result = {'filename': filename, 'status': 'error', 'error': "Worker process crashed"}
+            except CancelledError:
+                result = {'filename': filename, 'status': 'error', 'error': "Worker process crashed"}
+            yield {'index': index, **result}
@@ -0,0 +1,308 @@
+"""
+Candidate Search Index
+
+Persistent TF-IDF index of parsed resume text for ranking the candidate pool
+against a job description. Term counts come from a hashing vectorizer, so the
+vocabulary is fixed and resumes are appended as they are parsed without
+refitting anything; IDF weights are derived from the stored matrix and
+applied at query time. The matrix is stored in CSR form as flat binary
+files (data, indices, indptr) that are appended to in place and memory-mapped
+for queries, so the index does not have to fit in RAM. Queries score the pool
+in blocks of rows with a sparse matrix-vector product and keep a running
+top-k.
+
+Writers from every worker and batch process serialize on a file lock; readers
+never lock and see the index as of the last committed metadata file.
+"""
+import os
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+import threading
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.log_config import exception_fields
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CANDIDATE_INDEX_ENABLED = os.getenv("CANDIDATE_INDEX_ENABLED", "1") not in ("0", "false", "False")
+# Directory holding the index files
+CANDIDATE_INDEX_DIR = os.getenv("CANDIDATE_INDEX_DIR", os.path.join(BACKEND_DIR, "data", "candidate_index"))
+# Hashed term space; fixed when an index is created
+CANDIDATE_INDEX_FEATURES = int(os.getenv("CANDIDATE_INDEX_FEATURES", str(2 ** 20)))
+# Rows scored per sparse block during a query
+CANDIDATE_INDEX_BLOCK_ROWS = int(os.getenv("CANDIDATE_INDEX_BLOCK_ROWS", "65536"))
+MAX_TOP_K = 1000
+
+# Flat arrays of the CSR matrix: name -> dtype
+_ARRAYS = {'data': np.float32, 'indices': np.int32, 'indptr': np.int64}
+_META = 'meta.json'
+_DOCS = 'docs.jsonl'
+_LOCK = '.lock'
+
+
+def document_id(text: str) -> str:
+    """Identifier of a resume in the index: the SHA-256 of its text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class CandidateIndex:
+    """
+    Append-only CSR matrix of sublinear term frequencies, one row per resume.
+    Files (in index_dir):
+        data.bin, indices.bin, indptr.bin: the CSR arrays.
+        docs.jsonl: one metadata line per row (id, filename, added_at).
+        meta.json: committed row and nonzero counts; anything past them in
+            the array files is an unfinished write and is ignored.
+    """
+    def __init__(self, index_dir: str = CANDIDATE_INDEX_DIR,
+                 n_features: int = CANDIDATE_INDEX_FEATURES) -> None:
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        meta = self._read_meta()
+        # An existing index keeps the term space it was built with
+        self.n_features = meta['n_features'] if meta else n_features
+        self._vectorizer: Any = None
+        self._ids: Dict[str, int] = {}
+        self._docs: List[Dict[str, Any]] = []
+        self._docs_offset = 0
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(_META)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_atomic(self, name: str, write: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, self._path(name))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def vectorize(self, texts: Sequence[str]) -> Any:
+        """Sublinear term-frequency rows (1 + log tf) for texts, as a CSR matrix."""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features, stop_words='english', alternate_sign=False,
+                norm=None, dtype=np.float32
+            )
+        matrix = self._vectorizer.transform(texts)
+        matrix.sort_indices()
+        np.log(matrix.data, out=matrix.data)
+        matrix.data += 1
+        return matrix
+
+    def _load_docs(self, rows: int) -> None:
+        """Read metadata lines committed since the last call (caller holds self._lock)."""
+        if len(self._docs) >= rows:
+            return
+        with open(self._path(_DOCS), 'rb') as f:
+            f.seek(self._docs_offset)
+            while len(self._docs) < rows:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break
+                self._docs_offset += len(line)
+                doc = json.loads(line)
+                self._ids[doc['id']] = len(self._docs)
+                self._docs.append(doc)
+
+    def add(self, documents: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Append resumes to the index. Resumes already indexed (same text) and
+        empty texts are skipped.
+        Args:
+            documents: (text, metadata) pairs; metadata is stored with the row.
+        Returns:
+            Number of rows added.
+        """
+        pending = {}
+        for text, metadata in documents:
+            if text and text.strip():
+                pending.setdefault(document_id(text), (text, metadata))
+        if not pending:
+            return 0
+        # Vectorize before taking the lock; rows of known resumes are dropped below
+        position = {doc_id: i for i, doc_id in enumerate(pending)}
+        vectors = self.vectorize([text for text, _ in pending.values()])
+        with self._lock, open(self._path(_LOCK), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            meta = self._read_meta() or {'rows': 0, 'nnz': 0, 'n_features': self.n_features}
+            self._load_docs(meta['rows'])
+            new_ids = [doc_id for doc_id in pending if doc_id not in self._ids]
+            if not new_ids:
+                return 0
+            matrix = vectors[[position[doc_id] for doc_id in new_ids]]
+            # Drop whatever an interrupted writer left past the committed sizes
+            sizes = {'data': meta['nnz'], 'indices': meta['nnz'], 'indptr': meta['rows'] + 1 if meta['rows'] else 0}
+            for name, dtype in _ARRAYS.items():
+                with open(self._path(f'{name}.bin'), 'ab') as f:
+                    f.truncate(sizes[name] * np.dtype(dtype).itemsize)
+                    if name == 'data':
+                        f.write(matrix.data.astype(dtype).tobytes())
+                    elif name == 'indices':
+                        f.write(matrix.indices.astype(dtype).tobytes())
+                    else:
+                        indptr = matrix.indptr.astype(dtype) + meta['nnz']
+                        f.write((indptr if meta['rows'] == 0 else indptr[1:]).tobytes())
+            now = time.time()
+            lines = [json.dumps({'id': doc_id, 'added_at': now, **pending[doc_id][1]}) + '\n' for doc_id in new_ids]
+            with open(self._path(_DOCS), 'ab') as f:
+                f.truncate(self._docs_offset)
+                f.write(''.join(lines).encode('utf-8'))
+            meta = {**meta, 'rows': meta['rows'] + len(new_ids), 'nnz': meta['nnz'] + matrix.nnz,
+                    'updated_at': now}
+            self._write_atomic(_META, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+        logger.info("Indexed %d resumes (%d total)", len(new_ids), meta['rows'])
+        return len(new_ids)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Memory-mapped view of the committed index, refreshed when another
+        writer has committed since the last call. None while the index is empty.
+        """
+        meta = self._read_meta()
+        if not meta or not meta['rows']:
+            return None
+        with self._lock:
+            current = self._snapshot
+            if current is not None and current['meta'] == meta:
+                return current
+            sizes = {'data': meta['nnz'], 'indices': meta['nnz'], 'indptr': meta['rows'] + 1}
+            arrays = {name: np.memmap(self._path(f'{name}.bin'), dtype=dtype, mode='r', shape=(sizes[name],))
+                      for name, dtype in _ARRAYS.items()}
+            # Document frequencies: only rows committed since the previous
+            # snapshot are counted, the rest carries over
+            if current is not None and current['meta']['nnz'] <= meta['nnz']:
+                df, counted = current['df'].copy(), current['meta']['nnz']
+            else:
+                df, counted = np.zeros(self.n_features, dtype=np.int64), 0
+            df += np.bincount(arrays['indices'][counted:], minlength=self.n_features)
+            # Smoothed IDF, as in sklearn's TfidfTransformer
+            idf = np.log((1 + meta['rows']) / (1 + df)) + 1
+            self._load_docs(meta['rows'])
+            self._snapshot = {'meta': meta, 'df': df, 'idf': idf.astype(np.float32), 'norms': None, **arrays}
+            return self._snapshot
+
+    def _blocks(self, snapshot: Dict[str, Any]) -> Iterable[Tuple[int, Any]]:
+        """(first row, CSR block) over the memory-mapped matrix."""
+        from scipy.sparse import csr_matrix
+        indptr = snapshot['indptr']
+        rows = snapshot['meta']['rows']
+        for start in range(0, rows, CANDIDATE_INDEX_BLOCK_ROWS):
+            stop = min(start + CANDIDATE_INDEX_BLOCK_ROWS, rows)
+            lo, hi = int(indptr[start]), int(indptr[stop])
+            # int32 block offsets keep scipy from copying the int32 indices to int64
+            block_indptr = (np.asarray(indptr[start:stop + 1]) - lo).astype(np.int32)
+            block = csr_matrix(
+                (snapshot['data'][lo:hi], snapshot['indices'][lo:hi], block_indptr),
+                shape=(stop - start, self.n_features)
+            )
+            yield start, block
+
+    def _norms(self, snapshot: Dict[str, Any]) -> np.ndarray:
+        """TF-IDF row norms under the snapshot's IDF, computed once per snapshot."""
+        if snapshot['norms'] is None:
+            from scipy.sparse import csr_matrix
+            idf_squared = snapshot['idf'] ** 2
+            norms = np.empty(snapshot['meta']['rows'], dtype=np.float32)
+            for start, block in self._blocks(snapshot):
+                # Squared values in a new matrix; the mapped arrays are read-only
+                squared = csr_matrix((np.square(block.data), block.indices, block.indptr), shape=block.shape)
+                norms[start:start + block.shape[0]] = np.sqrt(squared @ idf_squared)
+            snapshot['norms'] = norms
+        return snapshot['norms']
+
+    def search(self, text: str, k: int = 10) -> Dict[str, Any]:
+        """
+        Rank indexed resumes by TF-IDF cosine similarity to a job description.
+        Args:
+            text: Job description.
+            k: Number of candidates to return.
+        Returns:
+            {'candidates': pool size, 'results': [{'id', 'score', ...metadata}]},
+            best first; resumes sharing no term with the text are left out.
+        Raises:
+            ValueError: If k is out of range.
+        """
+        if not 1 <= k <= MAX_TOP_K:
+            raise ValueError(f"k must be between 1 and {MAX_TOP_K}")
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return {'candidates': 0, 'results': []}
+        query = self.vectorize([text])
+        weights = np.zeros(self.n_features, dtype=np.float32)
+        idf = snapshot['idf'][query.indices]
+        query_weights = query.data * idf
+        norm = np.linalg.norm(query_weights)
+        if not norm:
+            return {'candidates': snapshot['meta']['rows'], 'results': []}
+        # Document rows hold raw tf; their IDF factor is folded into the query
+        weights[query.indices] = query_weights * idf / norm
+        norms = self._norms(snapshot)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start, block in self._blocks(snapshot):
+            stop = start + block.shape[0]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(norms[start:stop] > 0, (block @ weights) / norms[start:stop], 0)
+            rows = np.flatnonzero(scores > 0)
+            if rows.size > k:
+                rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+            best_rows = np.concatenate([best_rows, rows + start])
+            best_scores = np.concatenate([best_scores, scores[rows]])
+            if best_rows.size > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        order = np.argsort(-best_scores, kind='stable')
+        with self._lock:
+            docs = [self._docs[row] for row in best_rows[order]]
+        results = [{**doc, 'score': round(float(score), 4)} for doc, score in zip(docs, best_scores[order])]
+        return {'candidates': snapshot['meta']['rows'], 'results': results}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return row and nonzero counts of the committed index."""
+        meta = self._read_meta() or {'rows': 0, 'nnz': 0}
+        return {'candidates': meta['rows'], 'nnz': meta['nnz'], 'n_features': self.n_features}
+
+
+_index: Optional[CandidateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Return the process-wide candidate index."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CandidateIndex()
+        return _index
+
+
+def index_resume(data: Dict[str, Any], filename: Optional[str] = None) -> None:
+    """
+    Add a parsed resume to the candidate index. Indexing is best effort: a
+    failure is logged and never fails the upload that triggered it.
+    """
+    if not CANDIDATE_INDEX_ENABLED:
+        return
+    try:
+        get_candidate_index().add([(data.get('text', ''), {'filename': filename})])
+    except Exception as e:
+        logger.error("Error indexing resume", extra=exception_fields(e))
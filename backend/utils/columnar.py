@@ -0,0 +1,211 @@
+"""
+Columnar Dataset Loader
+
+Reads fairness audit datasets from CSV, Parquet, Arrow IPC (Feather) and
+NumPy .npy/.npz files straight into typed column arrays, as an alternative
+to JSON lists for /evaluate_bias and evaluate_fairness. Only the needed
+columns are read, predictions and labels are loaded as float arrays and
+protected attributes are dictionary-encoded on load (integer codes plus a
+list of categories), so memory stays close to the raw column size.
+
+Column roles: the prediction column defaults to 'prediction' (or
+'predictions'), the label column to 'label' (or 'labels', optional) and
+every other column is treated as a protected attribute unless an explicit
+list is given.
+"""
+import os
+import logging
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from model.fairness import Categorical, encode_groups
+from utils.log_config import exception_fields
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_COLUMNS = ('prediction', 'predictions')
+LABEL_COLUMNS = ('label', 'labels')
+
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.npy': 'npy',
+    '.npz': 'npz'
+}
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+def dataset_format(filename: str) -> str:
+    """
+    Return the dataset format for a file name.
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    fmt = FORMATS.get(os.path.splitext(filename or '')[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported dataset file '{filename}'; expected one of {', '.join(sorted(FORMATS))}")
+    return fmt
+
+
+def column_roles(names: Sequence[str], prediction_column: Optional[str] = None,
+                 label_column: Optional[str] = None,
+                 attributes: Optional[Sequence[str]] = None) -> Tuple[str, Optional[str], List[str]]:
+    """
+    Decide which columns hold predictions, labels and protected attributes.
+    Returns:
+        (prediction column, label column or None, attribute columns).
+    Raises:
+        ValueError: If a requested column is missing or no attribute is left.
+    """
+    prediction = prediction_column or next((name for name in PREDICTION_COLUMNS if name in names), None)
+    if prediction not in names:
+        raise ValueError(f"Prediction column '{prediction_column or PREDICTION_COLUMNS[0]}' not found")
+    label = label_column or next((name for name in LABEL_COLUMNS if name in names), None)
+    if label is not None and label not in names:
+        raise ValueError(f"Label column '{label}' not found")
+    if attributes is None:
+        attributes = [name for name in names if name not in (prediction, label)]
+    missing = [name for name in attributes if name not in names]
+    if missing:
+        raise ValueError(f"Attribute columns not found: {', '.join(missing)}")
+    if not attributes:
+        raise ValueError("No protected attribute columns")
+    return prediction, label, list(attributes)
+
+
+def _numeric(column: Any, name: str) -> np.ndarray:
+    values = np.asarray(column, dtype=float)
+    if np.isnan(values).any():
+        raise ValueError(f"Column '{name}' has missing values")
+    return values
+
+
+def _read_csv(source: Source, roles: Dict[str, Any]) -> Dict[str, Any]:
+    import pandas as pd
+    names = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    prediction, label, attributes = column_roles(names, **roles)
+    dtype = {prediction: 'float64', **{name: 'category' for name in attributes}}
+    if label:
+        dtype[label] = 'float64'
+    frame = pd.read_csv(source, usecols=[prediction] + ([label] if label else []) + attributes, dtype=dtype)
+    columns = {name: Categorical(list(frame[name].cat.categories), frame[name].cat.codes.to_numpy())
+               for name in attributes}
+    return _assemble(frame[prediction].to_numpy(), frame[label].to_numpy() if label else None,
+                     prediction, label, columns)
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ValueError("Parquet and Arrow datasets require the pyarrow package") from e
+    return pyarrow
+
+
+def _arrow_categorical(column: Any) -> Categorical:
+    pa = _import_pyarrow()
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    codes = array.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    return Categorical(array.dictionary.to_pylist(), codes)
+
+
+def _read_arrow_table(table: Any, roles: Dict[str, Any]) -> Dict[str, Any]:
+    prediction, label, attributes = column_roles(table.column_names, **roles)
+    columns = {name: _arrow_categorical(table.column(name)) for name in attributes}
+    labels = table.column(label).to_numpy() if label else None
+    return _assemble(table.column(prediction).to_numpy(), labels, prediction, label, columns)
+
+
+def _read_parquet(source: Source, roles: Dict[str, Any]) -> Dict[str, Any]:
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(source)
+    prediction, label, attributes = column_roles(parquet.schema_arrow.names, **roles)
+    table = parquet.read(columns=[prediction] + ([label] if label else []) + attributes)
+    return _read_arrow_table(table, {'prediction_column': prediction, 'label_column': label, 'attributes': attributes})
+
+
+def _read_arrow(source: Source, roles: Dict[str, Any]) -> Dict[str, Any]:
+    pa = _import_pyarrow()
+    import pyarrow.ipc as ipc
+    if isinstance(source, (str, os.PathLike)):
+        source = pa.memory_map(os.fspath(source))
+    try:
+        table = ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        table = ipc.open_stream(source).read_all()
+    return _read_arrow_table(table, roles)
+
+
+def _read_numpy(source: Source, fmt: str, roles: Dict[str, Any]) -> Dict[str, Any]:
+    # Object arrays would need pickle, which is never loaded from uploads
+    mmap_mode = 'r' if isinstance(source, (str, os.PathLike)) and fmt == 'npy' else None
+    data = np.load(source, mmap_mode=mmap_mode, allow_pickle=False)
+    if fmt == 'npz':
+        with data:
+            return _read_numpy_columns(data, list(data.files), roles)
+    if not data.dtype.names:
+        raise ValueError(".npy datasets must be structured arrays with one field per column")
+    return _read_numpy_columns(data, list(data.dtype.names), roles)
+
+
+def _read_numpy_columns(data: Any, names: List[str], roles: Dict[str, Any]) -> Dict[str, Any]:
+    prediction, label, attributes = column_roles(names, **roles)
+    columns = {name: Categorical(*encode_groups(data[name])) for name in attributes}
+    return _assemble(data[prediction], data[label] if label else None, prediction, label, columns)
+
+
+def _assemble(predictions: Any, labels: Any, prediction: str, label: Optional[str],
+              attributes: Dict[str, Any]) -> Dict[str, Any]:
+    dataset = {
+        'predictions': _numeric(predictions, prediction),
+        'protected_attributes': attributes
+    }
+    if label:
+        dataset['labels'] = _numeric(labels, label)
+    return dataset
+
+
+def load_dataset(source: Source, filename: Optional[str] = None, prediction_column: Optional[str] = None,
+                 label_column: Optional[str] = None, attributes: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Load a fairness dataset from a columnar file.
+    Args:
+        source: Path or binary file object (e.g. an upload stream).
+        filename: Name used to detect the format (defaults to the path).
+        prediction_column: Column with prediction scores or decisions.
+        label_column: Column with true outcomes (optional).
+        attributes: Protected attribute columns (default: all other columns).
+    Returns:
+        Dataset dictionary accepted by evaluate_fairness, with array columns.
+    Raises:
+        ValueError: If the file cannot be read as a dataset.
+    """
+    if filename is None:
+        filename = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    fmt = dataset_format(str(filename))
+    roles = {'prediction_column': prediction_column, 'label_column': label_column, 'attributes': attributes}
+    try:
+        if fmt == 'csv':
+            return _read_csv(source, roles)
+        if fmt == 'parquet':
+            return _read_parquet(source, roles)
+        if fmt == 'arrow':
+            return _read_arrow(source, roles)
+        return _read_numpy(source, fmt, roles)
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error("Error reading %s dataset", fmt, extra=exception_fields(e))
+        raise ValueError(f"Could not read {fmt} dataset: {str(e)}") from e
@@ -0,0 +1,396 @@
+"""
+Resume Job Queue
+
+Submit/poll processing for resumes. Uploads are spooled to disk and recorded in
+a SQLite job store; background workers claim queued jobs, run parse_resume and
+predict_candidate, and persist status, per-stage timings and results, so jobs
+survive restarts and slow PDFs never hold an HTTP worker.
+
+Workers run as threads inside each web process (JOB_WORKERS, default 2) or as
+dedicated processes started with ``flask jobs-worker``, which lets compute
+capacity be sized independently of web workers (set JOB_WORKERS=0 on the web
+tier in that case).
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import click
+
+from utils.log_config import exception_fields
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SQLite database holding job state
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(BACKEND_DIR, "data", "jobs.db"))
+# Directory where uploaded PDFs wait until a worker picks them up
+JOBS_SPOOL_DIR = os.getenv("JOBS_SPOOL_DIR", os.path.join(BACKEND_DIR, "data", "job_spool"))
+# Worker threads started inside each web process
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Seconds after which a running job whose worker vanished is requeued
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+# Seconds an idle worker waits before polling the store again
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+# Attempts after which a job whose worker keeps dying is failed instead of requeued
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Seconds between sweeps for stale and expired jobs
+JOB_SWEEP_SECONDS = float(os.getenv("JOB_SWEEP_SECONDS", "60"))
+# Seconds finished jobs and their results are kept
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    filename TEXT,
+    payload_path TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    timings TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class JobStore:
+    """
+    SQLite-backed job table. A new connection is opened per operation so the
+    store can be shared by request threads, worker threads and forked
+    processes without any connection handoff.
+    """
+    def __init__(self, db_path: str = JOBS_DB_PATH, spool_dir: str = JOBS_SPOOL_DIR) -> None:
+        self.db_path = db_path
+        self.spool_dir = spool_dir
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        os.makedirs(spool_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create(self, filename: str, content: Union[bytes, BinaryIO]) -> str:
+        """
+        Spool an upload and queue a job for it.
+        Args:
+            filename: Original file name.
+            content: Raw PDF bytes, or the upload stream to copy in chunks.
+        Returns:
+            The new job id.
+        """
+        job_id = uuid.uuid4().hex
+        payload_path = os.path.join(self.spool_dir, f"{job_id}.pdf")
+        with open(payload_path, 'wb') as f:
+            if isinstance(content, bytes):
+                f.write(content)
+            else:
+                shutil.copyfileobj(content, f)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, stage, filename, payload_path, created_at) "
+                "VALUES (?, 'queued', 'queued', ?, ?, ?)",
+                (job_id, filename, payload_path, time.time())
+            )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest queued job to running.
+        Returns:
+            The claimed job, or None if the queue is empty.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', stage = 'starting', started_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (now, row['id'])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job.update(status='running', stage='starting', started_at=now, attempts=row['attempts'] + 1)
+        return job
+
+    def set_stage(self, job_id: str, stage: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET stage = ? WHERE id = ?", (stage, job_id))
+
+    def finish(self, job_id: str, timings: Dict[str, float], result: Optional[Dict[str, Any]] = None,
+               error: Optional[str] = None) -> None:
+        """Record the outcome of a job and drop its spooled payload."""
+        status = 'failed' if error is not None else 'succeeded'
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, finished_at = ?, timings = ?, result = ?, "
+                "error = ?, payload_path = NULL WHERE id = ?",
+                (status, status, time.time(), json.dumps(timings),
+                 json.dumps(result) if result is not None else None, error, job_id)
+            )
+        if row and row['payload_path'] and os.path.exists(row['payload_path']):
+            os.remove(row['payload_path'])
+
+    def requeue_stale(self, lease_seconds: int = JOB_LEASE_SECONDS,
+                      max_attempts: int = JOB_MAX_ATTEMPTS) -> Tuple[int, int]:
+        """
+        Requeue running jobs whose worker has not finished within the lease.
+        Jobs that have already used max_attempts are failed instead, so a
+        resume that kills its worker is not retried forever.
+        Returns:
+            (requeued, failed) job counts.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                exhausted = conn.execute(
+                    "SELECT id, payload_path FROM jobs WHERE status = 'running' AND started_at < ? "
+                    "AND attempts >= ?",
+                    (now - lease_seconds, max_attempts)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE jobs SET status = 'failed', stage = 'failed', finished_at = ?, error = ?, "
+                    "payload_path = NULL WHERE id = ?",
+                    [(now, f"Job did not finish in {max_attempts} attempts", row['id']) for row in exhausted]
+                )
+                requeued = conn.execute(
+                    "UPDATE jobs SET status = 'queued', stage = 'queued' "
+                    "WHERE status = 'running' AND started_at < ?",
+                    (now - lease_seconds,)
+                ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for row in exhausted:
+            if row['payload_path'] and os.path.exists(row['payload_path']):
+                os.remove(row['payload_path'])
+        return requeued, len(exhausted)
+
+    def purge_finished(self, retention_seconds: int = JOB_RETENTION_SECONDS) -> int:
+        """Delete finished jobs (and their results) older than the retention period."""
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                (time.time() - retention_seconds,)
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the public view of a job.
+        Args:
+            job_id: Job id returned by create().
+        Returns:
+            Job status dictionary, or None if the id is unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {
+            'job_id': row['id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'filename': row['filename'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'attempts': row['attempts'],
+            'timings': json.loads(row['timings']) if row['timings'] else {}
+        }
+        if row['status'] == 'queued':
+            with self._connect() as conn:
+                job['queue_position'] = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?",
+                    (row['created_at'],)
+                ).fetchone()[0]
+        if row['result'] is not None:
+            job['result'] = json.loads(row['result'])
+        if row['error'] is not None:
+            job['error'] = row['error']
+        return job
+
+
+def run_job(store: JobStore, job: Dict[str, Any]) -> None:
+    """
+    Parse and score the resume of a claimed job, recording timings per stage.
+    """
+    from utils.resume_parser import parse_resume
+    from model.predict import predict_candidate
+    from utils.candidate_index import index_resume
+    timings: Dict[str, float] = {}
+    job_id = job['id']
+    try:
+        store.set_stage(job_id, 'parsing')
+        start = time.perf_counter()
+        # The spooled file is memory-mapped by the parser rather than read in
+        with open(job['payload_path'], 'rb') as f:
+            data = parse_resume(f)
+        timings['parse_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        index_resume(data, job.get('filename'))
+        store.set_stage(job_id, 'predicting')
+        start = time.perf_counter()
+        prediction = predict_candidate(data)
+        timings['predict_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        store.finish(job_id, timings, result=prediction)
+    except Exception as e:
+        logger.error("Job %s failed", job_id, extra=exception_fields(e))
+        store.finish(job_id, timings, error=f"Error processing resume: {str(e)}")
+
+
+class JobRunner:
+    """
+    Pool of worker threads that drain the job store. Threads do not survive a
+    fork, so the runner remembers the pid that started them and starts a fresh
+    pool when used from a forked child (e.g. a gunicorn worker after --preload).
+    Every JOB_SWEEP_SECONDS one of the threads also requeues jobs whose worker
+    died and deletes finished jobs past their retention.
+    """
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS) -> None:
+        self.store = store
+        self.workers = workers
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def start(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid() or self.workers <= 0:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._next_sweep = 0.0
+            self._threads = [
+                threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            logger.info("Started %d job workers in pid %d", self.workers, self._pid)
+
+    def notify(self) -> None:
+        """Wake idle workers after a job has been queued."""
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def sweep(self) -> None:
+        """Requeue or fail stale jobs and purge expired ones, at most once per JOB_SWEEP_SECONDS."""
+        if time.monotonic() < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = time.monotonic() + JOB_SWEEP_SECONDS
+            requeued, failed = self.store.requeue_stale()
+            purged = self.store.purge_finished()
+            if requeued or failed or purged:
+                logger.info("Swept job store", extra={'requeued': requeued, 'failed': failed, 'purged': purged})
+        except sqlite3.Error as e:
+            logger.error("Error sweeping job store: %s", e)
+        finally:
+            self._sweep_lock.release()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.sweep()
+            try:
+                job = self.store.claim()
+            except sqlite3.Error as e:
+                logger.error("Error claiming job: %s", e)
+                job = None
+            if job is None:
+                self._wakeup.wait(JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            try:
+                run_job(self.store, job)
+            except Exception as e:
+                # e.g. the store failed while recording the outcome; the
+                # job is requeued by a later sweep once its lease expires
+                logger.error("Error running job %s: %s", job['id'], type(e).__name__)
+
+
+_store: Optional[JobStore] = None
+_runner: Optional[JobRunner] = None
+_init_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Return the process-wide job store, creating the database on first use."""
+    global _store
+    with _init_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
+
+
+def get_job_runner() -> JobRunner:
+    """Return the in-process worker pool (started lazily per process)."""
+    global _runner
+    store = get_job_store()
+    with _init_lock:
+        if _runner is None:
+            _runner = JobRunner(store)
+    _runner.start()
+    return _runner
+
+
+def start_job_workers() -> None:
+    """Make sure this process's worker threads are running (cheap when they are)."""
+    get_job_runner()
+
+
+@click.command('jobs-worker')
+@click.option('--threads', default=1, show_default=True, help='Worker threads in this process.')
+def jobs_worker_command(threads: int) -> None:
+    """Run dedicated resume job workers until interrupted."""
+    runner = JobRunner(get_job_store(), workers=threads)
+    runner.start()
+    click.echo(f"Processing jobs from {JOBS_DB_PATH} with {threads} threads")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        runner.stop(timeout=30)
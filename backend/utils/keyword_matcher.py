@@ -0,0 +1,144 @@
+"""
+Keyword Matcher
+
+Compiled multi-pattern matcher for the keyword vocabularies used across resume
+analysis (skills, section headers, bias terms, culture keywords, ...). All
+keywords are folded into a single trie-shaped regular expression, so one pass
+over the text finds every hit, with its vocabulary, category and position,
+instead of testing each keyword against the text separately.
+
+Matches are word-boundary aware: a keyword must start at a word boundary, and
+'word' vocabularies must also end at one ('he' does not match 'the', the skill
+'c' does not match 'react'). 'prefix' vocabularies hold stems that may be
+followed by more letters ('develop' matches 'developed').
+"""
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+WORD = 'word'
+PREFIX = 'prefix'
+
+
+class KeywordHit(NamedTuple):
+    vocabulary: str
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie; longer keywords are tried first."""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and not terminal:
+            return alternatives[0]
+        group = '(?:' + '|'.join(alternatives) + ')'
+        return group + '?' if terminal else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Matcher compiled from a set of named vocabularies.
+    Args:
+        vocabularies: vocabulary name -> {category: [keywords]}.
+        modes: vocabulary name -> WORD or PREFIX (defaults to WORD).
+    """
+    def __init__(self, vocabularies: Dict[str, Dict[str, Sequence[str]]],
+                 modes: Optional[Dict[str, str]] = None) -> None:
+        modes = modes or {}
+        # keyword -> [(vocabulary, category, mode)]
+        self._entries: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        for vocabulary, categories in vocabularies.items():
+            mode = modes.get(vocabulary, WORD)
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    entry = (vocabulary, category, mode)
+                    if entry not in self._entries[keyword.lower()]:
+                        self._entries[keyword.lower()].append(entry)
+        keywords = list(self._entries)
+        # For each keyword, the keywords that are prefixes of it (itself included,
+        # longest first), i.e. every keyword that can also start at the same place
+        # (checked prefix by prefix, so building stays fast for large vocabularies)
+        known = set(keywords)
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [keyword[:end] for end in range(len(keyword), 0, -1) if keyword[:end] in known]
+            for keyword in keywords
+        }
+        body = _trie_regex(keywords) if keywords else '(?!)'
+        # Zero-width lookahead so matches starting inside a previous match are still found
+        self._pattern = re.compile(r'(?<![^\W_])(?=(' + body + '))')
+
+    def scan(self, text: str, vocabularies: Optional[Iterable[str]] = None,
+             lowered: bool = False) -> List[KeywordHit]:
+        """
+        Find every keyword occurrence in one pass.
+        Args:
+            text: Text to scan.
+            vocabularies: Restrict hits to these vocabularies (default: all).
+            lowered: Set when text is already lower-case.
+        Returns:
+            Hits ordered by start position. Offsets index the lower-cased
+            text, which can be longer than text (e.g. 'İ').
+        """
+        if not text:
+            return []
+        if not lowered:
+            text = text.lower()
+        wanted = set(vocabularies) if vocabularies is not None else None
+        hits = []
+        length = len(text)
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                end = start + len(keyword)
+                at_boundary = end >= length or not _is_word_char(text[end])
+                for vocabulary, category, mode in self._entries[keyword]:
+                    if wanted is not None and vocabulary not in wanted:
+                        continue
+                    if mode == WORD and not at_boundary:
+                        continue
+                    hits.append(KeywordHit(vocabulary, category, keyword, start, end))
+        return hits
+
+
+def keywords_found(hits: Iterable[KeywordHit], vocabulary: str, category: Optional[str] = None) -> List[str]:
+    """Distinct keywords hit in a vocabulary (and optional category), in first-seen order."""
+    seen: Dict[str, None] = {}
+    for hit in hits:
+        if hit.vocabulary == vocabulary and (category is None or hit.category == category):
+            seen.setdefault(hit.keyword, None)
+    return list(seen)
+
+
+def group_by_span(hits: Iterable[KeywordHit], starts: Sequence[int]) -> Dict[int, List[KeywordHit]]:
+    """
+    Assign hits to consecutive spans (lines, sentences) by start offset.
+    Args:
+        hits: Hits from scan().
+        starts: Sorted start offsets of the spans.
+    Returns:
+        span index -> hits starting inside that span.
+    """
+    grouped: Dict[int, List[KeywordHit]] = defaultdict(list)
+    for hit in hits:
+        grouped[bisect_right(starts, hit.start) - 1].append(hit)
+    return grouped
@@ -0,0 +1,241 @@
+"""
+LLM Client
+
+Pooled, time-bounded HTTP client for the Groq chat completions API. Requests
+share a keep-alive connection pool, are bounded by connect/read timeouts and
+an in-flight cap, retry transient failures with jittered backoff drawn from a
+retry budget within an overall deadline, and are short-circuited by a circuit
+breaker while the upstream is failing so callers can fall back immediately.
+"""
+import os
+import json
+import time
+import random
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "mixtral-8x7b-32768")
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "3"))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "30"))
+# Overall time allowed for one call, retries and backoff included
+GROQ_DEADLINE = float(os.getenv("GROQ_DEADLINE", "40"))
+# Concurrent requests allowed per process; callers beyond this fall back
+GROQ_MAX_INFLIGHT = int(os.getenv("GROQ_MAX_INFLIGHT", "8"))
+# Retries per call (on top of the first attempt), subject to the retry budget
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+# Consecutive failures that open the circuit, and how long it stays open
+GROQ_BREAKER_THRESHOLD = int(os.getenv("GROQ_BREAKER_THRESHOLD", "5"))
+GROQ_BREAKER_COOLDOWN = float(os.getenv("GROQ_BREAKER_COOLDOWN", "30"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when a call is refused without contacting the upstream."""
+
+
+class LLMRequestError(Exception):
+    """Raised when the upstream call failed after all permitted attempts."""
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of overall traffic, so a
+    struggling upstream is not hit with a multiplied retry storm. Every call
+    deposits ``ratio`` tokens and every retry withdraws one.
+    """
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 3.0, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Once open, calls are rejected until
+    the cooldown elapses; then a single probe is let through (half-open) and
+    its outcome closes or re-opens the circuit.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold: int = GROQ_BREAKER_THRESHOLD, cooldown: float = GROQ_BREAKER_COOLDOWN) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.threshold:
+                if self.state != self.OPEN:
+                    logger.warning("LLM circuit breaker opened")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LLMClient:
+    """
+    Client for an OpenAI-compatible chat completions endpoint.
+    Args:
+        api_url: Endpoint URL (point it at a local stub server in tests).
+        api_key: Bearer token.
+        deadline: Seconds one chat() call may take across all its attempts.
+    """
+    def __init__(self, api_url: str = GROQ_API_URL, api_key: Optional[str] = None,
+                 connect_timeout: float = GROQ_CONNECT_TIMEOUT, read_timeout: float = GROQ_READ_TIMEOUT,
+                 deadline: float = GROQ_DEADLINE,
+                 max_inflight: int = GROQ_MAX_INFLIGHT, max_retries: int = GROQ_MAX_RETRIES,
+                 breaker: Optional[CircuitBreaker] = None, retry_budget: Optional[RetryBudget] = None,
+                 backoff_base: float = 0.25, backoff_cap: float = 4.0) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.api_url = api_url
+        self.api_key = api_key
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._inflight = threading.BoundedSemaphore(max_inflight)
+        self._requests = requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_inflight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, payload: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMRequestError("LLM call deadline exceeded")
+        timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        response = self.session.post(self.api_url, headers=headers, json=payload, timeout=timeout)
+        if response.status_code in RETRYABLE_STATUS:
+            raise LLMRequestError(f"Upstream returned HTTP {response.status_code}")
+        response.raise_for_status()
+        return response.json()
+
+    def chat(self, messages: List[Dict[str, str]], model: str = GROQ_MODEL,
+             temperature: float = 0.1, max_tokens: int = 4000) -> str:
+        """
+        Send a chat completion request and return the first message content.
+        Args:
+            messages: Chat messages in OpenAI format.
+        Returns:
+            Content of the first choice.
+        Raises:
+            LLMUnavailableError: If the breaker is open or too many calls are in flight.
+            LLMRequestError: If every permitted attempt failed or the deadline passed.
+        """
+        if not self._inflight.acquire(blocking=False):
+            raise LLMUnavailableError("Too many LLM requests in flight")
+        try:
+            if not self.breaker.allow():
+                raise LLMUnavailableError("LLM circuit breaker is open")
+            self.retry_budget.deposit()
+            payload = {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
+            deadline = time.monotonic() + self.deadline
+            attempt = 0
+            while True:
+                try:
+                    result = self._post(payload, deadline)
+                    content = result['choices'][0]['message']['content']
+                    self.breaker.record_success()
+                    return content
+                except (LLMRequestError, self._requests.ConnectionError, self._requests.Timeout) as e:
+                    self.breaker.record_failure()
+                    delay = self._backoff(attempt)
+                    retry = (attempt < self.max_retries and time.monotonic() + delay < deadline
+                             and self.breaker.allow() and self.retry_budget.withdraw())
+                    if not retry:
+                        raise LLMRequestError(f"LLM request failed after {attempt + 1} attempts: {str(e)}") from e
+                    logger.warning("LLM request failed (%s), retrying in %.2fs", e, delay)
+                    time.sleep(delay)
+                    attempt += 1
+                except (self._requests.RequestException, KeyError, IndexError, TypeError, ValueError) as e:
+                    # Non-transient (4xx, malformed body): do not retry
+                    self.breaker.record_failure()
+                    raise LLMRequestError(f"LLM request failed: {str(e)}") from e
+                except BaseException:
+                    # Anything else still settles the breaker, or a failed
+                    # half-open probe would leave it closed to every caller
+                    self.breaker.record_failure()
+                    raise
+        finally:
+            self._inflight.release()
+
+    def chat_json(self, messages: List[Dict[str, str]], **kwargs: Any) -> Dict[str, Any]:
+        """Like chat(), but parse the returned content as JSON."""
+        content = self.chat(messages, **kwargs)
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise LLMRequestError(f"LLM returned invalid JSON: {str(e)}") from e
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client(api_key: Optional[str] = None) -> LLMClient:
+    """Return the process-wide LLM client, creating its connection pool on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient(api_key=api_key)
+        return _client
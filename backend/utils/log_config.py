@@ -0,0 +1,205 @@
+"""
+Logging Configuration
+
+Process-wide logging set up once from the environment by configure_logging().
+Records are written as one JSON object per line carrying the message plus
+the structured fields passed in ``extra`` (sizes, durations, ids), never
+resume contents, file names or other candidate data. Callers use %-style
+arguments so messages are only formatted for records that pass the level
+and sampling checks. Failures while handling resumes or datasets are logged
+with exception_fields(), which keeps the exception type and stack but not the
+message, since messages can quote the data being processed.
+
+Loggers hand records to a bounded in-memory queue; a background listener
+thread serializes and writes them, so request threads never block on
+stderr and JSON encoding stays out of their CPU time. When the queue is full
+records are dropped and counted rather than waiting.
+"""
+import os
+import sys
+import copy
+import json
+import queue
+import random
+import logging
+import threading
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Root level: DEBUG, INFO, WARNING, ERROR
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 'json' (one object per line) or 'text' (human-readable, for development)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Share of DEBUG records kept (1 = all of them)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1"))
+# Records buffered for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+# Third-party loggers that are per-page or per-connection chatty at DEBUG/INFO
+QUIET_LOGGERS = ('pdfminer', 'urllib3')
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_handler: Optional["NonBlockingQueueHandler"] = None
+_listener: Optional[QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def current_request_id() -> Optional[str]:
+    """
+    The id of the request being served: the client's X-Request-ID (letters,
+    digits, '-' and '_' only) or a generated one; None outside a request.
+    """
+    try:
+        from flask import g, has_request_context, request
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    request_id = g.get('request_id')
+    if request_id is None:
+        import uuid
+        supplied = request.headers.get(REQUEST_ID_HEADER, '')
+        request_id = ''.join(c for c in supplied if c.isalnum() or c in '-_')[:64] or uuid.uuid4().hex
+        g.request_id = request_id
+    return request_id
+
+
+def structured_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """The fields a record was given through ``extra``."""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+def exception_fields(error: BaseException) -> Dict[str, Any]:
+    """
+    ``extra`` fields describing a failure without its message, which may
+    quote candidate or dataset content (e.g. "invalid literal for int()
+    with base 10: 'Jane Doe'").
+    """
+    return {'error_type': type(error).__name__, 'stack': ''.join(traceback.format_tb(error.__traceback__))}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and the extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f".{int(record.msecs):03d}",
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            **structured_fields(record)
+        }
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Plain lines with the extra fields appended as key=value."""
+
+    def __init__(self) -> None:
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = structured_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every record above DEBUG and a LOG_SAMPLE_RATE share of DEBUG ones."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records when the queue is full and leaves
+    formatting to the listener: only the message arguments and any
+    traceback are resolved in the calling thread.
+    """
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        request_id = current_request_id()
+        if request_id is not None and not hasattr(record, 'request_id'):
+            record.request_id = request_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            from utils.metrics import LOG_RECORDS_DROPPED
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _start_listener(handler: NonBlockingQueueHandler) -> QueueListener:
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(TextFormatter() if LOG_FORMAT == 'text' else JSONFormatter())
+    listener = QueueListener(handler.queue, stream, respect_handler_level=False)
+    listener.start()
+    return listener
+
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive fork (e.g. gunicorn --preload);
+    # give the child its own queue and writer thread
+    global _listener
+    if _handler is not None:
+        _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        _listener = _start_listener(_handler)
+
+
+def configure_logging() -> None:
+    """
+    Route all logging through the queue handler at LOG_LEVEL. Safe to call
+    more than once; only the first call in a process configures anything.
+    """
+    global _handler, _listener
+    with _configure_lock:
+        if _handler is not None:
+            return
+        handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        _handler = handler
+        _listener = _start_listener(handler)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+        import atexit
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,416 @@
+"""
+Metrics
+
+Stage timings and counters for the resume pipeline, exposed in the Prometheus
+text format by GET /metrics. Each stage (PDF extraction, the Groq call, the
+regex fallback, every analyzer of predict_candidate) is timed into a
+histogram, and the same timings are reported per request in a Server-Timing
+header so the frontend can show where an upload's time went.
+
+Values live in memory per process. When METRICS_DIR is set, every process
+(gunicorn workers, batch and job workers) writes its values to its own file
+in that directory about once a second, and /metrics sums all of the files,
+so a scrape sees the whole server rather than the worker that answered it.
+Point METRICS_DIR at a directory on local disk, used by one host (or
+container) only, that is emptied when the server is (re)deployed. On each
+scrape the files of processes that have exited (recycled gunicorn workers,
+pool workers) are folded into one cumulative file, so counters never go
+back and a scrape reads one file per live process plus one. Where fcntl is
+not available (Windows) files are never folded, and a scrape's cost grows
+with every process that has ever run.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import atexit
+import threading
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by all processes for multi-worker aggregation ('' = this process only)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# Seconds between writes of a process's values to METRICS_DIR
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1"))
+
+# Upper bounds in seconds; Groq calls may take up to the read timeout
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Values of exited processes, and the per-process files they came from
+CUMULATIVE_FILE = 'metrics_cumulative.json'
+LOCK_FILE = '.metrics.lock'
+_PROCESS_FILE_RE = re.compile(r'^metrics_(\d+)_[0-9a-f]+\.json$')
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values."""
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, Any] = {}
+        REGISTRY.register(self)
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(label) for label in labels)
+
+    def reset(self) -> None:
+        self._values = {}
+
+
+class Counter(Metric):
+    """Monotonic count, e.g. resume_cache_lookups_total{result="miss"}."""
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with REGISTRY.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            REGISTRY.dirty = True
+
+    @staticmethod
+    def merge(values: Dict[LabelValues, Any], key: LabelValues, value: Any) -> None:
+        values[key] = values.get(key, 0.0) + value
+
+    def samples(self, values: Dict[LabelValues, Any]) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for key, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values, stored as per-bucket counts plus their sum."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        # One slot per bucket plus +Inf, then the sum
+        slot = bisect_left(self.buckets, value)
+        with REGISTRY.lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[slot] += 1
+            counts[-1] += value
+            REGISTRY.dirty = True
+
+    @staticmethod
+    def merge(values: Dict[LabelValues, Any], key: LabelValues, value: Any) -> None:
+        counts = values.get(key)
+        # Files written with other buckets (e.g. before a redeploy) are replaced
+        if counts is None or len(counts) != len(value):
+            values[key] = list(value)
+        else:
+            values[key] = [a + b for a, b in zip(counts, value)]
+
+    def samples(self, values: Dict[LabelValues, Any]) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for key, counts in sorted(values.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, 'le': bound}, cumulative
+            yield f"{self.name}_sum", labels, counts[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    """The metrics of this process, and their files in METRICS_DIR."""
+    def __init__(self, directory: str = METRICS_DIR) -> None:
+        self.directory = directory
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self._path: Optional[str] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_lock = threading.Lock()
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+    def _after_fork(self) -> None:
+        # A forked child starts from zero with its own file; the parent's
+        # values are already counted in the parent's file
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        for metric in self.metrics.values():
+            metric.reset()
+        self.dirty = False
+        self._path = None
+        self._flusher = None
+
+    def _snapshot(self) -> Dict[str, List[Any]]:
+        with self.lock:
+            self.dirty = False
+            return {name: [[list(key), value if isinstance(value, float) else list(value)]
+                           for key, value in metric._values.items()]
+                    for name, metric in self.metrics.items() if metric._values}
+
+    def flush(self) -> None:
+        """Write this process's values to its file in METRICS_DIR."""
+        if not self.directory:
+            return
+        with self._flush_lock:
+            if self._path is None:
+                self._path = os.path.join(self.directory, f"metrics_{os.getpid()}_{uuid.uuid4().hex[:8]}.json")
+            temp_path = f"{self._path}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(temp_path, 'w') as f:
+                    json.dump(self._snapshot(), f)
+                os.replace(temp_path, self._path)
+            except OSError as e:
+                logger.error("Error writing metrics to %s: %s", self._path, e)
+
+    def start_flusher(self) -> None:
+        """Start the thread that writes this process's values while they change."""
+        if not self.directory or self._flusher is not None:
+            return
+        with self.lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(METRICS_FLUSH_INTERVAL)
+            if self.dirty:
+                self.flush()
+
+    def _merge_file(self, merged: Dict[str, Dict[LabelValues, Any]], values: Dict[str, List[Any]]) -> None:
+        for name, entries in values.items():
+            if name in merged:
+                for key, value in entries:
+                    self.metrics[name].merge(merged[name], tuple(key), value)
+
+    def _read(self, filename: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, filename)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error("Error reading metrics file %s: %s", filename, e)
+            return None
+
+    @contextmanager
+    def _directory_lock(self, exclusive: bool) -> Iterator[None]:
+        # Compaction takes it exclusively; scrapes share it so they never see
+        # a file both deleted and missing from the cumulative file
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def compact(self) -> None:
+        """
+        Fold the files of exited processes into the cumulative file and delete
+        them. Runs under an exclusive lock on METRICS_DIR, and the cumulative
+        file records the files it already holds, so no file is counted twice
+        even if a deletion fails.
+        """
+        if not self.directory or fcntl is None:
+            return
+        dead = [filename for filename in os.listdir(self.directory)
+                if (match := _PROCESS_FILE_RE.match(filename)) and not _pid_alive(int(match.group(1)))]
+        if not dead:
+            return
+        try:
+            with self._directory_lock(exclusive=True):
+                cumulative = self._read(CUMULATIVE_FILE) or {'values': {}, 'merged': []}
+                merged: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in self.metrics}
+                self._merge_file(merged, cumulative['values'])
+                folded = set(cumulative['merged'])
+                dead = [filename for filename in dead if os.path.exists(os.path.join(self.directory, filename))]
+                for filename in dead:
+                    if filename not in folded:
+                        self._merge_file(merged, self._read(filename) or {})
+                temp_path = os.path.join(self.directory, f"{CUMULATIVE_FILE}.tmp")
+                with open(temp_path, 'w') as f:
+                    json.dump({
+                        'values': {name: [[list(key), value] for key, value in values.items()]
+                                   for name, values in merged.items() if values},
+                        'merged': dead
+                    }, f)
+                os.replace(temp_path, os.path.join(self.directory, CUMULATIVE_FILE))
+                for filename in dead:
+                    os.remove(os.path.join(self.directory, filename))
+        except OSError as e:
+            logger.error("Error compacting metrics files: %s", e)
+
+    def collect(self) -> Dict[str, Dict[LabelValues, Any]]:
+        """
+        Current values per metric: this process's alone, or with METRICS_DIR
+        the sum over every live process's file and the cumulative file.
+        """
+        if not self.directory:
+            with self.lock:
+                return {name: {key: value if isinstance(value, float) else list(value)
+                               for key, value in metric._values.items()}
+                        for name, metric in self.metrics.items()}
+        self.flush()
+        self.compact()
+        merged: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in self.metrics}
+        try:
+            with self._directory_lock(exclusive=False):
+                cumulative = self._read(CUMULATIVE_FILE) or {'values': {}, 'merged': []}
+                self._merge_file(merged, cumulative['values'])
+                folded = set(cumulative['merged'])
+                for filename in sorted(os.listdir(self.directory)):
+                    if _PROCESS_FILE_RE.match(filename) and filename not in folded:
+                        self._merge_file(merged, self._read(filename) or {})
+        except OSError as e:
+            logger.error("Error reading metrics files: %s", e)
+        return merged
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, labels, value in metric.samples(values):
+                lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # e.g. EPERM: the process exists but belongs to another user
+        return True
+    return True
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = Registry()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=REGISTRY._after_fork)
+atexit.register(lambda: REGISTRY.flush() if REGISTRY.dirty else None)
+
+STAGE_SECONDS = Histogram(
+    'resume_stage_duration_seconds', 'Time spent in each stage of parsing and scoring a resume.', ['stage']
+)
+ANALYSIS_SOURCE = Counter(
+    'resume_analysis_total', 'Resumes structured by the Groq analysis or the regex fallback.', ['source']
+)
+GROQ_FAILURES = Counter(
+    'groq_failures_total', 'Groq calls that fell back to regex parsing, by reason.', ['reason']
+)
+CACHE_LOOKUPS = Counter(
+    'resume_cache_lookups_total', 'Parsed resume cache lookups, by result.', ['result']
+)
+ERRORS = Counter('pipeline_errors_total', 'Resumes that failed to parse or score, by stage.', ['stage'])
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Time to produce an API response (streamed bodies excluded).',
+    ['endpoint', 'method']
+)
+REQUESTS = Counter('http_requests_total', 'API responses, by endpoint and status code.',
+                   ['endpoint', 'method', 'status'])
+LOG_RECORDS_DROPPED = Counter('log_records_dropped_total', 'Log records dropped because the log queue was full.')
+
+# Stage timings (ms) of the request being served, for its Server-Timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_timings', default=None)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add one stage duration to the histogram and the current request's timings."""
+    REGISTRY.start_flusher()
+    STAGE_SECONDS.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds * 1000
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def start_request_timing() -> None:
+    """before_request hook: start collecting stage timings for this request."""
+    from flask import g
+    g.metrics_start = time.perf_counter()
+    g.metrics_token = _request_timings.set({})
+
+
+def add_server_timing(response: Any) -> Any:
+    """
+    after_request hook: set the Server-Timing header from the stages the
+    request ran, and record its duration and status.
+    """
+    from flask import g, request
+    start = g.pop('metrics_start', None)
+    token = g.pop('metrics_token', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    timings = _request_timings.get() or {}
+    if token is not None:
+        _request_timings.reset(token)
+    entries = [f"{stage};dur={ms:.1f}" for stage, ms in timings.items()]
+    entries.append(f"total;dur={elapsed * 1000:.1f}")
+    response.headers['Server-Timing'] = ', '.join(entries)
+    # Lets the frontend, served from another origin, read the header
+    response.headers['Timing-Allow-Origin'] = '*'
+    endpoint = request.endpoint or 'unmatched'
+    REGISTRY.start_flusher()
+    REQUEST_SECONDS.observe(elapsed, endpoint, request.method)
+    REQUESTS.inc(endpoint, request.method, str(response.status_code))
+    return response
+
+
+def render_metrics() -> str:
+    """Prometheus text for every metric (see Registry.collect)."""
+    return REGISTRY.render()
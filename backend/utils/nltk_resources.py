@@ -0,0 +1,161 @@
+"""
+NLTK Resource Manager
+
+Resolves the NLTK corpora and models used by the backend from a local data
+directory and loads each one the first time it is needed. Nothing here touches
+the network at import or request time; resources are staged ahead of time with
+``flask nltk-download`` (or ``python -m utils.nltk_resources``).
+"""
+import os
+import threading
+import logging
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+import click
+
+logger = logging.getLogger(__name__)
+
+# Directory searched before NLTK's default locations
+NLTK_DATA_DIR = os.getenv(
+    "NLTK_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nltk_data")
+)
+
+# Resource name -> path used by nltk.data.find
+RESOURCES = {
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords'
+}
+
+
+class MissingNLTKResourceError(LookupError):
+    """Raised when a required NLTK resource is not present locally."""
+
+
+_lock = threading.Lock()
+_loaded: Dict[str, Any] = {}
+_configured = False
+
+
+def _nltk():
+    """Import nltk and put the configured data directory first on its search path."""
+    global _configured
+    import nltk
+    if not _configured:
+        if NLTK_DATA_DIR and NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        _configured = True
+    return nltk
+
+
+def ensure_resource(name: str) -> str:
+    """
+    Locate a resource on disk without downloading it.
+    Args:
+        name: Resource name, one of RESOURCES.
+    Returns:
+        Path of the resource.
+    Raises:
+        MissingNLTKResourceError: If the resource is not installed locally.
+    """
+    if name not in RESOURCES:
+        raise KeyError(f"Unknown NLTK resource: {name}")
+    nltk = _nltk()
+    try:
+        return str(nltk.data.find(RESOURCES[name]))
+    except LookupError:
+        raise MissingNLTKResourceError(
+            f"NLTK resource '{name}' not found in {NLTK_DATA_DIR} or the default NLTK paths. "
+            f"Stage it with 'flask nltk-download' or 'python -m utils.nltk_resources' "
+            f"(set NLTK_DATA_DIR to change the location)."
+        ) from None
+
+
+def _load_once(name: str, loader: Callable[[], Any]) -> Any:
+    value = _loaded.get(name)
+    if value is not None:
+        return value
+    with _lock:
+        if name not in _loaded:
+            _loaded[name] = loader()
+        return _loaded[name]
+
+
+def get_sentiment_analyzer():
+    """Return the process-wide VADER SentimentIntensityAnalyzer."""
+    def load():
+        ensure_resource('vader_lexicon')
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+    return _load_once('vader_lexicon', load)
+
+
+def get_stopwords(language: str = 'english') -> FrozenSet[str]:
+    """Return the NLTK stopword list for a language as a frozenset."""
+    def load():
+        ensure_resource('stopwords')
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    return _load_once(f'stopwords:{language}', load)
+
+
+def word_tokenize(text: str) -> List[str]:
+    """Tokenize text with the punkt-backed NLTK word tokenizer."""
+    def load():
+        ensure_resource('punkt')
+        from nltk.tokenize import word_tokenize as tokenize
+        return tokenize
+    return _load_once('punkt', load)(text)
+
+
+def missing_resources() -> List[str]:
+    """Return the names of resources that are not installed locally."""
+    missing = []
+    for name in RESOURCES:
+        try:
+            ensure_resource(name)
+        except MissingNLTKResourceError:
+            missing.append(name)
+    return missing
+
+
+def download_resources(target_dir: Optional[str] = None, names: Optional[List[str]] = None) -> List[str]:
+    """
+    Download resources into a local data directory (for image builds).
+    Args:
+        target_dir: Destination directory; defaults to NLTK_DATA_DIR.
+        names: Resources to fetch; defaults to all of RESOURCES.
+    Returns:
+        Names of resources that failed to download.
+    """
+    nltk = _nltk()
+    target_dir = target_dir or NLTK_DATA_DIR
+    os.makedirs(target_dir, exist_ok=True)
+    if target_dir not in nltk.data.path:
+        nltk.data.path.insert(0, target_dir)
+    failed = []
+    for name in names or list(RESOURCES):
+        logger.info("Downloading NLTK resource '%s' to %s", name, target_dir)
+        if not nltk.download(name, download_dir=target_dir, quiet=True, raise_on_error=False):
+            failed.append(name)
+    return failed
+
+
+@click.command('nltk-download')
+@click.option('--dir', 'target_dir', default=None, help='Target directory (defaults to NLTK_DATA_DIR).')
+@click.option('--check', is_flag=True, help='Only verify that all resources are installed.')
+def nltk_download_command(target_dir: Optional[str], check: bool) -> None:
+    """Stage the NLTK resources used by the backend."""
+    if not check:
+        failed = download_resources(target_dir)
+        if failed:
+            raise click.ClickException(f"Failed to download: {', '.join(failed)}")
+    missing = missing_resources()
+    if missing:
+        raise click.ClickException(f"Missing NLTK resources: {', '.join(missing)}")
+    click.echo(f"NLTK resources available: {', '.join(RESOURCES)}")
+
+
+if __name__ == '__main__':
+    nltk_download_command()
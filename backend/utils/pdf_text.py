@@ -0,0 +1,255 @@
+"""
+PDF Text Extraction
+
+Page-bounded, optionally parallel text extraction for resume PDFs. Uploads are
+read in place (uploads spooled to disk are memory-mapped, in-memory uploads
+are used as they are) rather than copied, extraction can be capped at
+PDF_MAX_PAGES pages, and long documents are split into page ranges that are extracted on a
+pool of worker processes. Page text is yielded in document order as soon as
+it is available, starting with the first range, which is extracted in the
+calling process while the pool works on the rest.
+"""
+import io
+import os
+import mmap
+import tempfile
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Pages extracted per document; later pages are ignored (0, the default, disables the cap)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0"))
+# Worker processes for page-range extraction (0 picks min(4, cores); 1 disables the pool)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# Documents shorter than this are extracted in-process; the pool is not worth its overhead
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+# Pages handed to a worker per task
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+# pdfminer's boxes_flow layout parameter; "none" skips the text box ordering pass
+PDF_BOXES_FLOW = os.getenv("PDF_BOXES_FLOW", "0.5")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_parallel_enabled = True
+
+
+class PDFSource:
+    """
+    A PDF opened for extraction without copying its bytes.
+    Attributes:
+        fp: Seekable binary file object for pdfminer (the upload stream or an mmap).
+        buffer: Buffer over the whole document, for hashing.
+        path: File system path of the document, when it has one.
+    """
+    def __init__(self, fp: Any, buffer: Any, path: Optional[str] = None) -> None:
+        self.fp = fp
+        self.buffer = buffer
+        self.path = path
+
+    @property
+    def size(self) -> int:
+        return len(self.buffer)
+
+    def close(self) -> None:
+        """Release the buffer; the underlying upload stream is left open."""
+        if isinstance(self.buffer, memoryview):
+            self.buffer.release()
+        elif isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> "PDFSource":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_pdf_source(file: Union[bytes, BinaryIO, Any]) -> PDFSource:
+    """
+    Open PDF bytes, a binary stream or an uploaded FileStorage for extraction.
+    In-memory streams are read through their buffer and on-disk streams are
+    memory-mapped, so the document is not copied into a new bytes object.
+    Args:
+        file: Raw bytes, a binary file object, or a werkzeug FileStorage.
+    Returns:
+        A PDFSource; close it (or use it as a context manager) when done.
+    Raises:
+        ValueError: If the file is empty.
+    """
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(file)
+    else:
+        stream = getattr(file, 'stream', file)
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        # Werkzeug spools uploads; fileno() would roll a small one over to disk
+        stream = stream._file
+    if isinstance(stream, io.BytesIO):
+        buffer = stream.getbuffer()
+        if not len(buffer):
+            buffer.release()
+            raise ValueError("Empty file")
+        stream.seek(0)
+        return PDFSource(stream, buffer)
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fd = None
+    if fd is not None:
+        if stream.writable():
+            stream.flush()
+        if os.fstat(fd).st_size == 0:
+            raise ValueError("Empty file")
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        name = getattr(stream, 'name', None)
+        path = name if isinstance(name, str) and os.path.isfile(name) else None
+        return PDFSource(mapped, mapped, path)
+    content = stream.read()
+    if not content:
+        raise ValueError("Empty file")
+    return PDFSource(io.BytesIO(content), memoryview(content))
+
+
+def layout_params() -> Any:
+    """Layout analysis parameters used for every extraction."""
+    from pdfminer.layout import LAParams
+    boxes_flow = None if PDF_BOXES_FLOW.lower() == 'none' else float(PDF_BOXES_FLOW)
+    return LAParams(boxes_flow=boxes_flow)
+
+
+def extraction_signature() -> str:
+    """Settings that change extracted text, for cache versioning."""
+    return f"pages={PDF_MAX_PAGES or 'all'},flow={PDF_BOXES_FLOW}"
+
+
+def disable_parallel_extraction() -> None:
+    """
+    Extract in-process only. Used as the initializer of other process pools
+    (e.g. batch workers) so their children do not each start a nested pool.
+    """
+    global _parallel_enabled
+    _parallel_enabled = False
+
+
+def count_pages(fp: BinaryIO) -> int:
+    """Return the page count declared in the document's page tree."""
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+    fp.seek(0)
+    document = PDFDocument(PDFParser(fp))
+    count = resolve1(document.catalog.get('Pages'))
+    count = resolve1(count.get('Count')) if isinstance(count, dict) else None
+    if not isinstance(count, int):
+        count = sum(1 for _ in PDFPage.create_pages(document))
+    return count
+
+
+def _extract_pages(fp: BinaryIO, page_numbers: Optional[range] = None, max_pages: int = 0) -> Iterator[str]:
+    """Yield the text of each selected page; same output as pdfminer's extract_text."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    fp.seek(0)
+    rsrcmgr = PDFResourceManager(caching=True)
+    with io.StringIO() as output:
+        device = TextConverter(rsrcmgr, output, codec='utf-8', laparams=layout_params())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, page_numbers, maxpages=max_pages, caching=True):
+            interpreter.process_page(page)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+
+def extract_page_range(path: str, start: int, stop: int) -> str:
+    """Extract pages [start, stop) of a PDF file. Runs inside a pool worker."""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return ''.join(_extract_pages(mapped, range(start, stop)))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the page extraction pool of this process (spawned, like the batch pool)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info("Starting PDF extraction pool with %d workers", PDF_EXTRACT_WORKERS)
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def _reset_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_text(source: PDFSource, max_pages: int = PDF_MAX_PAGES) -> Iterator[str]:
+    """
+    Yield the text of a PDF in document order, a page or page range at a time.
+    Args:
+        source: Document from open_pdf_source().
+        max_pages: Page cap (0 for no cap).
+    Yields:
+        Text chunks; joined, they equal pdfminer's extract_text() over the
+        same pages.
+    """
+    pages = 0
+    if _parallel_enabled and PDF_EXTRACT_WORKERS > 1:
+        pages = count_pages(source.fp)
+        if max_pages:
+            pages = min(pages, max_pages)
+    if pages < max(PDF_PARALLEL_MIN_PAGES, 2):
+        yield from _extract_pages(source.fp, max_pages=max_pages)
+        return
+
+    spilled = None
+    path = source.path
+    if path is None:
+        # Workers need a file to open; write in-memory uploads out once
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(source.buffer)
+            spilled = path = f.name
+    try:
+        ranges = [(start, min(start + PDF_PAGES_PER_TASK, pages))
+                  for start in range(0, pages, PDF_PAGES_PER_TASK)]
+        executor = get_executor()
+        try:
+            futures = [executor.submit(extract_page_range, path, start, stop) for start, stop in ranges[1:]]
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            futures = []
+        try:
+            # The first range is extracted here while the pool works on the rest
+            yield from _extract_pages(source.fp, range(*ranges[0]))
+            for (start, stop), future in zip(ranges[1:], futures):
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    logger.error("PDF extraction worker died on pages %d-%d", start, stop)
+                    _reset_executor(executor)
+                    yield from _extract_pages(source.fp, range(start, stop))
+            for start, stop in ranges[len(futures) + 1:]:
+                yield from _extract_pages(source.fp, range(start, stop))
+        finally:
+            for future in futures:
+                future.cancel()
+    finally:
+        if spilled:
+            os.remove(spilled)
+
+
+def extract_pdf_text(source: PDFSource, max_pages: int = PDF_MAX_PAGES) -> str:
+    """Return the text of a PDF (see iter_pdf_text)."""
+    return ''.join(iter_pdf_text(source, max_pages))
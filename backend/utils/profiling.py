@@ -0,0 +1,175 @@
+"""
+Request Profiling
+
+Opt-in sampling profiler for individual API requests. A view wrapped with
+@profiled is profiled when the request carries the admin token
+(PROFILE_TOKEN) in the X-Profile-Token header or the profile_token query
+parameter, or when it is picked by random sampling (PROFILE_SAMPLE_RATE).
+A background thread then records the request thread's Python stack every
+PROFILE_INTERVAL_MS, and the counts are written in the collapsed-stack
+format ("outer;inner;leaf count" per line) read by flamegraph.pl and
+speedscope, to PROFILE_DIR under the request id.
+
+With PROFILE_TOKEN unset and PROFILE_SAMPLE_RATE at 0 (the defaults) the
+views are not wrapped at all; otherwise a request that is not profiled
+costs one header lookup (and one random draw when sampling is on).
+"""
+import os
+import sys
+import time
+import hmac
+import random
+import threading
+import functools
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Tuple
+from utils.log_config import REQUEST_ID_HEADER, current_request_id
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Admin token that turns profiling on for a request ('' = on-demand profiling disabled)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+# Fraction of requests to profiled views that are profiled without the token
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Milliseconds between stack samples
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BACKEND_DIR, "data", "profiles"))
+# Profiles kept in PROFILE_DIR; the oldest are deleted beyond this
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "500"))
+
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_PARAM = 'profile_token'
+
+_ENABLED = bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+_save_lock = threading.Lock()
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack at a fixed interval from a helper thread.
+    Stacks are kept as counts per distinct stack, so memory grows with the
+    number of distinct code paths rather than with the request's duration.
+    """
+    def __init__(self, thread_id: Optional[int] = None, interval: float = PROFILE_INTERVAL_MS / 1000) -> None:
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[Any, str] = {}
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.relpath(code.co_filename, BACKEND_DIR) \
+                if code.co_filename.startswith(BACKEND_DIR) else os.path.basename(code.co_filename)
+            label = self._labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ',')
+        return label
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def collapsed(self) -> str:
+        """The samples in collapsed-stack format, most frequent stacks first."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _requested() -> Tuple[bool, str]:
+    """(profile this request?, why) from the admin token or the sample rate."""
+    from flask import request
+    if PROFILE_TOKEN:
+        token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_PARAM)
+        if token and hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+            return True, 'token'
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return True, 'sampled'
+    return False, ''
+
+
+def save_profile(profiler: SamplingProfiler, request_id: str, endpoint: str) -> Optional[str]:
+    """Write a profile to PROFILE_DIR and drop the oldest beyond PROFILE_MAX_FILES."""
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}_{endpoint}_{request_id}.folded"
+    path = os.path.join(PROFILE_DIR, name)
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(profiler.collapsed())
+        with _save_lock:
+            profiles = sorted(entry for entry in os.listdir(PROFILE_DIR) if entry.endswith('.folded'))
+            for old in profiles[:max(0, len(profiles) - PROFILE_MAX_FILES)]:
+                os.remove(os.path.join(PROFILE_DIR, old))
+    except OSError as e:
+        logger.error("Error saving profile %s: %s", name, e)
+        return None
+    return path
+
+
+def profiled(view: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorator for API views: profile the call when requested (see module
+    docstring). The response carries the request id, which names the saved
+    profile, in X-Request-ID.
+    """
+    if not _ENABLED:
+        return view
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        wanted, reason = _requested()
+        if not wanted:
+            return view(*args, **kwargs)
+        from flask import make_response
+        request_id = current_request_id()
+        profiler = SamplingProfiler()
+        error_type = None
+        try:
+            with profiler:
+                response = make_response(view(*args, **kwargs))
+        except Exception as e:
+            error_type = type(e).__name__
+            raise
+        finally:
+            # Requests that fail are saved too; they are often the ones worth reading
+            path = save_profile(profiler, request_id, view.__name__)
+            logger.info("Profiled %s (%s)", view.__name__, reason, extra={
+                'duration_ms': round(profiler.elapsed * 1000, 1), 'samples': profiler.samples,
+                'profile_path': path, 'error_type': error_type
+            })
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+
+    return wrapper
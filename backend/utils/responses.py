@@ -0,0 +1,230 @@
+"""
+JSON Responses
+
+Response layer for the API blueprint. JSON is encoded with orjson, which
+serializes NumPy scalars and arrays natively and accepts non-string keys
+(None, numbers, booleans) such as the group keys produced by the fairness
+module; the stdlib encoder is used, with a NumPy-aware default, when orjson
+is not installed. Large bodies are sent as a stream of chunks rather than
+one string, and compressed with brotli or gzip when the client accepts it.
+"""
+import os
+import json
+import zlib
+import logging
+from typing import Any, Callable, Iterable, Iterator, Optional
+import numpy as np
+from flask import Response, request
+from flask.json.provider import JSONProvider
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Size of the chunks a streamed JSON body is written in
+JSON_CHUNK_BYTES = int(os.getenv("JSON_CHUNK_BYTES", str(64 * 1024)))
+# Smallest response body that is compressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+# Compression levels (gzip 1-9, brotli 0-11)
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson'}
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Imported on first use; None once known to be missing
+_brotli_module: Any = False
+
+
+def _default(obj: Any) -> Any:
+    """Fallback conversion for types neither encoder handles natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _plain_keys(obj: Any) -> Any:
+    """Replace NumPy scalar dict keys, which the stdlib encoder rejects."""
+    if isinstance(obj, dict):
+        return {key.item() if isinstance(key, np.generic) else key: _plain_keys(value)
+                for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain_keys(value) for value in obj]
+    return obj
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. NumPy scalar keys nested below the first level, or
+            # non-contiguous arrays; the stdlib path handles both
+            pass
+    return json.dumps(_plain_keys(obj), default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_json(obj: Any, chunk_bytes: int = JSON_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Yield the JSON encoding of obj in chunks of about chunk_bytes.
+    Top-level dict entries and list items are encoded one at a time, so only
+    one chunk (plus the largest single entry) is held in memory at once.
+    """
+    if isinstance(obj, dict):
+        items: Iterable[bytes] = (dumps({key: value})[1:-1] for key, value in obj.items())
+        opening, closing = b'{', b'}'
+    elif isinstance(obj, (list, tuple)):
+        items = (dumps(value) for value in obj)
+        opening, closing = b'[', b']'
+    else:
+        yield dumps(obj)
+        return
+    buffer = bytearray(opening)
+    first = True
+    for item in items:
+        if not first:
+            buffer += b','
+        first = False
+        buffer += item
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += closing
+    yield bytes(buffer)
+
+
+def json_response(obj: Any, status: int = 200, mimetype: str = 'application/json') -> Response:
+    """
+    Build a JSON response. Bodies that fit in one chunk are sent with a
+    Content-Length; larger ones are streamed chunk by chunk.
+    """
+    chunks = iter_json(obj)
+    first = next(chunks)
+    rest = next(chunks, None)
+    if rest is None:
+        return Response(first, status=status, mimetype=mimetype)
+
+    def generate() -> Iterator[bytes]:
+        yield first
+        yield rest
+        yield from chunks
+
+    return Response(generate(), status=status, mimetype=mimetype)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by dumps()/loads(), used by jsonify and request.json."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if args and kwargs:
+            raise TypeError("jsonify() behavior undefined when passed both args and kwargs")
+        if not args and not kwargs:
+            obj: Any = None
+        elif args:
+            obj = args[0] if len(args) == 1 else args
+        else:
+            obj = kwargs
+        return json_response(obj, mimetype=self._app.config.get('JSONIFY_MIMETYPE') or 'application/json')
+
+
+def _brotli() -> Optional[Any]:
+    """The brotli module, or None when it is not installed (gzip only)."""
+    global _brotli_module
+    if _brotli_module is False:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        _brotli_module = brotli
+    return _brotli_module
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Pick 'br' or 'gzip' from the request's Accept-Encoding, or None."""
+    offered = ['br', 'gzip'] if _brotli() is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def _compressor(encoding: str) -> Any:
+    if encoding == 'br':
+        return _brotli().Compressor(quality=BROTLI_QUALITY)
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def _compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return _brotli().compress(data, quality=BROTLI_QUALITY)
+    compressor = _compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+    compressor = _compressor(encoding)
+    # Flush after every chunk so streamed lines (e.g. NDJSON batch results)
+    # reach the client as they are produced
+    if encoding == 'br':
+        flush: Callable[[], bytes] = compressor.flush
+        finish: Callable[[], bytes] = compressor.finish
+        compress = compressor.process
+    else:
+        flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)  # noqa: E731
+        finish = compressor.flush
+        compress = compressor.compress
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook: compress JSON and NDJSON responses for clients that
+    accept brotli or gzip. Streamed bodies are compressed as they are sent.
+    """
+    if (response.direct_passthrough or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers or request.method == 'HEAD'
+            or response.status_code < 200 or response.status_code in (204, 304)):
+        return response
+    if not response.is_streamed and (response.content_length or 0) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    response.vary.add('Accept-Encoding')
+    response.headers['Content-Encoding'] = encoding
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(_compress_bytes(response.get_data(), encoding))
+    return response
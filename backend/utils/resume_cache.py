@@ -0,0 +1,267 @@
+"""
+Parsed Resume Cache
+
+Content-addressed cache for parse_resume results. Entries are keyed by the
+SHA-256 of the PDF bytes plus the parser version, so a re-uploaded resume skips
+PDF extraction and the Groq call entirely. A bounded in-memory LRU sits in
+front of an on-disk tier that survives restarts and is shared by every worker
+on the host.
+
+Cached entries hold the full extracted resume text and contact details in
+plain JSON under RESUME_CACHE_DIR. They are kept for at most
+RESUME_CACHE_TTL_SECONDS after they were written (30 days by default, reads
+do not extend it) and deleted earlier when the disk tier needs space; clear()
+or deleting the directory removes them all.
+"""
+import os
+import copy
+import json
+import hashlib
+import time
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from utils.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(BACKEND_DIR, "data", "resume_cache"))
+# Entries kept in the in-memory tier
+RESUME_CACHE_MEMORY_ITEMS = int(os.getenv("RESUME_CACHE_MEMORY_ITEMS", "256"))
+# Total size of the on-disk tier before the oldest entries are evicted
+RESUME_CACHE_DISK_BYTES = int(os.getenv("RESUME_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+# Age after which an entry is expired and deleted, counted from when it was written (0 keeps entries until evicted)
+RESUME_CACHE_TTL_SECONDS = int(os.getenv("RESUME_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+# Interval between measurements of the disk tier, which every worker on the host writes to
+RESUME_CACHE_SCAN_SECONDS = float(os.getenv("RESUME_CACHE_SCAN_SECONDS", "60"))
+
+
+class ResumeCache:
+    """
+    Two-tier (memory LRU + disk) cache of parsed resume dictionaries.
+    Disk entries are written atomically. A file's mtime is its write time,
+    for expiry, and its atime is set on every disk hit, for recency. The
+    tier is measured from the directory on the first write and then at
+    least every scan_seconds (and whenever this process's own writes push
+    its last measurement over budget), so writes by other workers count
+    against the budget too; each measurement deletes expired files, then the
+    least recently used ones until the tier is back under its byte budget.
+    """
+    def __init__(self, cache_dir: Optional[str] = RESUME_CACHE_DIR,
+                 memory_items: int = RESUME_CACHE_MEMORY_ITEMS,
+                 disk_bytes: int = RESUME_CACHE_DISK_BYTES,
+                 ttl_seconds: int = RESUME_CACHE_TTL_SECONDS,
+                 scan_seconds: float = RESUME_CACHE_SCAN_SECONDS) -> None:
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.scan_seconds = scan_seconds
+        # key -> (write time, parsed resume)
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage: Optional[int] = None
+        self._scanned_at = 0.0
+        self.counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+            'expirations': 0,
+            'errors': 0
+        }
+
+    @staticmethod
+    def make_key(content: bytes, version: str) -> str:
+        """Return the cache key for PDF bytes parsed by a given parser version."""
+        digest = hashlib.sha256(content).hexdigest()
+        return hashlib.sha256(f"{digest}:{version}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _expired(self, written_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - written_at > self.ttl_seconds
+
+    def _remember(self, key: str, value: Dict[str, Any], written_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (written_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+                self.counters['memory_evictions'] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a parsed resume.
+        Args:
+            key: Key from make_key().
+        Returns:
+            A copy of the cached dictionary, or None on a miss.
+        """
+        with self._lock:
+            written_at, value = self._memory.get(key, (0.0, None))
+            if value is not None and self._expired(written_at):
+                del self._memory[key]
+                value = None
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                CACHE_LOOKUPS.inc('memory_hit')
+                return copy.deepcopy(value)
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                written_at = os.stat(path).st_mtime
+                if self._expired(written_at):
+                    os.remove(path)
+                    self._count('expirations')
+                    raise FileNotFoundError(path)
+                with open(path) as f:
+                    value = json.load(f)
+                os.utime(path, (time.time(), written_at))
+            except FileNotFoundError:
+                value = None
+            except (OSError, ValueError) as e:
+                logger.error("Error reading resume cache entry %s: %s", key, e)
+                self._count('errors')
+                value = None
+            if value is not None:
+                self._count('disk_hits')
+                CACHE_LOOKUPS.inc('disk_hit')
+                self._remember(key, value, written_at)
+                return copy.deepcopy(value)
+        self._count('misses')
+        CACHE_LOOKUPS.inc('miss')
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a parsed resume in both tiers."""
+        self._remember(key, copy.deepcopy(value), time.time())
+        self._count('stores')
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(value, f)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("Error writing resume cache entry %s: %s", key, e)
+            self._count('errors')
+            return
+        with self._lock:
+            if self._disk_usage is not None:
+                self._disk_usage += size
+            scan = (self._disk_usage is None or self._disk_usage > self.disk_bytes
+                    or time.monotonic() - self._scanned_at >= self.scan_seconds)
+        if scan:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # Other workers write to the same directory, so the usage is
+        # re-measured from disk rather than trusted from local bookkeeping.
+        entries = []
+        total = 0
+        expired = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if self._expired(stat.st_mtime):
+                        os.remove(path)
+                        expired += 1
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+        evicted = 0
+        if total > self.disk_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.disk_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_usage = total
+            self._scanned_at = time.monotonic()
+            self.counters['disk_evictions'] += evicted
+            self.counters['expirations'] += expired
+
+    def get_or_compute(self, content: bytes, version: str, compute: Callable[[], Dict[str, Any]],
+                       should_store: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Dict[str, Any]:
+        """
+        Return the cached parse of content, computing and storing it on a miss.
+        Args:
+            content: Raw PDF bytes.
+            version: Parser version tag.
+            compute: Produces the parse on a miss.
+            should_store: Optional predicate; results it rejects are not cached.
+        """
+        key = self.make_key(content, version)
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if should_store is None or should_store(value):
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            disk_bytes, self.disk_bytes = self.disk_bytes, -1
+            try:
+                self._evict_disk()
+            finally:
+                self.disk_bytes = disk_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_items'] = len(self._memory)
+            stats['disk_bytes'] = self._disk_usage
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_cache: Optional[ResumeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_cache() -> Optional[ResumeCache]:
+    """Return the process-wide resume cache, or None when caching is disabled."""
+    global _cache
+    if not RESUME_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResumeCache()
+        return _cache
@@ -6,69 +6,180 @@ and perform feature calculations for candidate evaluation.
 """
 import os
 import re
-import io
-import json
 import logging
-import requests
-from typing import Any, Dict, List, Optional
-from pdfminer.high_level import extract_text
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+from utils.resume_cache import get_resume_cache
+from utils.pdf_text import PDFSource, extract_pdf_text, extraction_signature, open_pdf_source
+from utils.llm_client import LLMUnavailableError, get_llm_client
+from utils.keyword_matcher import PREFIX, KeywordMatcher, group_by_span
+from utils.metrics import ANALYSIS_SOURCE, ERRORS, GROQ_FAILURES, timed
+from utils.log_config import exception_fields
+from model.taxonomy import get_taxonomy
+
 logger = logging.getLogger(__name__)
 
 # Groq API configuration (use environment variable for security)
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except Exception as e:
-    logger.error(f"Error downloading NLTK data: {str(e)}")
+# Bump whenever extraction or feature logic changes so cached parses are not reused
+PARSER_VERSION = "3"
+
+SECTION_HEADERS = {
+    'education': ['education', 'academic', 'qualification', 'degree', 'diploma', 'certificate', 'school'],
+    'experience': ['experience', 'work', 'employment', 'professional', 'internship', 'project'],
+    'skills': ['skills', 'technical skills', 'expertise', 'programming', 'technologies', 'tools'],
+    'certifications': ['certifications', 'certificates', 'certified', 'certification'],
+    'languages': ['languages', 'language proficiency', 'language skills']
+}
+
+# Content words that imply a section before any header has been seen
+SECTION_HINTS = {
+    'education': ['university', 'college', 'school', 'b.tech', 'm.tech', 'phd'],
+    'experience': ['developer', 'engineer', 'intern', 'worked', 'experience'],
+    'skills': ['python', 'java', 'javascript', 'c++', 'html', 'css'],
+    'certifications': ['certification', 'certified', 'certificate'],
+    'languages': ['language', 'fluent', 'native', 'proficient']
+}
+
+SKILL_CATEGORIES = {
+    'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'c', 'sql'],
+    'web': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'next.js', 'tailwind', 'bootstrap'],
+    'database': ['mongodb', 'mysql', 'postgresql', 'oracle', 'firebase'],
+    'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes'],
+    'ml': ['tensorflow', 'pytorch', 'scikit-learn', 'opencv', 'resnet'],
+    'mobile': ['android', 'ios', 'react native', 'flutter'],
+    'tools': ['git', 'github', 'jira', 'jenkins', 'linux', 'unix']
+}
+
+# Skill set of the skills taxonomy that skills_match is measured against
+SKILLS_MATCH_SET = 'skills_match'
+
+PROJECT_INDICATORS = {
+    'complex': ['architecture', 'design', 'lead', 'manage', 'implement'],
+    'medium': ['develop', 'create', 'build', 'integrate'],
+    'basic': ['assist', 'support', 'maintain']
+}
 
-def parse_resume(file) -> Dict[str, Any]:
+# Shared matcher for every keyword scan in this module. Headers, hints and
+# project indicators are stems ('project' matches 'projects', 'develop'
+# matches 'developed'); skills must match whole words.
+KEYWORDS = KeywordMatcher(
+    {
+        'section_headers': SECTION_HEADERS,
+        'section_hints': SECTION_HINTS,
+        'skills': SKILL_CATEGORIES,
+        'project_indicators': PROJECT_INDICATORS
+    },
+    modes={'section_headers': PREFIX, 'section_hints': PREFIX, 'project_indicators': PREFIX}
+)
+
+_LINE_RE = re.compile(r'[^\n]+')
+_NEWLINE_RE = re.compile('\n')
+
+# Line classifiers for the regex fallback, compiled once. None of them can
+# match a newline, so they can be run over a whole text as well as per line.
+_EDUCATION_RE = re.compile(
+    r'(bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?|b\.?tech|m\.?tech)'
+    r'|(university|college|institute|school)'
+    r'|(xth|xiith|high school|secondary school)'
+    r'|(diploma|certificate)'
+    r'|(ssc|hsc|cbse|icse)',
+    re.IGNORECASE
+)
+# Matched against lower-cased text
+_PROJECT_RE = re.compile(
+    'developed|project|platform|solution|application|integrated|implemented|created|built|designed'
+)
+_EXPERIENCE_RE = re.compile(
+    r'(\d+)[^\S\n]*(?:years?|yrs?)[^\S\n]*(?:of)?[^\S\n]*experience'
+    r'|experience:[^\S\n]*(\d+)[^\S\n]*(?:years?|yrs?)'
+    r'|(\d+)[^\S\n]*(?:years?|yrs?)[^\S\n]*(?:in)?[^\S\n]*the[^\S\n]*field'
+)
+# Matched against lower-cased text
+_EXPERIENCE_KEYWORD_RE = re.compile(
+    'developer|engineer|analyst|consultant|manager|intern|internship|worked|working|responsibilities'
+)
+_CERTIFICATION_RE = re.compile('certification|certified|certificate', re.IGNORECASE)
+_LANGUAGE_RE = re.compile('language|fluent|native|proficient', re.IGNORECASE)
+_BULLET_CHARS_RE = re.compile(r'[•◦○-]')
+# First run of digits in each whitespace-separated token
+_TOKEN_NUMBER_RE = re.compile(r'(?<!\S)[^\s\d]*(\d+)')
+
+def parse_resume(file, use_cache: bool = True) -> Dict[str, Any]:
     """
     Parse resume file and extract relevant information.
+    The upload is read in place (see utils.pdf_text) rather than copied, and
+    results are cached by a hash of the PDF bytes and the parser version, so a
+    re-uploaded resume skips text extraction and the Groq call.
     Args:
-        file: File-like object containing the resume PDF.
+        file: File-like object, FileStorage or bytes containing the resume PDF.
+        use_cache: Whether to consult and fill the parsed resume cache.
     Returns:
         Dictionary with extracted and calculated features.
     Raises:
         Exception: If parsing fails.
     """
     try:
-        logger.debug("Starting resume parsing")
-        file_content = file.read()
-        logger.debug(f"Read file content, size: {len(file_content)} bytes")
-        file_obj = io.BytesIO(file_content)
-        text = extract_text(file_obj)
-        logger.debug(f"Extracted text length: {len(text)} characters")
-        if not text:
-            raise ValueError("No text could be extracted from the PDF")
-        structured_data = analyze_with_groq(text)
-        info = {
-            'text': text,
-            'education': structured_data.get('education', []),
-            'experience': structured_data.get('experience', []),
-            'skills': structured_data.get('skills', []),
-            'certifications': structured_data.get('certifications', []),
-            'languages': structured_data.get('languages', []),
-            'education_level': calculate_education_level(structured_data.get('education', [])),
-            'years_experience': calculate_years_experience(structured_data.get('experience', [])),
-            'skills_match': calculate_skills_match(structured_data.get('skills', [])),
-            'project_complexity': calculate_project_complexity(structured_data.get('experience', []))
-        }
-        logger.debug("Parsing completed successfully")
-        return info
+        with timed('parse'), open_pdf_source(file) as source:
+            logger.debug("Parsing resume", extra={'pdf_bytes': source.size})
+            cache = get_resume_cache() if use_cache else None
+            if cache is None:
+                return parse_pdf_source(source)
+            # A fallback parse produced because Groq failed is not cached under the
+            # Groq version, so the resume gets the full analysis once Groq recovers
+            return cache.get_or_compute(
+                source.buffer, parser_version(), lambda: parse_pdf_source(source),
+                should_store=lambda info: info.get('analysis_source') == ('groq' if GROQ_API_KEY else 'fallback')
+            )
     except Exception as e:
-        logger.error(f"Error parsing resume: {str(e)}")
+        logger.error("Error parsing resume", extra=exception_fields(e))
+        ERRORS.inc('parse')
         raise
 
+def parser_version() -> str:
+    """
+    Version tag for cached parse results. Results from the Groq analysis and
+    the regex fallback differ, so each mode gets its own cache entries, as do
+    different page caps and layout settings.
+    """
+    return f"{PARSER_VERSION}:{'groq' if GROQ_API_KEY else 'fallback'}:{extraction_signature()}"
+
+def parse_pdf_source(source: PDFSource) -> Dict[str, Any]:
+    """
+    Extract text from an opened PDF and build the parsed resume dictionary.
+    Args:
+        source: Document from open_pdf_source().
+    Returns:
+        Dictionary with extracted and calculated features.
+    """
+    with timed('pdf_extract'):
+        text = extract_pdf_text(source)
+    logger.debug("Extracted resume text", extra={'text_chars': len(text)})
+    if not text:
+        raise ValueError("No text could be extracted from the PDF")
+    structured_data, source, features = analyze_resume_text(text)
+    ANALYSIS_SOURCE.inc(source)
+    if features is None:
+        with timed('features'):
+            features = {
+                'education_level': calculate_education_level(structured_data.get('education', [])),
+                'years_experience': calculate_years_experience(structured_data.get('experience', [])),
+                'skills_match': calculate_skills_match(structured_data.get('skills', [])),
+                'project_complexity': calculate_project_complexity(structured_data.get('experience', []))
+            }
+    info = {
+        'text': text,
+        'analysis_source': source,
+        'education': structured_data.get('education', []),
+        'experience': structured_data.get('experience', []),
+        'skills': structured_data.get('skills', []),
+        'certifications': structured_data.get('certifications', []),
+        'languages': structured_data.get('languages', []),
+        **features
+    }
+    return info
+
 def analyze_with_groq(text: str) -> Dict[str, Any]:
     """
     Use Groq API to analyze and structure resume content.
@@ -78,45 +189,45 @@ def analyze_with_groq(text: str) -> Dict[str, Any]:
     Returns:
         Structured data dictionary.
     """
+    return analyze_resume_text(text)[0]
+
+def analyze_resume_text(text: str) -> Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]:
+    """
+    Structure resume content with Groq, falling back to regex parsing.
+    Args:
+        text: Extracted resume text.
+    Returns:
+        Structured data dictionary, its source ('groq' or 'fallback'), and the
+        derived numeric features when the single-pass fallback produced them.
+    """
     if not GROQ_API_KEY:
         logger.warning("GROQ_API_KEY not set. Using fallback parsing.")
-        return {
-            'education': extract_education(text),
-            'experience': extract_experience(text),
-            'skills': extract_skills(text),
-            'certifications': extract_certifications(text),
-            'languages': extract_languages(text)
-        }
+        with timed('fallback_parse'):
+            sections, features = segment_resume(text)
+        return sections, 'fallback', features
     try:
         prompt = f"""Analyze the following resume and extract information into structured sections. \
         Return the data in JSON format with the following structure:\n\n        {{\n            \"education\": [list of education entries],\n            \"experience\": [list of experience entries],\n            \"skills\": [list of technical skills],\n            \"certifications\": [list of certifications],\n            \"languages\": [list of languages and proficiency]\n        }}\n\n        Resume text:\n        {text}\n        """
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "mixtral-8x7b-32768",
-            "messages": [
-                {"role": "system", "content": "You are a resume parser that extracts structured information from resumes."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.1,
-            "max_tokens": 4000
-        }
-        response = requests.post(GROQ_API_URL, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
-        structured_data = json.loads(result['choices'][0]['message']['content'])
-        return structured_data
+        messages = [
+            {"role": "system", "content": "You are a resume parser that extracts structured information from resumes."},
+            {"role": "user", "content": prompt}
+        ]
+        with timed('groq'):
+            structured_data = get_llm_client(GROQ_API_KEY).chat_json(messages, temperature=0.1, max_tokens=4000)
+        return structured_data, 'groq', None
+    except LLMUnavailableError as e:
+        logger.warning("Groq API unavailable: %s. Using fallback parsing.", e)
+        GROQ_FAILURES.inc('unavailable')
     except Exception as e:
-        logger.error(f"Error in Groq API call: {str(e)}. Using fallback parsing.")
-        return {
-            'education': extract_education(text),
-            'experience': extract_experience(text),
-            'skills': extract_skills(text),
-            'certifications': extract_certifications(text),
-            'languages': extract_languages(text)
-        }
+        logger.error("Error in Groq API call. Using fallback parsing.", extra=exception_fields(e))
+        GROQ_FAILURES.inc('error')
+    with timed('fallback_parse'):
+        sections, features = segment_resume(text)
+    return sections, 'fallback', features
+
+def fallback_analysis(text: str) -> Dict[str, Any]:
+    """Structure resume content with the regex/keyword extractors."""
+    return segment_resume(text)[0]
 
 def split_into_sections(text: str) -> Dict[str, str]:
     """
@@ -133,44 +244,32 @@ def split_into_sections(text: str) -> Dict[str, str]:
         'certifications': '',
         'languages': ''
     }
-    section_headers = {
-        'education': ['education', 'academic', 'qualification', 'degree', 'diploma', 'certificate', 'school'],
-        'experience': ['experience', 'work', 'employment', 'professional', 'internship', 'project'],
-        'skills': ['skills', 'technical skills', 'expertise', 'programming', 'technologies', 'tools'],
-        'certifications': ['certifications', 'certificates', 'certified', 'certification'],
-        'languages': ['languages', 'language proficiency', 'language skills']
-    }
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    section_order = list(sections)
+    text_lower = text.lower()
+    line_spans = [(m.start(), m.group().strip()) for m in _LINE_RE.finditer(text) if m.group().strip()]
+    # Hits are offsets into text_lower, which lower() can make longer than text
+    lowered_starts = [line_start for line_start, _ in line_spans] if len(text_lower) == len(text) else \
+        [m.start() for m in _LINE_RE.finditer(text_lower) if m.group().strip()]
+    hits_by_line = group_by_span(
+        KEYWORDS.scan(text_lower, ('section_headers', 'section_hints'), lowered=True),
+        lowered_starts
+    )
     current_section = None
     current_content = []
     section_found = False
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        is_header = False
-        for section, headers in section_headers.items():
-            if any(header in line_lower for header in headers):
-                if current_section and current_content:
-                    sections[current_section] = '\n'.join(current_content)
-                current_section = section
-                current_content = []
-                is_header = True
-                section_found = True
-                break
+    for i, (_, line) in enumerate(line_spans):
+        line_hits = hits_by_line.get(i, [])
+        headers = [hit.category for hit in line_hits if hit.vocabulary == 'section_headers']
+        if headers:
+            if current_section and current_content:
+                sections[current_section] = '\n'.join(current_content)
+            current_section = min(headers, key=section_order.index)
+            current_content = []
+            section_found = True
         if not section_found:
-            if any(edu_word in line_lower for edu_word in ['university', 'college', 'school', 'b.tech', 'm.tech', 'phd']):
-                current_section = 'education'
-                section_found = True
-            elif any(exp_word in line_lower for exp_word in ['developer', 'engineer', 'intern', 'worked', 'experience']):
-                current_section = 'experience'
-                section_found = True
-            elif any(skill_word in line_lower for skill_word in ['python', 'java', 'javascript', 'c++', 'html', 'css']):
-                current_section = 'skills'
-                section_found = True
-            elif any(cert_word in line_lower for cert_word in ['certification', 'certified', 'certificate']):
-                current_section = 'certifications'
-                section_found = True
-            elif any(lang_word in line_lower for lang_word in ['language', 'fluent', 'native', 'proficient']):
-                current_section = 'languages'
+            hints = [hit.category for hit in line_hits if hit.vocabulary == 'section_hints']
+            if hints:
+                current_section = min(hints, key=section_order.index)
                 section_found = True
         if current_section:
             current_content.append(line)
@@ -181,14 +280,6 @@ def split_into_sections(text: str) -> Dict[str, str]:
 def extract_education(text: str) -> List[str]:
     """Extract education information from text."""
     education = []
-    edu_patterns = [
-        r'(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|b\.?e\.?|m\.?e\.?|b\.?tech|m\.?tech)',
-        r'(?i)(university|college|institute|school)',
-        r'(?i)(xth|xiith|high school|secondary school)',
-        r'(?i)(diploma|certificate)',
-        r'(?i)(ssc|hsc|cbse|icse)'
-    ]
-    
     lines = text.split('\n')
     current_edu = []
     
@@ -198,13 +289,10 @@ def extract_education(text: str) -> List[str]:
             continue
             
         # Check if line contains education indicators
-        is_education = any(re.search(pattern, line) for pattern in edu_patterns)
+        is_education = _EDUCATION_RE.search(line) is not None
         
         # Skip lines that are clearly project-related
-        is_project = any(keyword in line.lower() for keyword in [
-            'developed', 'project', 'platform', 'solution', 'application',
-            'integrated', 'implemented', 'created', 'built', 'designed'
-        ])
+        is_project = _PROJECT_RE.search(line.lower()) is not None
         
         if is_education and not is_project:
             if current_edu:
@@ -212,11 +300,7 @@ def extract_education(text: str) -> List[str]:
                 current_edu = []
             current_edu.append(line)
         elif current_edu and not is_project:
-            if not any(keyword in line.lower() for keyword in [
-                'developed', 'project', 'platform', 'solution', 'application',
-                'integrated', 'implemented', 'created', 'built', 'designed'
-            ]):
-                current_edu.append(line)
+            current_edu.append(line)
     
     if current_edu:
         education.append(' '.join(current_edu))
@@ -226,12 +310,6 @@ def extract_education(text: str) -> List[str]:
 def extract_experience(text):
     """Extract experience information"""
     experience = []
-    exp_patterns = [
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:of)?\s*experience',
-        r'experience:\s*(\d+)\s*(?:years?|yrs?)',
-        r'(\d+)\s*(?:years?|yrs?)\s*(?:in)?\s*the\s*field'
-    ]
-    
     lines = text.split('\n')
     current_exp = []
     
@@ -241,10 +319,8 @@ def extract_experience(text):
             continue
             
         # Check if line contains experience indicators
-        is_experience = any(re.search(pattern, line) for pattern in exp_patterns) or any(keyword in line.lower() for keyword in [
-            'developer', 'engineer', 'analyst', 'consultant', 'manager',
-            'intern', 'internship', 'worked', 'working', 'responsibilities'
-        ])
+        is_experience = (_EXPERIENCE_RE.search(line) is not None
+                         or _EXPERIENCE_KEYWORD_RE.search(line.lower()) is not None)
         
         if is_experience:
             if current_exp:
@@ -261,52 +337,33 @@ def extract_experience(text):
 
 def extract_skills(text):
     """Extract skills from text"""
-    skills = []
-    skill_categories = {
-        'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'c', 'sql'],
-        'web': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'next.js', 'tailwind', 'bootstrap'],
-        'database': ['mongodb', 'mysql', 'postgresql', 'oracle', 'firebase'],
-        'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes'],
-        'ml': ['tensorflow', 'pytorch', 'scikit-learn', 'opencv', 'resnet'],
-        'mobile': ['android', 'ios', 'react native', 'flutter'],
-        'tools': ['git', 'github', 'jira', 'jenkins', 'linux', 'unix']
-    }
+    if not text:
+        return []
+    text_lower = text.lower()
+    hits = KEYWORDS.scan(text_lower, ('skills',), lowered=True)
     
     # First try to extract skills from bullet points or lists
-    lines = text.split('\n')
-    for line in lines:
-        line = line.strip().lower()
-        if line.startswith(('•', '◦', '-', '*', '○')):
-            for category, tech_skills in skill_categories.items():
-                for skill in tech_skills:
-                    if skill in line:
-                        skills.append(skill)
+    lines = list(_LINE_RE.finditer(text_lower))
+    line_starts = [m.start() for m in lines]
+    bullet_lines = {i for i, m in enumerate(lines) if m.group().lstrip().startswith(('•', '◦', '-', '*', '○'))}
+    hits_by_line = group_by_span(hits, line_starts)
+    skills = [hit.keyword for i in bullet_lines for hit in hits_by_line.get(i, [])]
     
     # If no skills found in bullet points, search in the entire text
     if not skills:
-        text_lower = text.lower()
-        for category, tech_skills in skill_categories.items():
-            for skill in tech_skills:
-                if skill in text_lower:
-                    skills.append(skill)
+        skills = [hit.keyword for hit in hits]
     
     return list(set(skills))
 
 def extract_certifications(text):
     """Extract certification information"""
     certifications = []
-    cert_patterns = [
-        r'(?i)certification',
-        r'(?i)certified',
-        r'(?i)certificate'
-    ]
-    
     lines = text.split('\n')
     for line in lines:
         line = line.strip()
-        if any(re.search(pattern, line) for pattern in cert_patterns):
+        if _CERTIFICATION_RE.search(line):
             # Clean up the certification entry
-            cert = re.sub(r'[•◦○-]', '', line).strip()
+            cert = _BULLET_CHARS_RE.sub('', line).strip()
             if cert:
                 certifications.append(cert)
     
@@ -315,24 +372,114 @@ def extract_certifications(text):
 def extract_languages(text):
     """Extract language proficiency information"""
     languages = []
-    lang_patterns = [
-        r'(?i)language',
-        r'(?i)fluent',
-        r'(?i)native',
-        r'(?i)proficient'
-    ]
-    
     lines = text.split('\n')
     for line in lines:
         line = line.strip()
-        if any(re.search(pattern, line) for pattern in lang_patterns):
+        if _LANGUAGE_RE.search(line):
             # Clean up the language entry
-            lang = re.sub(r'[•◦○-]', '', line).strip()
+            lang = _BULLET_CHARS_RE.sub('', line).strip()
             if lang:
                 languages.append(lang)
     
     return languages
 
+def _matching_lines(pattern, text: str, line_starts: List[int]) -> set:
+    """Indices of the lines (by start offset) containing at least one match."""
+    found = set()
+    pos = 0
+    while True:
+        match = pattern.search(text, pos)
+        if match is None:
+            return found
+        i = bisect_right(line_starts, match.start()) - 1
+        found.add(i)
+        if i + 1 >= len(line_starts):
+            return found
+        # One hit is enough; resume at the next line
+        pos = line_starts[i + 1]
+
+def _line_starts(text: str) -> List[int]:
+    return [0] + [m.end() for m in _NEWLINE_RE.finditer(text)]
+
+def segment_resume(text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Single-pass regex fallback. Each classifier runs once over the whole text
+    to label lines, then one walk over the lines fills every section bucket.
+    Produces exactly what extract_education, extract_experience,
+    extract_skills, extract_certifications and extract_languages return, plus
+    the derived numeric features.
+    Args:
+        text: Extracted resume text.
+    Returns:
+        (sections, features) where sections has the keys of fallback_analysis()
+        and features holds education_level, years_experience, skills_match and
+        project_complexity.
+    """
+    lines = text.split('\n')
+    lowered = text.lower()
+    starts = _line_starts(text)
+    lowered_starts = starts if len(lowered) == len(text) else _line_starts(lowered)
+    education_lines = _matching_lines(_EDUCATION_RE, text, starts)
+    project_lines = _matching_lines(_PROJECT_RE, lowered, lowered_starts)
+    experience_lines = (_matching_lines(_EXPERIENCE_RE, text, starts)
+                        | _matching_lines(_EXPERIENCE_KEYWORD_RE, lowered, lowered_starts))
+    certification_lines = _matching_lines(_CERTIFICATION_RE, text, starts)
+    language_lines = _matching_lines(_LANGUAGE_RE, text, starts)
+
+    education, current_edu = [], []
+    experience, current_exp = [], []
+    certifications, languages = [], []
+    years_experience = 0
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if i in certification_lines:
+            cert = _BULLET_CHARS_RE.sub('', line).strip()
+            if cert:
+                certifications.append(cert)
+        if i in language_lines:
+            lang = _BULLET_CHARS_RE.sub('', line).strip()
+            if lang:
+                languages.append(lang)
+        if not line:
+            continue
+        is_project = i in project_lines
+        if i in education_lines and not is_project:
+            if current_edu:
+                education.append(' '.join(current_edu))
+            current_edu = [line]
+        elif current_edu and not is_project:
+            current_edu.append(line)
+        if i in experience_lines:
+            if current_exp:
+                experience.append(' '.join(current_exp))
+            current_exp = [line]
+        elif current_exp:
+            current_exp.append(line)
+        else:
+            continue
+        for number in _TOKEN_NUMBER_RE.findall(line):
+            years_experience = max(years_experience, int(number))
+    if current_edu:
+        education.append(' '.join(current_edu))
+    if current_exp:
+        experience.append(' '.join(current_exp))
+    skills = extract_skills(text)
+
+    sections = {
+        'education': education,
+        'experience': experience,
+        'skills': skills,
+        'certifications': certifications,
+        'languages': languages
+    }
+    features = {
+        'education_level': calculate_education_level(education),
+        'years_experience': years_experience,
+        'skills_match': calculate_skills_match(skills),
+        'project_complexity': calculate_project_complexity(experience)
+    }
+    return sections, features
+
 def calculate_education_level(education):
     """Calculate education level score (0-3)"""
     if not education:
@@ -362,43 +509,20 @@ def calculate_years_experience(experience):
     else:
         experience_text = str(experience)
     
-    # Extract numbers from experience strings
-    years = []
-    for exp in experience_text.split():
-        match = re.search(r'(\d+)', exp)
-        if match:
-            years.append(int(match.group(1)))
+    # Extract the first number from each experience token
+    years = [int(number) for number in _TOKEN_NUMBER_RE.findall(experience_text)]
     
     return max(years) if years else 0
 
 def calculate_skills_match(skills):
-    """Calculate skills match score (0-1)"""
+    """Calculate skills match score (0-1): the share of the taxonomy's skills_match set found"""
     if not skills:
         return 0
     
-    if isinstance(skills, list):
-        skills_text = ' '.join(skills).lower()
-    else:
-        skills_text = str(skills).lower()
-    
-    # Define required skills
-    required_skills = {
-        'programming': ['python', 'java', 'javascript', 'c++', 'c#'],
-        'web': ['html', 'css', 'react', 'angular', 'vue'],
-        'database': ['sql', 'mysql', 'postgresql', 'mongodb'],
-        'cloud': ['aws', 'azure', 'gcp']
-    }
-    
-    # Count matches in each category
-    matches = 0
-    total = 0
+    if not isinstance(skills, list):
+        skills = [str(skills)]
     
-    for category, required in required_skills.items():
-        category_matches = sum(1 for skill in required if skill in skills_text)
-        matches += category_matches
-        total += len(required)
-    
-    return matches / total if total > 0 else 0
+    return get_taxonomy().set_fraction(skills, SKILLS_MATCH_SET)
 
 def calculate_project_complexity(experience):
     """Calculate project complexity score (0-3)"""
@@ -411,23 +535,8 @@ def calculate_project_complexity(experience):
         text = str(experience)
     
     # Look for project-related keywords and indicators
-    project_indicators = {
-        'complex': ['architecture', 'design', 'lead', 'manage', 'implement'],
-        'medium': ['develop', 'create', 'build', 'integrate'],
-        'basic': ['assist', 'support', 'maintain']
-    }
-    
-    score = 0
-    text_lower = text.lower()
-    
-    for complexity, keywords in project_indicators.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                if complexity == 'complex':
-                    score += 3
-                elif complexity == 'medium':
-                    score += 2
-                else:
-                    score += 1
+    weights = {'complex': 3, 'medium': 2, 'basic': 1}
+    matched = {(hit.category, hit.keyword) for hit in KEYWORDS.scan(text, ('project_indicators',))}
+    score = sum(weights[complexity] for complexity, _ in matched)
     
-    return min(score, 3)  # Cap at 3 
\ No newline at end of file
+    return min(score, 3)  # Cap at 3